@@ -3,8 +3,21 @@ import { google } from "googleapis";
 
 const SHEET_ID = process.env.GOOGLE_SHEET_ID;
 const SHEET_RANGE = process.env.GOOGLE_SHEET_RANGE ?? "Sheet1!A:C";
+const SHEETS_SCOPE = "https://www.googleapis.com/auth/spreadsheets";
+const GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token";
+/** Local Sheets stand-in (testsprite_tests/harness/sheets_emulator.py); unset in production. */
+const SHEETS_EMULATOR_URL = process.env.GOOGLE_SHEETS_EMULATOR_URL?.replace(/\/$/, "");
 
-function getAuth() {
+type Phase = "validation" | "auth" | "append";
+
+/** `Server-Timing` header value, e.g. `validation;dur=0.4, auth;dur=12.1`. */
+function serverTiming(timings: Partial<Record<Phase, number>>): string {
+  return Object.entries(timings)
+    .map(([phase, ms]) => `${phase};dur=${ms.toFixed(1)}`)
+    .join(", ");
+}
+
+function getCredentials() {
   const raw = process.env.GOOGLE_SERVICE_ACCOUNT_JSON;
   if (!raw) throw new Error("GOOGLE_SERVICE_ACCOUNT_JSON is not set");
   const credentials = JSON.parse(raw) as {
@@ -15,13 +28,45 @@ function getAuth() {
     throw new Error("Invalid GOOGLE_SERVICE_ACCOUNT_JSON");
   }
   const privateKey = credentials.private_key.replace(/\\n/g, "\n");
+  return { ...credentials, private_key: privateKey };
+}
+
+function getAuth() {
   return new google.auth.GoogleAuth({
-    credentials: { ...credentials, private_key: privateKey },
-    scopes: ["https://www.googleapis.com/auth/spreadsheets"],
+    credentials: getCredentials(),
+    scopes: [SHEETS_SCOPE],
+  });
+}
+
+/**
+ * Sends the service account's token exchange to the emulator. Everything else
+ * (GoogleAuth, the JWT client and its signing) runs exactly as in production;
+ * only the request URL changes, on the client's own transporter.
+ */
+async function routeTokenToEmulator(auth: ReturnType<typeof getAuth>, emulatorUrl: string) {
+  const client = await auth.getClient();
+  client.transporter.interceptors.request.add({
+    resolved: async (config) => {
+      if (String(config.url).startsWith(GOOGLE_TOKEN_URL)) config.url = new URL(`${emulatorUrl}/token`);
+      return config;
+    },
   });
 }
 
 export async function POST(request: Request) {
+  const timings: Partial<Record<Phase, number>> = {};
+  let phaseStart = performance.now();
+  const endPhase = (phase: Phase) => {
+    const now = performance.now();
+    timings[phase] = now - phaseStart;
+    phaseStart = now;
+  };
+  const respond = (body: object, status = 200) =>
+    NextResponse.json(body, {
+      status,
+      headers: { "Server-Timing": serverTiming(timings) },
+    });
+
   try {
     const body = await request.json();
     const name = typeof body.name === "string" ? body.name.trim() : "";
@@ -29,10 +74,8 @@ export async function POST(request: Request) {
     const email = typeof body.email === "string" ? body.email.trim() : "";
 
     if (!name || !phone || !email) {
-      return NextResponse.json(
-        { error: "Name, phone, and email are required." },
-        { status: 400 }
-      );
+      endPhase("validation");
+      return respond({ error: "Name, phone, and email are required." }, 400);
     }
 
     const phoneDigits = phone.replace(/\D/g, "");
@@ -40,23 +83,27 @@ export async function POST(request: Request) {
       (phoneDigits.length === 10 && /^[6-9]\d{9}$/.test(phoneDigits)) ||
       (phoneDigits.length === 11 && phoneDigits.startsWith("0") && /^0[6-9]\d{9}$/.test(phoneDigits)) ||
       (phoneDigits.length === 12 && phoneDigits.startsWith("91") && /^91[6-9]\d{9}$/.test(phoneDigits));
+    endPhase("validation");
     if (!validPhone) {
-      return NextResponse.json(
+      return respond(
         { error: "Please enter a valid 10-digit Indian mobile number." },
-        { status: 400 }
+        400
       );
     }
 
     if (!SHEET_ID) {
       console.error("GOOGLE_SHEET_ID is not set");
-      return NextResponse.json(
-        { error: "Server configuration error." },
-        { status: 500 }
-      );
+      return respond({ error: "Server configuration error." }, 500);
     }
 
     const auth = getAuth();
-    const sheets = google.sheets({ version: "v4", auth });
+    if (SHEETS_EMULATOR_URL) await routeTokenToEmulator(auth, SHEETS_EMULATOR_URL);
+    const sheets = google.sheets({
+      version: "v4",
+      auth,
+      ...(SHEETS_EMULATOR_URL && { rootUrl: `${SHEETS_EMULATOR_URL}/` }),
+    });
+    endPhase("auth");
 
     await sheets.spreadsheets.values.append({
       spreadsheetId: SHEET_ID,
@@ -66,13 +113,11 @@ export async function POST(request: Request) {
         values: [[name, phone, email]],
       },
     });
+    endPhase("append");
 
-    return NextResponse.json({ success: true });
+    return respond({ success: true });
   } catch (e) {
     console.error("Register API error:", e);
-    return NextResponse.json(
-      { error: "Failed to save. Please try again." },
-      { status: 500 }
-    );
+    return respond({ error: "Failed to save. Please try again." }, 500);
   }
 }
@@ -1,28 +1,167 @@
+import { existsSync, readFileSync } from "node:fs";
+import { join } from "node:path";
 import { NextResponse } from "next/server";
-import { readdirSync } from "fs";
-import { join } from "path";
-
-const SEQUENCE_DIR = "video-sequence-1";
-const EXTENSIONS = /\.(jpg|jpeg|png|webp)$/i;
-
-function naturalSort(files: string[]): string[] {
-  return files.slice().sort((a, b) => {
-    const numA = parseInt(a.replace(/\D/g, ""), 10) || 0;
-    const numB = parseInt(b.replace(/\D/g, ""), 10) || 0;
-    if (numA !== numB) return numA - numB;
-    return a.localeCompare(b);
-  });
-}
+import manifest from "./manifest.json";
+
+/** Generated by scripts/build_sequence_manifest.py; its hash covers every frame. */
+type SequenceFrame = {
+  file: string;
+  url: string;
+  bytes: number;
+  sha256: string;
+};
+
+type Tier = {
+  id: string;
+  format: string;
+  width: number;
+  height: number;
+  hash: string;
+  frameCount: number;
+  totalBytes: number;
+  frames: SequenceFrame[];
+};
+
+/** Sheets from scripts/build_sequence_atlas.py; `tiles[i]` is `[sheet, x, y, w, h]`. */
+type Atlas = {
+  id: string;
+  format: string;
+  width: number;
+  height: number;
+  hash: string;
+  totalBytes: number;
+  sheets: (SequenceFrame & { first: number; count: number })[];
+  tiles: number[][];
+};
+
+type Candidate = { format: string; width: number; totalBytes: number };
 
-export async function GET() {
+const ORIGINAL: Tier = {
+  id: "original",
+  format: "jpeg",
+  width: manifest.frames[0]?.width ?? 0,
+  height: manifest.frames[0]?.height ?? 0,
+  hash: manifest.hash,
+  frameCount: manifest.frameCount,
+  totalBytes: manifest.totalBytes,
+  frames: manifest.frames,
+};
+const PUBLIC_DIR = join(process.cwd(), "public");
+const BUILD_MANIFEST = join(process.cwd(), "app", "api", "sequence", "manifest.build.json");
+
+/**
+ * Tiers and atlases listed by the build scripts in the gitignored
+ * manifest.build.json. Ignored when it is missing, unreadable, or was built
+ * from other frames than the committed manifest lists.
+ */
+function readBuild(): { tiers: Tier[]; atlases: Atlas[] } {
   try {
-    const dir = join(process.cwd(), "public", SEQUENCE_DIR);
-    const files = readdirSync(dir).filter((f) => EXTENSIONS.test(f));
-    const sorted = naturalSort(files);
-    const urls = sorted.map((f) => `/${SEQUENCE_DIR}/${f}`);
-    return NextResponse.json({ urls });
-  } catch (e) {
-    console.error("Sequence API error:", e);
-    return NextResponse.json({ urls: [] }, { status: 500 });
+    const build = JSON.parse(readFileSync(BUILD_MANIFEST, "utf8"));
+    if (build.hash === manifest.hash) return { tiers: build.tiers ?? [], atlases: build.atlases ?? [] };
+  } catch {
+    // not built
+  }
+  return { tiers: [], atlases: [] };
+}
+
+/**
+ * Tier and atlas files are build output, not committed. Only offer the ones
+ * whose first and last files exist here, so a deploy that skipped the build
+ * step serves the originals instead of 404s.
+ */
+function isBuilt(files: { url: string }[]): boolean {
+  if (files.length === 0) return false;
+  return [files[0], files[files.length - 1]].every((f) =>
+    existsSync(join(PUBLIC_DIR, f.url.split("?")[0])),
+  );
+}
+
+const BUILD = readBuild();
+/** Renditions from scripts/build_sequence_renditions.py, when they were built. */
+const TIERS: Tier[] = [ORIGINAL, ...BUILD.tiers.filter((t) => isBuilt(t.frames))];
+const ATLASES = BUILD.atlases.filter((a) => isBuilt(a.sheets));
+const ASPECT = ORIGINAL.height > 0 ? ORIGINAL.width / ORIGINAL.height : 16 / 9;
+const CACHE_CONTROL = "public, max-age=0, must-revalidate";
+
+/**
+ * Smallest candidate (in a format the client accepts) that still covers a
+ * `w`×`h` device-pixel canvas; HeroScroll draws frames with object-cover
+ * scaling. Falls back to the largest one when nothing covers it.
+ */
+function pickCovering<T extends Candidate>(items: T[], params: URLSearchParams): T | undefined {
+  const width = Number(params.get("w")) || 0;
+  const height = Number(params.get("h")) || 0;
+  const formats = new Set(["jpeg", ...(params.get("formats")?.split(",") ?? [])]);
+  const needed = Math.max(width, height * ASPECT);
+  const usable = items.filter((t) => formats.has(t.format));
+  if (usable.length === 0) return undefined;
+  const covering = usable.filter((t) => t.width >= needed);
+  const pool = covering.length > 0 ? covering : usable;
+  const targetWidth = covering.length > 0
+    ? Math.min(...pool.map((t) => t.width))
+    : Math.max(...pool.map((t) => t.width));
+  return pool
+    .filter((t) => t.width === targetWidth)
+    .reduce((best, t) => (t.totalBytes < best.totalBytes ? t : best));
+}
+
+function pickTier(params: URLSearchParams): Tier {
+  if (!params.has("w") && !params.has("h")) return ORIGINAL;
+  return pickCovering(TIERS, params) ?? ORIGINAL;
+}
+
+/** Serialized once per tier/atlas pair; the ETag combines their hashes. */
+const RESPONSES = new Map<string, { etag: string; body: string }>();
+
+function response(tier: Tier, atlas: Atlas | undefined) {
+  const key = `${tier.id}/${atlas?.id ?? ""}`;
+  let cached = RESPONSES.get(key);
+  if (!cached) {
+    cached = {
+      etag: atlas ? `"${tier.hash.slice(0, 32)}${atlas.hash.slice(0, 32)}"` : `"${tier.hash}"`,
+      body: JSON.stringify({
+        version: manifest.version,
+        sequence: manifest.sequence,
+        hash: tier.hash,
+        frameCount: tier.frameCount,
+        totalBytes: tier.totalBytes,
+        tier: { id: tier.id, format: tier.format, width: tier.width, height: tier.height },
+        tiers: TIERS.map((t) => t.id),
+        frames: tier.frames,
+        urls: tier.frames.map((f) => f.url),
+        ...(atlas && {
+          atlas: {
+            id: atlas.id,
+            format: atlas.format,
+            totalBytes: atlas.totalBytes,
+            sheets: atlas.sheets.map(({ url, first, count }) => ({ url, first, count })),
+            tiles: atlas.tiles,
+          },
+        }),
+      }),
+    };
+    RESPONSES.set(key, cached);
   }
+  return cached;
+}
+
+function matchesEtag(ifNoneMatch: string | null, etag: string): boolean {
+  if (!ifNoneMatch) return false;
+  return ifNoneMatch
+    .split(",")
+    .some((tag) => tag.trim().replace(/^W\//, "") === etag || tag.trim() === "*");
+}
+
+export async function GET(request: Request) {
+  const params = new URL(request.url).searchParams;
+  const tier = pickTier(params);
+  const atlas = params.get("layout") === "atlas" ? pickCovering(ATLASES, params) : undefined;
+  const { etag, body } = response(tier, atlas);
+  const headers = { ETag: etag, "Cache-Control": CACHE_CONTROL };
+  if (matchesEtag(request.headers.get("if-none-match"), etag)) {
+    return new NextResponse(null, { status: 304, headers });
+  }
+  return new NextResponse(body, {
+    headers: { ...headers, "Content-Type": "application/json" },
+  });
 }
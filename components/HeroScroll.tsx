@@ -5,6 +5,7 @@ import { useImagePreloader } from "@/hooks/useImagePreloader";
 import { useLenisScroll } from "@/contexts/LenisScrollContext";
 import { useRegistrationModal } from "@/contexts/RegistrationModalContext";
 import { motion } from "framer-motion";
+import { probeRaf, recordHeroFrame } from "@/lib/perfProbe";
 
 const HERO_HEIGHT_VH = 120;
 const FRAME_LERP = 0.12;
@@ -74,17 +75,18 @@ export function HeroScroll() {
       const imgs = imagesRef.current;
       const safeIndex =
         maxLoaded >= 0 && imgs.length > 0 ? Math.min(index, maxLoaded) : 0;
-      const img = imgs[safeIndex];
-      if (!img) return;
+      const frame = imgs[safeIndex];
+      if (!frame) return;
       const scale = Math.max(
-        canvas.width / img.width,
-        canvas.height / img.height,
+        canvas.width / frame.sw,
+        canvas.height / frame.sh,
       );
-      const w = img.width * scale;
-      const h = img.height * scale;
+      const w = frame.sw * scale;
+      const h = frame.sh * scale;
       const x = (canvas.width - w) / 2;
       const y = (canvas.height - h) / 2;
-      ctx.drawImage(img, x, y, w, h);
+      // Per-frame images use the whole image; atlas frames blit their tile.
+      ctx.drawImage(frame.image, frame.sx, frame.sy, frame.sw, frame.sh, x, y, w, h);
     },
     // Refs are stable; we read .current inside to avoid re-running canvas effect on every frame load.
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -156,6 +158,7 @@ export function HeroScroll() {
         lastDrawnFrameRef.current = frameToDraw;
         draw(ctx, canvas, frameToDraw);
       }
+      recordHeroFrame(target, current, frameToDraw);
 
       if (scrollButtonEl) {
         scrollButtonEl.style.opacity = String(
@@ -181,7 +184,7 @@ export function HeroScroll() {
     let rafId = 0;
     function loop() {
       if (rafActive) {
-        update();
+        probeRaf("hero", update);
       }
       rafId = requestAnimationFrame(loop);
     }
@@ -3,6 +3,7 @@
 import { useCallback, useEffect, useRef } from "react";
 import Lenis from "lenis";
 import { LenisScrollProvider } from "@/contexts/LenisScrollContext";
+import { probeRaf } from "@/lib/perfProbe";
 import "lenis/dist/lenis.css";
 
 export function SmoothScroll({ children }: { children: React.ReactNode }) {
@@ -38,8 +39,9 @@ export function SmoothScroll({ children }: { children: React.ReactNode }) {
       scrollYRef.current = instance.scroll;
     });
 
+    const step = (time: number) => lenis.raf(time);
     function raf(time: number) {
-      lenis.raf(time);
+      probeRaf("lenis", step, time);
       rafRef.current = requestAnimationFrame(raf);
     }
     rafRef.current = requestAnimationFrame(raf);
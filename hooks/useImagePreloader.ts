@@ -9,7 +9,71 @@ const CONCURRENCY = 6;
 /** Progress bar granularity to limit re-renders (at most this many progress updates). */
 const PROGRESS_STEPS = 24;
 
-type SequenceResponse = { urls: string[] };
+/** HeroScroll caps its canvas at 2× DPR, so larger frames are wasted bytes. */
+const MAX_DPR = 2;
+/** 1×1 AVIF; decodes only where the browser supports the format. */
+const AVIF_PROBE =
+  "data:image/avif;base64,AAAAIGZ0eXBhdmlmAAAAAGF2aWZtaWYxbWlhZk1BMUIAAADrbWV0YQAAAAAAAAAhaGRscgAAAAAAAAAAcGljdAAAAAAAAAAAAAAAAAAAAAAOcGl0bQAAAAAAAQAAAB5pbG9jAAAAAEQAAAEAAQAAAAEAAAETAAAAIwAAAChpaW5mAAAAAAABAAAAGmluZmUCAAAAAAEAAGF2MDFDb2xvcgAAAABqaXBycAAAAEtpcGNvAAAAFGlzcGUAAAAAAAAAAQAAAAEAAAAQcGl4aQAAAAADCAgIAAAADGF2MUOBAAwAAAAAE2NvbHJuY2x4AAEADQAGgAAAABdpcG1hAAAAAAAAAAEAAQQBAoMEAAAAK21kYXQSAAoIGAAGiAhoNCAyFRTHh4ZlAgggnlAAAABIWtlc1jAXYA==";
+
+/** Atlas sheets from the route; `tiles[i]` is `[sheet, x, y, w, h]` for frame i. */
+type AtlasLayout = {
+  sheets: { url: string; first: number; count: number }[];
+  tiles: number[][];
+};
+
+type SequenceResponse = { urls: string[]; atlas?: AtlasLayout };
+
+/** One drawable frame: a whole image, or one tile of an atlas sheet. */
+export type HeroFrame = {
+  image: HTMLImageElement;
+  sx: number;
+  sy: number;
+  sw: number;
+  sh: number;
+};
+
+/**
+ * Atlas mode fetches a dozen sheets instead of one request per frame. Enabled by
+ * NEXT_PUBLIC_HERO_ATLAS=1; `?hero=atlas` or `?hero=frames` overrides it per visit.
+ */
+function atlasMode(): boolean {
+  const override = new URLSearchParams(window.location.search).get("hero");
+  if (override) return override === "atlas";
+  return process.env.NEXT_PUBLIC_HERO_ATLAS === "1";
+}
+
+function wholeImage(image: HTMLImageElement): HeroFrame {
+  return { image, sx: 0, sy: 0, sw: image.width, sh: image.height };
+}
+
+function atlasTile(image: HTMLImageElement, [, x, y, w, h]: number[]): HeroFrame {
+  return { image, sx: x, sy: y, sw: w, sh: h };
+}
+
+let avifSupport: Promise<boolean> | null = null;
+
+function supportsAvif(): Promise<boolean> {
+  avifSupport ??= new Promise((resolve) => {
+    const img = new Image();
+    img.onload = () => resolve(img.width > 0);
+    img.onerror = () => resolve(false);
+    img.src = AVIF_PROBE;
+  });
+  return avifSupport;
+}
+
+/** Ask the route for the smallest rendition tier that covers this viewport. */
+async function sequenceUrl(): Promise<string> {
+  const dpr = Math.min(window.devicePixelRatio ?? 1, MAX_DPR);
+  const formats = (await supportsAvif()) ? "avif,webp" : "webp";
+  const params = new URLSearchParams({
+    w: String(Math.round(window.innerWidth * dpr)),
+    h: String(Math.round(window.innerHeight * dpr)),
+    formats,
+  });
+  if (atlasMode()) params.set("layout", "atlas");
+  return `/api/sequence?${params}`;
+}
 
 function loadImage(
   src: string,
@@ -89,7 +153,7 @@ export function useImagePreloader() {
   const [totalFrames, setTotalFrames] = useState(0);
   const [error, setError] = useState<string | null>(null);
 
-  const imagesRef = useRef<(HTMLImageElement | null)[]>([]);
+  const imagesRef = useRef<(HeroFrame | null)[]>([]);
   const maxLoadedIndexRef = useRef(-1);
   const lastProgressStepRef = useRef(-1);
 
@@ -98,7 +162,7 @@ export function useImagePreloader() {
     const { signal } = controller;
     let loadedCount = 0;
     let n = 0;
-    const imagesByIndex: (HTMLImageElement | null)[] = [];
+    const imagesByIndex: (HeroFrame | null)[] = [];
 
     const setProgressThrottled = (count: number, total: number) => {
       const step = total <= 0 ? 0 : Math.floor((count / total) * PROGRESS_STEPS);
@@ -108,9 +172,9 @@ export function useImagePreloader() {
       }
     };
 
-    const onFrameLoaded = (index: number, img: HTMLImageElement | null) => {
+    const onFrameLoaded = (index: number, frame: HeroFrame | null) => {
       if (signal.aborted) return;
-      imagesByIndex[index] = img;
+      imagesByIndex[index] = frame;
       loadedCount++;
       maxLoadedIndexRef.current = Math.max(maxLoadedIndexRef.current, index);
       imagesRef.current = imagesByIndex;
@@ -122,7 +186,7 @@ export function useImagePreloader() {
 
     (async () => {
       try {
-        const res = await fetch("/api/sequence", { signal });
+        const res = await fetch(await sequenceUrl(), { signal });
         if (!res.ok) throw new Error("Failed to fetch sequence");
         const data = (await res.json()) as SequenceResponse;
         const urls = data?.urls;
@@ -137,6 +201,27 @@ export function useImagePreloader() {
         imagesByIndex.length = n;
         imagesByIndex.fill(null);
 
+        const atlas = data.atlas;
+        if (atlas && atlas.tiles.length === n) {
+          const loadSheet = async (sheet: AtlasLayout["sheets"][number]) => {
+            let img: HTMLImageElement | null = null;
+            try {
+              img = await loadImage(sheet.url, signal);
+            } catch {
+              img = null;
+            }
+            for (let i = sheet.first; i < sheet.first + sheet.count; i++) {
+              onFrameLoaded(i, img && atlasTile(img, atlas.tiles[i]));
+            }
+          };
+          // Priority sheets cover frames 0..MIN_FRAMES_TO_START-1 whatever the grid size.
+          const priority = atlas.sheets.filter((sheet) => sheet.first < MIN_FRAMES_TO_START);
+          await runWithConcurrency(priority, CONCURRENCY, signal, loadSheet);
+          if (signal.aborted) return;
+          await runWithConcurrency(atlas.sheets.slice(priority.length), CONCURRENCY, signal, loadSheet);
+          return;
+        }
+
         const priorityIndices = Array.from(
           { length: MIN_FRAMES_TO_START },
           (_, i) => i
@@ -152,7 +237,7 @@ export function useImagePreloader() {
           async (frameIndex) => {
             try {
               const img = await loadImage(urls[frameIndex], signal);
-              onFrameLoaded(frameIndex, img);
+              onFrameLoaded(frameIndex, wholeImage(img));
             } catch {
               onFrameLoaded(frameIndex, null);
             }
@@ -168,7 +253,7 @@ export function useImagePreloader() {
           async (frameIndex) => {
             try {
               const img = await loadImage(urls[frameIndex], signal);
-              onFrameLoaded(frameIndex, img);
+              onFrameLoaded(frameIndex, wholeImage(img));
             } catch {
               onFrameLoaded(frameIndex, null);
             }
@@ -186,7 +271,7 @@ export function useImagePreloader() {
       controller.abort();
       imagesRef.current = [];
       maxLoadedIndexRef.current = -1;
-      imagesByIndex.forEach((img) => img && (img.src = ""));
+      imagesByIndex.forEach((frame) => frame && (frame.image.src = ""));
     };
   }, []);
 
@@ -0,0 +1,56 @@
+/**
+ * Opt-in hooks for the Playwright harness. Nothing is recorded unless a test
+ * sets the matching `window.__*Probe` array before the app's scripts run, so
+ * in production each hook is a single property check.
+ */
+
+/** One rAF tick of the hero sequence: where it was asked to be and where it is. */
+export type HeroProbeSample = {
+  t: number;
+  target: number;
+  current: number;
+  drawn: number;
+};
+
+/** One rAF callback of a render loop and how long it ran on the main thread. */
+export type RafProbeSample = {
+  loop: "hero" | "lenis";
+  t: number;
+  ms: number;
+};
+
+declare global {
+  interface Window {
+    __heroProbe?: HeroProbeSample[];
+    __rafProbe?: RafProbeSample[];
+  }
+}
+
+export function recordHeroFrame(
+  target: number,
+  current: number,
+  drawn: number,
+): void {
+  const probe = window.__heroProbe;
+  if (!probe) return;
+  probe.push({ t: performance.now(), target, current, drawn });
+}
+
+/** Runs one rAF callback, timing it when the harness asked for it. */
+export function probeRaf(
+  loop: RafProbeSample["loop"],
+  callback: (time: number) => void,
+  time = 0,
+): void {
+  const probe = window.__rafProbe;
+  if (!probe) {
+    callback(time);
+    return;
+  }
+  const t = performance.now();
+  try {
+    callback(time);
+  } finally {
+    probe.push({ loop, t, ms: performance.now() - t });
+  }
+}
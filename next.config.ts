@@ -6,6 +6,18 @@ const nextConfig: NextConfig = {
       { source: "/favicon.ico", destination: "/favicon/favicon.ico", permanent: true },
     ];
   },
+  async headers() {
+    return [
+      {
+        // Manifest URLs carry a content hash (?v=), so a given URL never changes.
+        source: "/video-sequence-1/:file*",
+        has: [{ type: "query", key: "v" }],
+        headers: [
+          { key: "Cache-Control", value: "public, max-age=31536000, immutable" },
+        ],
+      },
+    ];
+  },
 };
 
 export default nextConfig;
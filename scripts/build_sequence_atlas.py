@@ -0,0 +1,160 @@
+"""Pack consecutive hero frames into atlas sheets.
+
+With the default 4×4 grid, the 192 frames become 12 sheet requests instead of
+192 frame requests. Each tile has a gutter of its own edge pixels around it,
+so bilinear sampling at the tile border never picks up a neighbouring frame.
+Sheets go to ``public/video-sequence-1/atlas-<format>-<tile width>/`` together
+with a ``layout.json``; the gitignored build manifest is then refreshed, and
+it lists every frame's tile rectangle::
+
+    python scripts/build_sequence_atlas.py --tile-width 640 --grid 4x4 --format webp
+
+``layout.json`` records the hash of the source frames. When it and the
+packing options match, and every sheet is still there, nothing is re-packed
+(``--force`` re-packs anyway).
+
+Keep sheets within what mobile browsers decode comfortably: a 4×4 grid of
+640-px tiles is 2576×1456, whereas full-size tiles would be 7680×4320. Needs
+Pillow; sheets are built in parallel across cores. Like the rendition tiers,
+the sheets are build output: ``npm run build`` packs them in ``prebuild``
+with ``--optional``, and only ``manifest.build.json`` lists them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Sequence
+
+from build_sequence_manifest import ATLAS_LAYOUT, SEQUENCE_DIR, TIER_EXTENSIONS, build_manifest, refresh_build_manifest
+from build_sequence_renditions import SAVE_OPTIONS
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+
+def _extrude(sheet: "Image.Image", tile: "Image.Image", x: int, y: int, gutter: int) -> None:
+    """Paste ``tile`` at (x, y) and repeat its edge pixels ``gutter`` px outward."""
+    w, h = tile.size
+    sheet.paste(tile, (x, y))
+    if not gutter:
+        return
+    sheet.paste(tile.crop((0, 0, w, 1)).resize((w, gutter)), (x, y - gutter))
+    sheet.paste(tile.crop((0, h - 1, w, h)).resize((w, gutter)), (x, y + h))
+    column = sheet.crop((x, y - gutter, x + 1, y + h + gutter))
+    sheet.paste(column.resize((gutter, h + 2 * gutter)), (x - gutter, y - gutter))
+    column = sheet.crop((x + w - 1, y - gutter, x + w, y + h + gutter))
+    sheet.paste(column.resize((gutter, h + 2 * gutter)), (x + w, y - gutter))
+
+
+def pack_sheet(task: tuple[list[str], str, str, int, int, int, int]) -> tuple[str, int]:
+    sources, target, fmt, columns, tile_w, tile_h, gutter = task
+    cell_w, cell_h = tile_w + 2 * gutter, tile_h + 2 * gutter
+    rows = -(-len(sources) // columns)
+    sheet = Image.new("RGB", (columns * cell_w, rows * cell_h))
+    for slot, source in enumerate(sources):
+        with Image.open(source) as image:
+            image.draft("RGB", (tile_w, tile_h))
+            tile = image.convert("RGB").resize((tile_w, tile_h), Image.Resampling.LANCZOS)
+        column, row = slot % columns, slot // columns
+        _extrude(sheet, tile, column * cell_w + gutter, row * cell_h + gutter, gutter)
+    tmp = Path(target + ".tmp")
+    sheet.save(tmp, **SAVE_OPTIONS[fmt])
+    os.replace(tmp, target)
+    return target, Path(target).stat().st_size
+
+
+def is_current(out_dir: Path, options: dict[str, Any]) -> bool:
+    """Whether ``out_dir`` already holds every sheet packed from the same frames with ``options``."""
+    try:
+        layout = json.loads((out_dir / ATLAS_LAYOUT).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if any(layout.get(key) != value for key, value in options.items()):
+        return False
+    return all((out_dir / name).is_file() for name in layout.get("sheets", []))
+
+
+def _grid(value: str) -> tuple[int, int]:
+    columns, _, rows = value.lower().partition("x")
+    return int(columns), int(rows)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tile-width", type=int, default=640)
+    parser.add_argument("--grid", type=_grid, default=(4, 4), metavar="COLSxROWS")
+    parser.add_argument("--format", choices=sorted(SAVE_OPTIONS), default="webp")
+    parser.add_argument("--gutter", type=int, default=2, help="extruded edge pixels around each tile")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="re-pack even if the sheets are up to date")
+    parser.add_argument("--optional", action="store_true", help="exit 0 without sheets when Pillow is missing")
+    args = parser.parse_args(argv)
+
+    if Image is None:
+        print("Pillow is required: pip install pillow", file=sys.stderr)
+        return 0 if args.optional else 2
+    base = build_manifest()
+    frames = base["frames"]
+    if not frames:
+        print("no frames to pack", file=sys.stderr)
+        return 1
+    columns, rows = args.grid
+    tile_w = args.tile_width
+    tile_h = round(frames[0]["height"] * tile_w / frames[0]["width"])
+    per_sheet = columns * rows
+    out_dir = SEQUENCE_DIR / f"atlas-{args.format}-{tile_w}"
+    options = {
+        "format": args.format,
+        "tileWidth": tile_w,
+        "tileHeight": tile_h,
+        "columns": columns,
+        "rows": rows,
+        "gutter": args.gutter,
+        "frameCount": len(frames),
+        "source": base["hash"],
+    }
+    if not args.force and is_current(out_dir, options):
+        print(f"{out_dir.name} is up to date with the source frames; not re-packing")
+        refresh_build_manifest(base)
+        return 0
+    out_dir.mkdir(exist_ok=True)
+    for stale in out_dir.iterdir():
+        stale.unlink()
+
+    ext = TIER_EXTENSIONS[args.format]
+    tasks = [
+        (
+            [str(SEQUENCE_DIR / f["file"]) for f in frames[start : start + per_sheet]],
+            str(out_dir / f"sheet-{start // per_sheet:03d}.{ext}"),
+            args.format,
+            columns,
+            tile_w,
+            tile_h,
+            args.gutter,
+        )
+        for start in range(0, len(frames), per_sheet)
+    ]
+    started = time.monotonic()
+    with Pool(args.processes) as pool:
+        written = pool.map(pack_sheet, tasks)
+    layout: dict[str, Any] = options | {"sheets": [Path(target).name for target, _ in written]}
+    (out_dir / ATLAS_LAYOUT).write_text(json.dumps(layout, indent=2) + "\n", encoding="utf-8")
+    refresh_build_manifest(base)
+
+    total = sum(size for _, size in written)
+    print(f"{len(frames)} frames -> {len(written)} sheets of {columns}x{rows} {tile_w}x{tile_h} tiles "
+          f"in {time.monotonic() - started:.1f}s; {total / 1e6:.1f} MB "
+          f"(originals {base['totalBytes'] / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""Build the hero sequence manifest served by ``/api/sequence``.
+
+For every frame in ``public/video-sequence-1`` (same extensions and natural
+order the route used to compute per request) this records the URL, byte size,
+pixel dimensions and SHA-256, plus a sequence hash over all frames. Frame URLs
+carry a ``?v=`` content hash, so ``next.config.ts`` can mark them immutable.
+
+Complete rendition tiers in ``<format>-<width>/`` subdirectories (written by
+``scripts/build_sequence_renditions.py``) and atlas sheets in
+``atlas-<format>-<width>/`` (``scripts/build_sequence_atlas.py``, one tile
+rectangle per frame) are build output. They are listed in the gitignored
+``manifest.build.json`` next to the manifest, tagged with the sequence hash
+they were built from; the route merges it in when that hash matches. The
+build scripts refresh it, and leave it untouched when nothing changed.
+
+    python scripts/build_sequence_manifest.py           # rewrite the committed manifest
+    python scripts/build_sequence_manifest.py --check   # exit 1 if it is stale
+    python scripts/build_sequence_manifest.py --builds  # refresh manifest.build.json only
+
+Run it whenever frames are added, removed or re-exported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+SEQUENCE = "video-sequence-1"
+SEQUENCE_DIR = ROOT / "public" / SEQUENCE
+MANIFEST = ROOT / "app" / "api" / "sequence" / "manifest.json"
+BUILD_MANIFEST = MANIFEST.with_name("manifest.build.json")
+EXTENSIONS = re.compile(r"\.(jpg|jpeg|png|webp)$", re.IGNORECASE)
+MANIFEST_VERSION = 1
+VERSION_CHARS = 12
+TIER_DIR = re.compile(r"^(webp|avif|jpeg)-(\d+)$")
+TIER_EXTENSIONS = {"webp": "webp", "avif": "avif", "jpeg": "jpg"}
+ATLAS_DIR = re.compile(r"^atlas-(webp|avif|jpeg)-(\d+)$")
+ATLAS_LAYOUT = "layout.json"
+
+# JPEG start-of-frame markers; C4 (DHT), C8 (JPG) and CC (DAC) share the range.
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def natural_key(name: str) -> tuple[int, str]:
+    """Sort like the route's old ``naturalSort``: all digits as one number, then name."""
+    digits = re.sub(r"\D", "", name)
+    return int(digits) if digits else 0, name
+
+
+def image_size(data: bytes) -> tuple[int, int]:
+    """Width and height from a JPEG, PNG, AVIF or WebP header."""
+    if data[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 < len(data):
+            if data[offset] != 0xFF:
+                raise ValueError("corrupt JPEG marker stream")
+            marker = data[offset + 1]
+            if marker == 0xFF:  # fill byte
+                offset += 1
+                continue
+            if marker in _SOF_MARKERS:
+                height, width = struct.unpack(">HH", data[offset + 5 : offset + 9])
+                return width, height
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                offset += 2
+                continue
+            (length,) = struct.unpack(">H", data[offset + 2 : offset + 4])
+            offset += 2 + length
+        raise ValueError("JPEG without a start-of-frame segment")
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return struct.unpack(">II", data[16:24])
+    if data[4:8] == b"ftyp" and data[8:12] in (b"avif", b"avis"):
+        index = data.find(b"ispe")
+        if index < 0:
+            raise ValueError("AVIF without an ispe box")
+        return struct.unpack(">II", data[index + 8 : index + 16])
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    raise ValueError("unsupported image format")
+
+
+def sequence_hash(frames: Sequence[dict[str, Any]]) -> str:
+    """SHA-256 over ``"<file> <sha256>\\n"`` for every frame, in order."""
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(f"{frame['file']} {frame['sha256']}\n".encode())
+    return digest.hexdigest()
+
+
+def frame_entry(path: Path, url_prefix: str) -> dict[str, Any]:
+    data = path.read_bytes()
+    sha = hashlib.sha256(data).hexdigest()
+    width, height = image_size(data)
+    return {
+        "file": path.name,
+        "url": f"{url_prefix}/{path.name}?v={sha[:VERSION_CHARS]}",
+        "bytes": len(data),
+        "width": width,
+        "height": height,
+        "sha256": sha,
+    }
+
+
+def build_tier(tier_dir: Path, frames: Sequence[dict[str, Any]], sequence: str) -> dict[str, Any] | None:
+    """A rendition tier, or ``None`` unless it has a file for every source frame."""
+    match = TIER_DIR.match(tier_dir.name)
+    if not match:
+        return None
+    fmt, ext = match.group(1), TIER_EXTENSIONS[match.group(1)]
+    paths = [tier_dir / f"{Path(frame['file']).stem}.{ext}" for frame in frames]
+    missing = [p.name for p in paths if not p.is_file()]
+    if missing:
+        print(f"skipping tier {tier_dir.name}: {len(missing)} frames missing", file=sys.stderr)
+        return None
+    entries = [frame_entry(path, f"/{sequence}/{tier_dir.name}") for path in paths]
+    return {
+        "id": tier_dir.name,
+        "format": fmt,
+        "width": entries[0]["width"],
+        "height": entries[0]["height"],
+        "hash": sequence_hash(entries),
+        "frameCount": len(entries),
+        "totalBytes": sum(e["bytes"] for e in entries),
+        "frames": [{key: e[key] for key in ("file", "url", "bytes", "sha256")} for e in entries],
+    }
+
+
+def build_atlas(atlas_dir: Path, frame_count: int, sequence: str) -> dict[str, Any] | None:
+    """Atlas sheets plus ``[sheet, x, y, w, h]`` per frame, from the packer's layout."""
+    if not ATLAS_DIR.match(atlas_dir.name) or not (atlas_dir / ATLAS_LAYOUT).is_file():
+        return None
+    layout = json.loads((atlas_dir / ATLAS_LAYOUT).read_text(encoding="utf-8"))
+    if layout["frameCount"] != frame_count:
+        print(f"skipping {atlas_dir.name}: packed {layout['frameCount']} of {frame_count} frames", file=sys.stderr)
+        return None
+    per_sheet = layout["columns"] * layout["rows"]
+    tile_w, tile_h, gutter = layout["tileWidth"], layout["tileHeight"], layout["gutter"]
+    sheets = []
+    for index, name in enumerate(layout["sheets"]):
+        entry = frame_entry(atlas_dir / name, f"/{sequence}/{atlas_dir.name}")
+        first = index * per_sheet
+        count = min(per_sheet, frame_count - first)
+        sheets.append({key: entry[key] for key in ("file", "url", "bytes", "sha256")} | {"first": first, "count": count})
+    tiles = []
+    for frame in range(frame_count):
+        slot = frame % per_sheet
+        column, row = slot % layout["columns"], slot // layout["columns"]
+        x = gutter + column * (tile_w + 2 * gutter)
+        y = gutter + row * (tile_h + 2 * gutter)
+        tiles.append([frame // per_sheet, x, y, tile_w, tile_h])
+    return {
+        "id": atlas_dir.name,
+        "format": layout["format"],
+        "width": tile_w,
+        "height": tile_h,
+        "columns": layout["columns"],
+        "rows": layout["rows"],
+        "hash": sequence_hash(sheets),
+        "totalBytes": sum(s["bytes"] for s in sheets),
+        "sheets": sheets,
+        "tiles": tiles,
+    }
+
+
+def build_manifest(sequence_dir: Path = SEQUENCE_DIR, sequence: str = SEQUENCE) -> dict[str, Any]:
+    """The committed manifest: the original frames only."""
+    names = sorted(
+        (p.name for p in sequence_dir.iterdir() if p.is_file() and EXTENSIONS.search(p.name)),
+        key=natural_key,
+    )
+    frames = [frame_entry(sequence_dir / name, f"/{sequence}") for name in names]
+    return {
+        "version": MANIFEST_VERSION,
+        "sequence": sequence,
+        "hash": sequence_hash(frames),
+        "frameCount": len(frames),
+        "totalBytes": sum(f["bytes"] for f in frames),
+        "frames": frames,
+    }
+
+
+def build_outputs(
+    manifest: dict[str, Any], sequence_dir: Path = SEQUENCE_DIR, sequence: str = SEQUENCE
+) -> dict[str, Any]:
+    """The build manifest: complete tiers and atlases of ``manifest``'s frames."""
+    frames = manifest["frames"]
+    subdirs = sorted(p for p in sequence_dir.iterdir() if p.is_dir())
+    return {
+        "hash": manifest["hash"],
+        "tiers": [tier for sub in subdirs if (tier := build_tier(sub, frames, sequence)) is not None],
+        "atlases": [
+            atlas for sub in subdirs if (atlas := build_atlas(sub, len(frames), sequence)) is not None
+        ],
+    }
+
+
+def render(manifest: dict[str, Any]) -> str:
+    return json.dumps(manifest, indent=2) + "\n"
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` unless ``path`` already holds it; returns whether it wrote."""
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def refresh_build_manifest(manifest: dict[str, Any], path: Path = BUILD_MANIFEST) -> dict[str, Any]:
+    outputs = build_outputs(manifest)
+    state = "wrote" if write_if_changed(path, render(outputs)) else "unchanged:"
+    print(f"{state} {path} ({len(outputs['tiers'])} tiers, {len(outputs['atlases'])} atlases)")
+    return outputs
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="fail if the manifest is out of date")
+    parser.add_argument("--out", type=Path, default=MANIFEST)
+    parser.add_argument("--builds", action="store_true",
+                        help=f"refresh {BUILD_MANIFEST.name} from the built tiers and atlases instead")
+    args = parser.parse_args(argv)
+
+    manifest = build_manifest()
+    if args.builds:
+        refresh_build_manifest(manifest)
+        return 0
+    text = render(manifest)
+    if args.check:
+        current = args.out.read_text(encoding="utf-8") if args.out.exists() else ""
+        if current != text:
+            print(f"{args.out} is out of date; run scripts/build_sequence_manifest.py", file=sys.stderr)
+            return 1
+        print(f"{args.out} is up to date ({manifest['frameCount']} frames)")
+        return 0
+    state = "wrote" if write_if_changed(args.out, text) else "unchanged:"
+    print(f"{state} {args.out} ({manifest['frameCount']} frames, {manifest['totalBytes'] / 1e6:.1f} MB, "
+          f"hash {manifest['hash'][:12]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Transcode the hero sequence into smaller width tiers and modern formats.
+
+Each tier is written to ``public/video-sequence-1/<format>-<width>/`` with
+the source frame names. The work runs on a process pool across all cores,
+and frames newer than their source are skipped. When it finishes, the
+gitignored build manifest is refreshed (left alone if no tier changed), so
+``/api/sequence`` can pick a tier from the client's viewport × DPR. Bytes
+saved per tier are printed, and ``--json`` writes them to a file::
+
+    python scripts/build_sequence_renditions.py                       # default tiers
+    python scripts/build_sequence_renditions.py --widths 640,1280 --formats webp --json /tmp/renditions.json
+
+Needs Pillow (``pip install pillow``); AVIF tiers are skipped when Pillow was
+built without AVIF support. Tier directories are build output and are not
+committed. ``npm run build`` runs this script from ``prebuild`` with
+``--optional``, which skips it (the route then serves the originals) when
+Pillow is missing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Sequence
+
+from build_sequence_manifest import SEQUENCE_DIR, TIER_EXTENSIONS, build_manifest, refresh_build_manifest
+
+try:
+    from PIL import Image, features
+except ImportError:  # pragma: no cover - optional dependency
+    Image = features = None
+
+DEFAULT_WIDTHS = (640, 960, 1280, 1920)
+DEFAULT_FORMATS = ("avif", "webp")
+SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 55, "speed": 6},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+
+def transcode(task: tuple[str, str, str, int]) -> tuple[str, int, bool]:
+    """Write one frame of one tier; returns (tier id, bytes, written)."""
+    source, target, fmt, width = task
+    src, dst = Path(source), Path(target)
+    tier = dst.parent.name
+    if dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime:
+        return tier, dst.stat().st_size, False
+    with Image.open(src) as image:
+        height = round(image.height * width / image.width)
+        image.draft("RGB", (width, height))  # lets libjpeg decode at 1/2, 1/4, 1/8 scale
+        frame = image.convert("RGB")
+        if frame.width != width:
+            frame = frame.resize((width, height), Image.Resampling.LANCZOS)
+        tmp = dst.with_suffix(dst.suffix + ".tmp")
+        frame.save(tmp, **SAVE_OPTIONS[fmt])
+    os.replace(tmp, dst)
+    return tier, dst.stat().st_size, True
+
+
+def plan(sources: Sequence[Path], widths: Sequence[int], formats: Sequence[str]) -> list[tuple[str, str, str, int]]:
+    tasks = []
+    for fmt in formats:
+        for width in widths:
+            tier_dir = SEQUENCE_DIR / f"{fmt}-{width}"
+            tier_dir.mkdir(exist_ok=True)
+            tasks.extend(
+                (str(src), str(tier_dir / f"{src.stem}.{TIER_EXTENSIONS[fmt]}"), fmt, width)
+                for src in sources
+            )
+    return tasks
+
+
+def _csv(value: str) -> list[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widths", type=lambda v: [int(w) for w in _csv(v)], default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--formats", type=_csv, default=list(DEFAULT_FORMATS),
+                        help=f"comma-separated, from {', '.join(SAVE_OPTIONS)}")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="re-encode up-to-date frames too")
+    parser.add_argument("--json", type=Path, help="write the per-tier report here")
+    parser.add_argument("--optional", action="store_true", help="exit 0 without tiers when Pillow is missing")
+    args = parser.parse_args(argv)
+
+    if Image is None:
+        print("Pillow is required: pip install pillow", file=sys.stderr)
+        return 0 if args.optional else 2
+    formats = []
+    for fmt in args.formats:
+        if fmt not in SAVE_OPTIONS:
+            parser.error(f"unknown format {fmt!r}")
+        if fmt in ("webp", "avif") and not features.check(fmt):
+            print(f"Pillow has no {fmt} support; skipping {fmt} tiers", file=sys.stderr)
+            continue
+        formats.append(fmt)
+
+    base = build_manifest()
+    sources = [SEQUENCE_DIR / frame["file"] for frame in base["frames"]]
+    tasks = plan(sources, args.widths, formats)
+    if args.force:
+        for _, target, _, _ in tasks:
+            Path(target).unlink(missing_ok=True)
+
+    started = time.monotonic()
+    written = 0
+    with Pool(args.processes) as pool:
+        for _, _, fresh in pool.imap_unordered(transcode, tasks, chunksize=4):
+            written += fresh
+    elapsed = time.monotonic() - started
+
+    tiers = refresh_build_manifest(base)["tiers"]
+    original = base["totalBytes"]
+    report: list[dict[str, Any]] = [
+        {
+            "tier": tier["id"],
+            "width": tier["width"],
+            "height": tier["height"],
+            "bytes": tier["totalBytes"],
+            "saved_bytes": original - tier["totalBytes"],
+            "saved_pct": 100 * (original - tier["totalBytes"]) / original if original else 0.0,
+        }
+        for tier in tiers
+    ]
+    print(f"{written} frames encoded in {elapsed:.1f}s on {args.processes} processes; "
+          f"original {original / 1e6:.1f} MB")
+    print(f"{'tier':<12} {'size':>11} {'MB':>8} {'saved MB':>9} {'saved':>7}")
+    for row in report:
+        print(f"{row['tier']:<12} {row['width']:>5}x{row['height']:<5} {row['bytes'] / 1e6:>8.1f} "
+              f"{row['saved_bytes'] / 1e6:>9.1f} {row['saved_pct']:>6.1f}%")
+    if args.json:
+        args.json.write_text(json.dumps({"original_bytes": original, "tiers": report}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
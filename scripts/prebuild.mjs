@@ -0,0 +1,18 @@
+// Builds the hero renditions and atlases before `next build`. Both are
+// optional: without Python, Pillow or SKIP_SEQUENCE_BUILD=1, /api/sequence
+// serves the original frames.
+import { spawnSync } from "node:child_process";
+
+const python = process.env.PYTHON ?? "python3";
+const steps = ["build_sequence_renditions.py", "build_sequence_atlas.py"];
+
+if (process.env.SKIP_SEQUENCE_BUILD === "1") {
+  console.log("prebuild: SKIP_SEQUENCE_BUILD=1; serving the original frames");
+} else if (spawnSync(python, ["--version"], { stdio: "ignore" }).error) {
+  console.warn(`prebuild: ${python} not found; serving the original frames`);
+} else {
+  for (const script of steps) {
+    const { status } = spawnSync(python, [`scripts/${script}`, "--optional"], { stdio: "inherit" });
+    if (status !== 0) process.exit(status ?? 1);
+  }
+}
@@ -0,0 +1,188 @@
+"""Find near-duplicate hero frames and propose a thinned sequence.
+
+Every frame is decoded once at a small size (Pillow's JPEG draft mode) into a
+grayscale fingerprint. A single batched NumPy pass then computes a 64-bit
+difference hash per frame and the pairwise RMS distance between all
+fingerprints. Thinning keeps frame 0 and the last frame. It drops each frame
+that is within ``--max-rms`` (0–255 scale) and ``--max-hamming`` hash bits of
+the last kept frame, up to ``--max-gap`` frames in a row.
+
+The thinned manifest has the same shape as ``app/api/sequence/manifest.json``,
+with only the kept frames (each with its source ``index``). It also has a
+``frameMap`` entry for every source position, naming the kept frame shown
+there. Scroll progress still maps onto ``sourceFrameCount`` positions, so
+pacing is unchanged; a dropped position holds the previous kept frame::
+
+    python scripts/thin_sequence.py                                   # report only
+    python scripts/thin_sequence.py --max-rms 2.5 --out /tmp/thinned.json --json /tmp/thinning.json
+
+Needs Pillow and NumPy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+from build_sequence_manifest import SEQUENCE_DIR, build_manifest, render, sequence_hash
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+# 72×40 keeps the 16:9 frames' aspect and block-averages evenly to the 9×8 dHash grid.
+FINGERPRINT_SIZE = (72, 40)
+HASH_SIZE = (9, 8)
+
+
+def fingerprints(paths: Sequence[Path], size: tuple[int, int] = FINGERPRINT_SIZE) -> "np.ndarray":
+    """``(frames, height × width)`` float64 grayscale fingerprints."""
+    width, height = size
+    rows = np.empty((len(paths), height * width), dtype=np.float64)
+    for i, path in enumerate(paths):
+        with Image.open(path) as image:
+            image.draft("L", (width * 4, height * 4))  # decode at 1/2, 1/4 or 1/8 scale
+            small = image.convert("L").resize(size, Image.Resampling.BOX)
+        rows[i] = np.asarray(small, dtype=np.float64).ravel()
+    return rows
+
+
+def dhash_bits(prints: "np.ndarray", size: tuple[int, int] = FINGERPRINT_SIZE) -> "np.ndarray":
+    """``(frames, 64)`` difference-hash bits: is each cell brighter than its right neighbour."""
+    width, height = size
+    hash_w, hash_h = HASH_SIZE
+    grid = prints.reshape(-1, hash_h, height // hash_h, hash_w, width // hash_w).mean(axis=(2, 4))
+    return grid[:, :, 1:] > grid[:, :, :-1]
+
+
+def distances(prints: "np.ndarray", bits: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """Pairwise RMS distance (0–255) and hash Hamming distance between all frames."""
+    squared = (prints * prints).sum(axis=1)
+    d2 = squared[:, None] + squared[None, :] - 2.0 * prints @ prints.T
+    rms = np.sqrt(np.clip(d2, 0.0, None) / prints.shape[1])
+    flat = bits.reshape(len(bits), -1)
+    hamming = (flat[:, None, :] != flat[None, :, :]).sum(axis=2)
+    return rms, hamming
+
+
+def thin(rms: "np.ndarray", hamming: "np.ndarray", max_rms: float, max_hamming: int, max_gap: int) -> list[int]:
+    """Indices to keep; every dropped frame is within the limits of the kept frame before it."""
+    count = len(rms)
+    if count == 0:
+        return []
+    kept = [0]
+    for i in range(1, count):
+        last = kept[-1]
+        if (
+            i == count - 1
+            or rms[i, last] > max_rms
+            or hamming[i, last] > max_hamming
+            or i - last > max_gap
+        ):
+            kept.append(i)
+    return kept
+
+
+def frame_map(kept: Sequence[int], count: int) -> list[int]:
+    """Slot in ``kept`` shown at each source position (the last kept frame at or before it)."""
+    slots = np.searchsorted(np.asarray(kept), np.arange(count), side="right") - 1
+    return slots.tolist()
+
+
+def thinned_manifest(base: dict[str, Any], kept: Sequence[int], params: dict[str, Any]) -> dict[str, Any]:
+    frames = [base["frames"][i] | {"index": i} for i in kept]
+    return {
+        "version": base["version"],
+        "sequence": base["sequence"],
+        "hash": sequence_hash(frames),
+        "frameCount": len(frames),
+        "sourceFrameCount": base["frameCount"],
+        "sourceHash": base["hash"],
+        "totalBytes": sum(f["bytes"] for f in frames),
+        "frames": frames,
+        "frameMap": frame_map(kept, base["frameCount"]),
+        "thinning": params,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-rms", type=float, default=3.0,
+                        help="largest RMS fingerprint difference (0-255) a dropped frame may have")
+    parser.add_argument("--max-hamming", type=int, default=4, help="largest dHash distance, in bits")
+    parser.add_argument("--max-gap", type=int, default=4, help="most frames dropped in a row")
+    parser.add_argument("--out", type=Path, help="write the thinned manifest here")
+    parser.add_argument("--json", type=Path, help="write per-frame scores and the summary here")
+    args = parser.parse_args(argv)
+
+    if np is None or Image is None:
+        print("NumPy and Pillow are required: pip install numpy pillow", file=sys.stderr)
+        return 2
+    base = build_manifest()
+    frames = base["frames"]
+    if not frames:
+        print("no frames to analyze", file=sys.stderr)
+        return 1
+
+    started = time.monotonic()
+    prints = fingerprints([SEQUENCE_DIR / f["file"] for f in frames])
+    bits = dhash_bits(prints)
+    rms, hamming = distances(prints, bits)
+    elapsed = time.monotonic() - started
+    params = {"maxRms": args.max_rms, "maxHamming": args.max_hamming, "maxGap": args.max_gap,
+              "fingerprint": list(FINGERPRINT_SIZE)}
+    kept = thin(rms, hamming, args.max_rms, args.max_hamming, args.max_gap)
+    manifest = thinned_manifest(base, kept, params)
+
+    shown = np.asarray(kept)[manifest["frameMap"]]
+    error = rms[np.arange(len(frames)), shown]
+    saved_bytes = base["totalBytes"] - manifest["totalBytes"]
+    summary = {
+        "frames": len(frames),
+        "kept": len(kept),
+        "requests_saved": len(frames) - len(kept),
+        "bytes": base["totalBytes"],
+        "bytes_saved": saved_bytes,
+        "saved_pct": 100 * saved_bytes / base["totalBytes"] if base["totalBytes"] else 0.0,
+        "max_rms_shown": float(error.max()),
+        "mean_consecutive_rms": float(np.diagonal(rms, 1).mean()) if len(frames) > 1 else 0.0,
+        "analysis_s": elapsed,
+    }
+    print(f"analyzed {len(frames)} frames in {elapsed:.2f}s; mean consecutive RMS "
+          f"{summary['mean_consecutive_rms']:.2f}")
+    print(f"kept {len(kept)}/{len(frames)} frames at max RMS {args.max_rms:g}: "
+          f"{summary['requests_saved']} requests and {saved_bytes / 1e6:.1f} MB "
+          f"({summary['saved_pct']:.1f}%) saved; worst shown-frame RMS {summary['max_rms_shown']:.2f}")
+
+    if args.out:
+        args.out.write_text(render(manifest), encoding="utf-8")
+        print(f"wrote {args.out} (hash {manifest['hash'][:12]})")
+    if args.json:
+        scores = [
+            {
+                "index": i,
+                "file": frame["file"],
+                "rms_prev": float(rms[i, i - 1]) if i else None,
+                "hamming_prev": int(hamming[i, i - 1]) if i else None,
+                "dhash": "%016x" % int("".join("1" if b else "0" for b in bits[i].ravel()), 2),
+                "kept": bool(shown[i] == i),
+                "shown": int(shown[i]),
+            }
+            for i, frame in enumerate(frames)
+        ]
+        args.json.write_text(json.dumps({"summary": summary, "params": params, "frames": scores}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 import asyncio
+import hashlib
+import re
 from playwright import async_api
 
 async def run_test():
@@ -49,9 +51,35 @@ async def run_test():
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
         # -> Send GET request to http://localhost:3000/api/sequence and inspect the JSON response.
-        await page.goto("http://localhost:3000/api/sequence", wait_until="commit", timeout=10000)
-        
-        await asyncio.sleep(5)
+        response = await page.request.get("http://localhost:3000/api/sequence")
+        assert response.status == 200, f"/api/sequence returned {response.status}"
+        manifest = await response.json()
+        frames = manifest["frames"]
+
+        # -> Verify the manifest is complete and naturally ordered, and the URLs match the frames.
+        assert frames and manifest["frameCount"] == len(frames), "manifest frame count mismatch"
+        assert manifest["urls"] == [frame["url"] for frame in frames], "urls do not match frames"
+        keys = [int(re.sub(r"\D", "", frame["file"]) or 0) for frame in frames]
+        assert keys == sorted(keys) and len(set(keys)) == len(keys), "frames are not in natural order"
+        for frame in frames:
+            assert frame["url"] == f"/{manifest['sequence']}/{frame['file']}?v={frame['sha256'][:12]}", frame["url"]
+            assert frame["bytes"] > 0 and frame["width"] > 0 and frame["height"] > 0, frame["file"]
+
+        # -> Verify the sequence hash covers every frame hash.
+        digest = hashlib.sha256()
+        for frame in frames:
+            digest.update(f"{frame['file']} {frame['sha256']}\n".encode())
+        assert digest.hexdigest() == manifest["hash"], "sequence hash does not match frame hashes"
+
+        # -> Verify revalidation with the ETag and immutable caching on hashed frame URLs.
+        etag = response.headers["etag"]
+        assert etag == f'"{manifest["hash"]}"', f"unexpected ETag {etag}"
+        revalidated = await page.request.get("http://localhost:3000/api/sequence", headers={"If-None-Match": etag})
+        assert revalidated.status == 304, f"conditional GET returned {revalidated.status}"
+        first = await page.request.head("http://localhost:3000" + frames[0]["url"])
+        assert first.status == 200, f"{frames[0]['url']} returned {first.status}"
+        assert "immutable" in first.headers.get("cache-control", ""), first.headers.get("cache-control")
+        assert int(first.headers.get("content-length", frames[0]["bytes"])) == frames[0]["bytes"], "frame size mismatch"
 
     finally:
         if context:
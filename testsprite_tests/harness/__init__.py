@@ -0,0 +1,6 @@
+"""Local harness for the TestSprite TC*.py scenarios.
+
+Run modules from the ``testsprite_tests`` directory, e.g.::
+
+    python -m harness.runner --workers 4
+"""
@@ -0,0 +1,139 @@
+"""Time-to-``isReady`` with per-frame loading versus atlas sheets.
+
+Loads the landing page cold with ``?hero=frames`` and ``?hero=atlas`` under
+each network profile (see ``harness.network_bench``). It records time to the
+first hero image, time to ``isReady``, and the number of image requests and
+bytes fetched up to that point. Build the sheets first
+(``scripts/build_sequence_atlas.py``). Otherwise the atlas runs quietly fall
+back to per-frame loading, and the ``atlas`` column shows it::
+
+    python -m harness.atlas_bench --profiles 4g,cable --runs 5 --json tmp/atlas_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .network_bench import PROFILES, NetworkProfile, parse_profiles, throttle
+from .probes import install_timeline, read_timeline, wait_for_mark
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+from .stats import distribution
+
+MODES = ("frames", "atlas")
+FRAME_PATH = "/video-sequence-1/"
+
+
+async def measure_once(
+    browser: async_api.Browser, url: str, mode: str, profile: NetworkProfile, timeout_s: float
+) -> dict[str, Any]:
+    context = await browser.new_context()
+    images: list[str] = []
+    try:
+        await install_timeline(context)
+        page = await context.new_page()
+        await throttle(context, page, profile)
+        page.on("request", lambda r: images.append(r.url) if FRAME_PATH in r.url else None)
+        await page.goto(f"{url.rstrip('/')}/?hero={mode}", wait_until="commit")
+        ready = await wait_for_mark(page, "is_ready", timeout_s * 1000)
+        requests_at_ready = len(images)
+        snapshot = await read_timeline(page)
+    finally:
+        await context.close()
+    marks = snapshot["marks"]
+    return {
+        "mode": mode,
+        "profile": profile.name,
+        "ready_ms": marks.get("is_ready") if ready else None,
+        "ttff_ms": marks.get("first_frame"),
+        "requests_at_ready": requests_at_ready,
+        "bytes_at_ready": snapshot["frameBytes"],
+        "atlas": any("/atlas-" in image for image in images),
+    }
+
+
+async def run(
+    url: str, modes: Sequence[str], profiles: Sequence[NetworkProfile], runs: int,
+    timeout_s: float, daemon_url: str | None,
+) -> list[dict[str, Any]]:
+    records = []
+    async with async_api.async_playwright() as pw:
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        try:
+            for profile in profiles:
+                for index in range(runs):
+                    # Alternate modes within a run so drift affects both equally.
+                    for mode in modes:
+                        record = await measure_once(lease.browser, url, mode, profile, timeout_s)
+                        record["run"] = index
+                        records.append(record)
+                        print(f"{profile.name} {mode} run {index}: ready {record['ready_ms']}, "
+                              f"{record['requests_at_ready']} requests", flush=True)
+        finally:
+            await lease.release(len(profiles) * runs * len(modes))
+    return records
+
+
+def compare(records: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault((record["profile"], record["mode"]), []).append(record)
+    rows = []
+    for (profile, mode), group in groups.items():
+        ready = distribution(r["ready_ms"] for r in group)
+        baseline = groups.get((profile, "frames"))
+        base_p50 = distribution(r["ready_ms"] for r in baseline)["p50"] if baseline else None
+        rows.append({
+            "profile": profile,
+            "mode": mode,
+            "runs": len(group),
+            "atlas": all(r["atlas"] for r in group),
+            "ready_ms": ready,
+            "ttff_ms": distribution(r["ttff_ms"] for r in group),
+            "requests_at_ready": distribution(r["requests_at_ready"] for r in group)["p50"],
+            "mb_at_ready": distribution(r["bytes_at_ready"] / 1e6 for r in group)["p50"],
+            "speedup": base_p50 / ready["p50"] if base_p50 and ready["p50"] else None,
+        })
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.atlas_bench", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--profiles", type=parse_profiles, default=[PROFILES["4g"], PROFILES["localhost"]],
+                        help=f"comma-separated, from {', '.join(PROFILES)}")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per page load")
+    parser.add_argument("--json", metavar="PATH")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+
+    records = asyncio.run(run(
+        args.url, MODES, args.profiles, args.runs, args.timeout,
+        None if args.no_daemon else DEFAULT_URL,
+    ))
+    rows = compare(records)
+    print(format_table(
+        ("profile", "mode", "atlas", "ready p50", "ready p95", "ttff p50", "requests", "MB", "speedup"),
+        [
+            (r["profile"], r["mode"], "yes" if r["atlas"] else "no", r["ready_ms"]["p50"],
+             r["ready_ms"]["p95"], r["ttff_ms"]["p50"], r["requests_at_ready"], r["mb_at_ready"],
+             r["speedup"])
+            for r in rows
+        ],
+    ))
+    if args.json:
+        write_json(args.json, {"url": args.url, "runs": records, "comparison": rows})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Hero render loop on a throttled CPU, as on budget Android phones.
+
+``HeroScroll`` eases toward the scroll target and draws on a DPR-scaled
+canvas on every ``requestAnimationFrame``, and ``SmoothScroll`` runs Lenis's
+own rAF loop next to it. A fast laptop hides what that costs. For each mobile
+device and each ``--rates`` factor, this benchmark:
+
+1. loads the page unthrottled and waits for the frames to finish loading;
+2. applies CDP ``Emulation.setCPUThrottlingRate``;
+3. wheels down through the hero and back up, as ``harness.scroll_bench`` does.
+
+Over the sweep it reports:
+
+- main-thread busy time per frame, from the change in ``Performance.getMetrics``
+  ``TaskDuration``, split into script, layout and style recalculation;
+- the cost of each rAF callback of the two loops, from ``probeRaf`` in
+  ``lib/perfProbe.ts``;
+- achieved FPS, p95 frame time and dropped frames, from rAF timestamps.
+
+Rate 1 is the unthrottled baseline. ``performance.now()`` is coarsened to
+0.1 ms without cross-origin isolation, so very cheap callbacks read as 0::
+
+    python -m harness.cpu_throttle --rates 1,4,6 --device "Moto G4" --device "Pixel 7"
+    python -m harness.cpu_throttle --min-fps 45 --max-busy-ms 12 --json tmp/cpu_throttle.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .probes import HERO_READY_SELECTOR, install_raf_cost_probe, install_scroll_probe, reset_scroll_probe
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+from .scroll_bench import analyze, hero_scroll_end, wheel_until
+from .stats import distribution
+from .web_vitals import describe_options, device_options
+
+DEFAULT_DEVICES = ("Moto G4", "Pixel 7")
+DEFAULT_RATES = (1.0, 4.0, 6.0)
+LOOPS = ("hero", "lenis")
+# Cumulative seconds in Performance.getMetrics.
+BUSY_METRICS = {
+    "busy": "TaskDuration",
+    "script": "ScriptDuration",
+    "layout": "LayoutDuration",
+    "style": "RecalcStyleDuration",
+}
+SWEEP_STEP_PX = 120
+SWEEP_INTERVAL_MS = 16
+SETTLE_MS = 1500
+
+
+async def _metrics(cdp: async_api.CDPSession) -> dict[str, float]:
+    return {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+
+
+def loop_costs(samples: Sequence[dict[str, Any]], frames: int) -> dict[str, dict[str, Any]]:
+    """Per loop: callback duration distribution and main-thread ms per rendered frame."""
+    costs = {}
+    for loop in LOOPS:
+        durations = [s["ms"] for s in samples if s["loop"] == loop]
+        costs[loop] = {
+            "calls": len(durations),
+            "ms": distribution(durations),
+            "ms_per_frame": sum(durations) / frames if frames else None,
+        }
+    return costs
+
+
+async def measure(
+    browser: async_api.Browser, url: str, options: dict[str, Any], rate: float, refresh_hz: float,
+) -> dict[str, Any]:
+    context = await browser.new_context(**options)
+    try:
+        await install_scroll_probe(context)
+        await install_raf_cost_probe(context)
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        await page.goto(url)
+        await page.wait_for_selector(HERO_READY_SELECTOR, state="attached", timeout=60_000)
+        await page.wait_for_load_state("networkidle")
+        viewport = options["viewport"]
+        await page.mouse.move(viewport["width"] / 2, viewport["height"] / 2)
+        end = await hero_scroll_end(page)
+
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": rate})
+        await reset_scroll_probe(page)
+        await page.evaluate("() => { window.__rafProbe.length = 0; }")
+        before = await _metrics(cdp)
+        await wheel_until(page, end, SWEEP_STEP_PX, SWEEP_INTERVAL_MS)
+        await wheel_until(page, 0, -SWEEP_STEP_PX, SWEEP_INTERVAL_MS)
+        await page.wait_for_timeout(SETTLE_MS)  # Lenis keeps easing after the last wheel
+        after = await _metrics(cdp)
+        probe = await page.evaluate(
+            "() => ({ hero: window.__heroProbe, raf: window.__harnessRaf, loops: window.__rafProbe })"
+        )
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": 1})
+    finally:
+        await context.close()
+
+    smoothness = analyze([probe], refresh_hz)
+    frames = smoothness["frames"]
+    raf = probe["raf"]
+    elapsed_ms = raf[-1] - raf[0] if len(raf) > 1 else 0.0
+    busy = {
+        name: (after.get(metric, 0) - before.get(metric, 0)) * 1000 / frames if frames else None
+        for name, metric in BUSY_METRICS.items()
+    }
+    loops = loop_costs(probe["loops"], frames)
+    raf_ms = sum(loops[loop]["ms_per_frame"] or 0 for loop in LOOPS)
+    return {
+        "rate": rate,
+        "frames": frames,
+        "fps": 1000 * frames / elapsed_ms if elapsed_ms else None,
+        "frame_time_ms": smoothness["frame_time_ms"],
+        "dropped_pct": smoothness["dropped_pct"],
+        "lagged_pct": smoothness["lagged_pct"],
+        "busy_ms_per_frame": busy,
+        "loops": loops,
+        "raf_share_pct": 100 * raf_ms / busy["busy"] if busy["busy"] else None,
+    }
+
+
+async def run(
+    url: str, devices: Sequence[str], rates: Sequence[float], refresh_hz: float, daemon_url: str | None,
+) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]]]:
+    results = []
+    async with async_api.async_playwright() as pw:
+        options = {name: device_options(pw, name) for name in devices}
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        try:
+            # One at a time: a throttled page must not share the CPU with another.
+            for name in devices:
+                for rate in rates:
+                    result = await measure(lease.browser, url, options[name], rate, refresh_hz)
+                    result["device"] = name
+                    results.append(result)
+                    print(f"{name} {rate:g}x: {result['fps'] or 0:.1f} fps, "
+                          f"{result['busy_ms_per_frame']['busy'] or 0:.2f} ms busy/frame", flush=True)
+        finally:
+            await lease.release(len(devices) * len(rates))
+    return options, results
+
+
+def check(result: dict[str, Any], min_fps: float | None, max_busy_ms: float | None) -> list[str]:
+    violations = []
+    fps, busy = result["fps"], result["busy_ms_per_frame"]["busy"]
+    if min_fps is not None and fps is not None and fps < min_fps:
+        violations.append(f"fps {fps:.1f} < {min_fps:g}")
+    if max_busy_ms is not None and busy is not None and busy > max_busy_ms:
+        violations.append(f"busy {busy:.2f} ms/frame > {max_busy_ms:g}")
+    return violations
+
+
+def _rates(value: str) -> list[float]:
+    return [float(r) for r in value.split(",") if r.strip()]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.cpu_throttle", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--device", action="append", dest="devices", metavar="NAME",
+                        help=f"Playwright device name (repeatable; default: {', '.join(DEFAULT_DEVICES)})")
+    parser.add_argument("--rates", type=_rates, default=list(DEFAULT_RATES), metavar="N,N",
+                        help="CPU slowdown factors; 1 is the baseline")
+    parser.add_argument("--refresh-hz", type=float, default=60.0)
+    parser.add_argument("--min-fps", type=float, help="fail a throttled run below this FPS")
+    parser.add_argument("--max-busy-ms", type=float, help="fail a throttled run above this main-thread ms per frame")
+    parser.add_argument("--json", metavar="PATH")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+
+    devices = args.devices or list(DEFAULT_DEVICES)
+    try:
+        options, results = asyncio.run(run(
+            args.url, devices, args.rates, args.refresh_hz, None if args.no_daemon else DEFAULT_URL
+        ))
+    except KeyError as exc:
+        print(f"Unknown device {exc}; see playwright's devices list.", file=sys.stderr)
+        return 2
+    for result in results:
+        result["violations"] = check(result, args.min_fps, args.max_busy_ms) if result["rate"] > 1 else []
+
+    print()
+    print(format_table(
+        ("device", "viewport", "CPU", "fps", "p95 ms", "dropped %", "busy ms/f", "script", "layout", "style",
+         "hero ms/f", "hero p95", "lenis ms/f", "lenis p95", "rAF % busy"),
+        [
+            (r["device"], describe_options(options[r["device"]]), f"{r['rate']:g}x", r["fps"],
+             r["frame_time_ms"]["p95"], r["dropped_pct"], *r["busy_ms_per_frame"].values(),
+             r["loops"]["hero"]["ms_per_frame"], r["loops"]["hero"]["ms"]["p95"],
+             r["loops"]["lenis"]["ms_per_frame"], r["loops"]["lenis"]["ms"]["p95"], r["raf_share_pct"])
+            for r in results
+        ],
+    ))
+    for r in results:
+        for violation in r["violations"]:
+            print(f"{r['device']} {r['rate']:g}x: {violation}")
+    if args.json:
+        write_json(args.json, {
+            "url": args.url,
+            "devices": {name: options[name] for name in devices},
+            "results": results,
+        })
+    return 1 if any(r["violations"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""Long-lived warm Chromium for back-to-back harness runs.
+
+The daemon keeps a Chromium running with a CDP port open and hands it out
+through a small JSON control API. Clients (the runner and the benchmarks)
+call :func:`acquire_browser`, which leases the warm browser and attaches with
+``chromium.connect_over_cdp()``; when no daemon answers it falls back to a
+normal ``chromium.launch()``. A browser that has served ``--recycle-after``
+contexts is replaced on the next lease and closed once its last lease is
+released, which keeps memory bounded::
+
+    python -m harness.daemon start --recycle-after 50 &
+    python -m harness.runner TC003        # attaches to the warm browser
+    python -m harness.daemon status
+    python -m harness.daemon stop
+
+Control API (``http://127.0.0.1:9323`` by default, or ``$HARNESS_BROWSER_DAEMON``):
+``POST /lease``, ``POST /release``, ``GET /status`` and ``POST /shutdown``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from playwright import async_api
+
+DEFAULT_PORT = 9323
+DEFAULT_URL = os.environ.get("HARNESS_BROWSER_DAEMON", f"http://127.0.0.1:{DEFAULT_PORT}")
+RECYCLE_AFTER = 50
+LAUNCH_ARGS = ["--window-size=1280,720", "--disable-dev-shm-usage"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@dataclass
+class _ManagedBrowser:
+    id: int
+    browser: async_api.Browser
+    port: int
+    leases: int = 0
+    contexts: int = 0
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+class BrowserPool:
+    """The daemon's browsers: one current, plus retiring ones still leased."""
+
+    def __init__(
+        self, pw: async_api.Playwright, *, headless: bool, recycle_after: int
+    ) -> None:
+        self._pw = pw
+        self._headless = headless
+        self._recycle_after = recycle_after
+        self._next_id = 1
+        self._lock = asyncio.Lock()
+        self.current: _ManagedBrowser | None = None
+        self.retiring: list[_ManagedBrowser] = []
+        self.launches = 0
+
+    async def _launch(self) -> _ManagedBrowser:
+        port = _free_port()
+        browser = await self._pw.chromium.launch(
+            headless=self._headless,
+            args=[*LAUNCH_ARGS, f"--remote-debugging-port={port}"],
+        )
+        managed = _ManagedBrowser(self._next_id, browser, port)
+        self._next_id += 1
+        self.launches += 1
+        return managed
+
+    async def lease(self) -> dict[str, Any]:
+        async with self._lock:
+            current = self.current
+            if (
+                current is None
+                or current.contexts >= self._recycle_after
+                or not current.browser.is_connected()
+            ):
+                if current is not None:
+                    self.retiring.append(current)
+                self.current = current = await self._launch()
+                await self._reap()
+            current.leases += 1
+            return {"browser": current.id, "endpoint": current.endpoint}
+
+    async def release(self, browser_id: int, contexts: int) -> None:
+        async with self._lock:
+            for managed in [self.current, *self.retiring]:
+                if managed is not None and managed.id == browser_id:
+                    managed.leases = max(0, managed.leases - 1)
+                    managed.contexts += contexts
+            await self._reap()
+
+    async def _reap(self) -> None:
+        idle = [m for m in self.retiring if m.leases == 0]
+        self.retiring = [m for m in self.retiring if m.leases > 0]
+        for managed in idle:
+            await managed.browser.close()
+
+    def status(self) -> dict[str, Any]:
+        def describe(m: _ManagedBrowser) -> dict[str, Any]:
+            return {"id": m.id, "endpoint": m.endpoint, "leases": m.leases, "contexts": m.contexts}
+
+        return {
+            "current": describe(self.current) if self.current else None,
+            "retiring": [describe(m) for m in self.retiring],
+            "launches": self.launches,
+            "recycle_after": self._recycle_after,
+        }
+
+    async def close(self) -> None:
+        for managed in [self.current, *self.retiring]:
+            if managed is not None:
+                await managed.browser.close()
+        self.current, self.retiring = None, []
+
+
+class ControlServer:
+    """Minimal HTTP/1.1 JSON endpoint in front of a :class:`BrowserPool`."""
+
+    def __init__(self, pool: BrowserPool) -> None:
+        self.pool = pool
+        self.stopped = asyncio.Event()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+            length = 0
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            payload = json.loads(await reader.readexactly(length)) if length else {}
+            status, body = await self.route(method, path, payload)
+        except Exception as exc:  # noqa: BLE001 - report to the client
+            status, body = 500, {"error": str(exc)}
+        data = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+        writer.close()
+
+    async def route(self, method: str, path: str, payload: dict) -> tuple[int, Any]:
+        if method == "POST" and path == "/lease":
+            return 200, await self.pool.lease()
+        if method == "POST" and path == "/release":
+            await self.pool.release(int(payload["browser"]), int(payload.get("contexts", 0)))
+            return 200, {"ok": True}
+        if method == "GET" and path == "/status":
+            return 200, self.pool.status()
+        if method == "POST" and path == "/shutdown":
+            self.stopped.set()
+            return 200, {"ok": True}
+        return 404, {"error": f"no route for {method} {path}"}
+
+
+async def serve(port: int, *, headless: bool, recycle_after: int) -> None:
+    async with async_api.async_playwright() as pw:
+        pool = BrowserPool(pw, headless=headless, recycle_after=recycle_after)
+        await pool.lease()  # warm up
+        await pool.release(pool.current.id, 0)
+        control = ControlServer(pool)
+        server = await asyncio.start_server(control.handle, "127.0.0.1", port)
+        print(f"browser daemon on http://127.0.0.1:{port}", flush=True)
+        async with server:
+            await control.stopped.wait()
+        await pool.close()
+
+
+def request(url: str, path: str, payload: dict | None = None, timeout: float = 0.5) -> Any:
+    """Call the control API; raises ``OSError`` when no daemon is listening."""
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(
+        url.rstrip("/") + path,
+        data=data,
+        method="POST" if data is not None else "GET",
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+@dataclass
+class BrowserLease:
+    browser: async_api.Browser
+    source: str
+    daemon_url: str | None = None
+    browser_id: int | None = None
+
+    async def release(self, contexts: int = 0) -> None:
+        # For a CDP attachment this only disconnects; the daemon's browser lives on.
+        await self.browser.close()
+        if self.source == "daemon":
+            await _return_lease(self.daemon_url, self.browser_id, contexts)
+
+
+async def _return_lease(daemon_url: str, browser_id: int, contexts: int) -> None:
+    try:
+        await asyncio.to_thread(
+            request, daemon_url, "/release", {"browser": browser_id, "contexts": contexts}
+        )
+    except OSError:
+        pass
+
+
+async def acquire_browser(
+    pw: async_api.Playwright,
+    *,
+    headless: bool = True,
+    daemon_url: str | None = DEFAULT_URL,
+) -> BrowserLease:
+    """Lease the daemon's warm browser, or launch one if no daemon answers."""
+    if daemon_url:
+        try:
+            lease = await asyncio.to_thread(request, daemon_url, "/lease", {})
+        except (OSError, ValueError):
+            lease = None
+        if lease is not None:
+            try:
+                browser = await pw.chromium.connect_over_cdp(lease["endpoint"])
+            except BaseException:
+                # Hand the slot back, or the daemon never retires that browser.
+                await _return_lease(daemon_url, lease["browser"], 0)
+                raise
+            return BrowserLease(browser, "daemon", daemon_url, lease["browser"])
+    browser = await pw.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+    return BrowserLease(browser, "launch")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.daemon", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("command", choices=("start", "status", "stop"))
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--recycle-after", type=int, default=RECYCLE_AFTER,
+                        help="contexts served before the browser is replaced")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    url = f"http://127.0.0.1:{args.port}"
+    if args.command == "start":
+        asyncio.run(serve(args.port, headless=not args.headed, recycle_after=args.recycle_after))
+        return 0
+    try:
+        result = request(url, "/status" if args.command == "status" else "/shutdown",
+                         None if args.command == "status" else {})
+    except OSError:
+        print(f"no browser daemon at {url}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Process-wide cache for the hero frame sequence.
+
+``useImagePreloader`` fetches all 192 JPEGs of ``/video-sequence-1/`` (about
+159 MB) in every fresh browser context, so a suite run re-reads and re-sends
+the same bytes once per test. :class:`FrameCache` installs a
+``context.route`` handler that answers those requests from memory: the first
+request for a frame goes to the dev server, every later one, from any
+context, is fulfilled from the cache. Concurrent misses for the same frame
+share one upstream fetch. Entries are evicted least-recently-used once
+``max_bytes`` is exceeded; with ``disk_dir`` evicted frames stay on disk and
+are reloaded from there instead of the server.
+
+The browser still decodes every frame per page; what the cache removes is
+the dev server's file reads and the HTTP transfer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from playwright import async_api
+
+FRAME_URL = re.compile(r"/video-sequence-1/")
+DEFAULT_MAX_MB = 256
+_DROP_HEADERS = frozenset({"content-length", "content-encoding", "transfer-encoding"})
+
+
+@dataclass
+class CachedFrame:
+    body: bytes
+    headers: dict[str, str]
+    status: int = 200
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    bytes_served: int = 0
+    bytes_fetched: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+
+class FrameCache:
+    def __init__(
+        self, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024, disk_dir: str | Path | None = None
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = CacheStats()
+        self.size = 0
+        self._entries: OrderedDict[str, CachedFrame] = OrderedDict()
+        self._pending: dict[str, asyncio.Future[CachedFrame]] = {}
+
+    async def install(self, context: async_api.BrowserContext, _scenario: Any = None) -> None:
+        """Context hook: route frame requests through the cache."""
+        await context.route(FRAME_URL, self.handle)
+
+    async def handle(self, route: async_api.Route) -> None:
+        request = route.request
+        if request.method != "GET":
+            await route.continue_()
+            return
+        key = request.url
+        frame = self._get(key)
+        if frame is None:
+            frame = await self._load(key, route)
+        if frame is None:
+            return  # upstream failed; the request was passed through instead
+        self.stats.bytes_served += len(frame.body)
+        await route.fulfill(status=frame.status, headers=frame.headers, body=frame.body)
+
+    def _get(self, key: str) -> CachedFrame | None:
+        frame = self._entries.get(key)
+        if frame is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+        return frame
+
+    async def _load(self, key: str, route: async_api.Route) -> CachedFrame | None:
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.stats.hits += 1
+            try:
+                return await asyncio.shield(pending)
+            except Exception:  # noqa: BLE001 - the owning request reports it
+                await self._pass_through(route)
+                return None
+
+        frame = self._read_disk(key)
+        if frame is not None:
+            self.stats.disk_hits += 1
+            self._put(key, frame)
+            return frame
+
+        self.stats.misses += 1
+        future: asyncio.Future[CachedFrame] = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as exc:  # noqa: BLE001 - fall back to the network
+            future.set_exception(exc)
+            future.exception()  # mark retrieved; waiters fall back as well
+            await self._pass_through(route)
+            return None
+        finally:
+            self._pending.pop(key, None)
+        self.stats.bytes_fetched += len(body)
+        frame = CachedFrame(
+            body=body,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+            status=response.status,
+        )
+        future.set_result(frame)
+        if response.status == 200:
+            self._put(key, frame)
+            self._write_disk(key, frame)
+        return frame
+
+    @staticmethod
+    async def _pass_through(route: async_api.Route) -> None:
+        try:
+            await route.continue_()
+        except async_api.Error:
+            pass  # context already closed
+
+    def _put(self, key: str, frame: CachedFrame) -> None:
+        if len(frame.body) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old.body)
+        self._entries[key] = frame
+        self.size += len(frame.body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.body)
+            self.stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Path | None:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / hashlib.sha1(key.encode()).hexdigest()
+
+    def _read_disk(self, key: str) -> CachedFrame | None:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+            return CachedFrame(body=path.read_bytes(), headers=meta["headers"])
+        except (OSError, ValueError, KeyError):
+            return None  # sidecar missing, e.g. a write interrupted before it landed: refetch
+
+    def _write_disk(self, key: str, frame: CachedFrame) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        # Each file is swapped in whole, and the sidecar goes last, so an
+        # interrupted write leaves a body without a sidecar, which reads as a miss.
+        sidecar = path.with_suffix(".json")
+        sidecar.unlink(missing_ok=True)
+        _replace(path, frame.body)
+        _replace(sidecar, json.dumps({"url": key, "headers": frame.headers}).encode("utf-8"))
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "cached_mb": self.size / 1e6,
+            "hits": self.stats.hits,
+            "disk_hits": self.stats.disk_hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "hit_rate": self.stats.hit_rate,
+            "served_mb": self.stats.bytes_served / 1e6,
+            "fetched_mb": self.stats.bytes_fetched / 1e6,
+        }
+
+
+def _replace(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+_shared: FrameCache | None = None
+
+
+def shared_cache(**options: Any) -> FrameCache:
+    """The process-wide cache; ``options`` only apply on first use."""
+    global _shared
+    if _shared is None:
+        _shared = FrameCache(**options)
+    return _shared
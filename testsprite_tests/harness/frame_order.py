@@ -0,0 +1,265 @@
+"""Verify from canvas pixels that the hero shows its frames in scroll order.
+
+TC002 cannot see which frame is on the ``<canvas>``. This tool steps the
+scroll position once for every frame of the hero. At each stop it waits for
+HeroScroll to settle (``lib/perfProbe.ts``), then reduces the canvas to a
+small grayscale grid in the page. All captures come back in one batch and are
+matched against downsampled fingerprints of every JPEG in
+``public/video-sequence-1``. The fingerprints are cropped the way the canvas
+cover-scales them, and the nearest-neighbour search is a single NumPy matrix
+product. The report compares the best-matching frame index with the index
+that scroll progress asks for::
+
+    python -m harness.frame_order --json tmp/frame_order.json
+
+The hero scrolls through only 20vh of height, so the default viewport is tall
+enough to give every frame at least one pixel of scroll. Consecutive frames
+can be nearly identical, so a capture also counts as correct when the
+expected frame is within ``--slack`` of the best match. The slack applies
+only to that per-stop verdict: backwards steps and the rank correlation use
+the best match alone. Exits 1 on any mismatch or backwards step.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+from PIL import Image
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .probes import HERO_READY_SELECTOR, install_scroll_probe, reset_scroll_probe
+from .report import format_table, write_json
+from .scenarios import BASE_URL, TESTS_DIR
+from .sequence_load import natural_key
+
+FRAMES_DIR = TESTS_DIR.parent / "public" / "video-sequence-1"
+FRAME_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp")
+GRID = (64, 36)
+SUPERSAMPLE = 4
+
+CAPTURE_JS = """
+async ({ selector, positions, grid, supersample, timeoutMs }) => {
+  const hero = document.querySelector(selector);
+  const canvas = hero.querySelector("canvas");
+  const frameCount = Number(hero.dataset.frameCount);
+  const top = hero.offsetTop;
+  const maxScroll = Math.max(0, hero.offsetHeight - window.innerHeight);
+  const [gw, gh] = grid;
+  const small = document.createElement("canvas");
+  small.width = gw * supersample;
+  small.height = gh * supersample;
+  const sctx = small.getContext("2d", { willReadFrequently: true });
+  sctx.imageSmoothingQuality = "high";
+  const nextFrame = () => new Promise((resolve) => requestAnimationFrame(resolve));
+  const samples = [];
+  for (const position of positions) {
+    window.scrollTo(0, top + position * maxScroll);
+    await nextFrame();
+    const scrollY = window.scrollY;
+    const progress = maxScroll <= 0 ? 0 : Math.max(0, Math.min(1, (scrollY - top) / maxScroll));
+    const expected = Math.min(Math.floor(progress * frameCount), frameCount - 1);
+    const started = performance.now();
+    let last = null;
+    let settled = false;
+    while (performance.now() - started < timeoutMs) {
+      last = window.__heroProbe.at(-1) ?? null;
+      if (last && last.target === expected && last.drawn === expected) {
+        settled = true;
+        break;
+      }
+      await nextFrame();
+    }
+    sctx.drawImage(canvas, 0, 0, small.width, small.height);
+    const data = sctx.getImageData(0, 0, small.width, small.height).data;
+    const cells = new Float64Array(gw * gh);
+    for (let y = 0; y < small.height; y++) {
+      for (let x = 0; x < small.width; x++) {
+        const i = (y * small.width + x) * 4;
+        cells[Math.floor(y / supersample) * gw + Math.floor(x / supersample)] +=
+          0.299 * data[i] + 0.587 * data[i + 1] + 0.114 * data[i + 2];
+      }
+    }
+    samples.push({
+      scrollY,
+      progress,
+      expected,
+      drawn: last ? last.drawn : null,
+      settled,
+      grid: Array.from(cells, (v) => v / (supersample * supersample)),
+    });
+  }
+  return { frameCount, canvas: [canvas.width, canvas.height], samples };
+}
+"""
+
+
+def frame_paths(frames_dir: Path = FRAMES_DIR) -> list[Path]:
+    paths = [p for p in frames_dir.iterdir() if p.is_file() and p.suffix.lower() in FRAME_SUFFIXES]
+    return sorted(paths, key=lambda p: natural_key(p.name))
+
+
+def reference_fingerprints(
+    paths: Sequence[Path], canvas_size: tuple[int, int], grid: tuple[int, int] = GRID
+) -> np.ndarray:
+    """``(frames, cells)`` grayscale grids of each frame as the canvas crops it (object-cover)."""
+    canvas_w, canvas_h = canvas_size
+    rows = np.empty((len(paths), grid[0] * grid[1]), dtype=np.float64)
+    for i, path in enumerate(paths):
+        with Image.open(path) as image:
+            image.draft("RGB", (grid[0] * 8, grid[1] * 8))
+            width, height = image.size
+            scale = max(canvas_w / width, canvas_h / height)
+            crop_w, crop_h = canvas_w / scale, canvas_h / scale
+            box = ((width - crop_w) / 2, (height - crop_h) / 2, (width + crop_w) / 2, (height + crop_h) / 2)
+            small = image.convert("L").resize(grid, Image.Resampling.BOX, box=box)
+        rows[i] = np.asarray(small, dtype=np.float64).ravel()
+    return rows
+
+
+def match(captures: np.ndarray, references: np.ndarray) -> np.ndarray:
+    """RMS distance from every capture to every reference, after removing each grid's mean level."""
+    a = captures - captures.mean(axis=1, keepdims=True)
+    b = references - references.mean(axis=1, keepdims=True)
+    d2 = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * a @ b.T
+    return np.sqrt(np.clip(d2, 0.0, None) / a.shape[1])
+
+
+def analyze(samples: Sequence[dict[str, Any]], distances: np.ndarray, slack: float) -> dict[str, Any]:
+    """Per-stop matches plus the monotonicity summary of matched index against progress."""
+    best = distances.argmin(axis=1)
+    rows = []
+    for k, sample in enumerate(samples):
+        d = distances[k]
+        expected, matched = sample["expected"], int(best[k])
+        ok = matched == expected or d[expected] <= d[matched] * (1 + slack)
+        rows.append({
+            "stop": k,
+            "scroll_y": sample["scrollY"],
+            "progress": sample["progress"],
+            "expected": expected,
+            "drawn": sample["drawn"],
+            "settled": sample["settled"],
+            "matched": matched,
+            "distance": float(d[matched]),
+            "expected_distance": float(d[expected]),
+            "ok": bool(ok),
+        })
+    # Not the slack-adjusted verdict: that would read the expected order back.
+    matched = np.array([r["matched"] for r in rows])
+    steps = np.diff(matched)
+    backwards = [int(k + 1) for k in np.flatnonzero(steps < 0)]
+    if len(matched) > 1 and matched.std() > 0:
+        progress = np.array([r["progress"] for r in rows])
+        rank_a, rank_b = progress.argsort().argsort(), matched.argsort().argsort()
+        spearman = float(np.corrcoef(rank_a, rank_b)[0, 1])
+    else:
+        spearman = None
+    return {
+        "stops": len(rows),
+        "frames": distances.shape[1],
+        "mismatches": sum(not r["ok"] for r in rows),
+        "unsettled": sum(not r["settled"] for r in rows),
+        "backwards_steps": backwards,
+        "max_backwards": int(-steps.min()) if len(steps) and steps.min() < 0 else 0,
+        "distinct_frames": len(set(matched.tolist())),
+        "spearman": spearman,
+        "monotonic": not backwards,
+        "stops_detail": rows,
+    }
+
+
+async def capture(
+    url: str, viewport: dict[str, int], timeout_ms: int, daemon_url: str | None
+) -> dict[str, Any]:
+    async with async_api.async_playwright() as pw:
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        try:
+            context = await lease.browser.new_context(viewport=viewport)
+            try:
+                await install_scroll_probe(context)
+                page = await context.new_page()
+                await page.goto(url)
+                hero = await page.wait_for_selector(HERO_READY_SELECTOR, state="attached", timeout=60_000)
+                await page.wait_for_load_state("networkidle")
+                count = int(await hero.get_attribute("data-frame-count"))
+                await reset_scroll_probe(page)
+                return await page.evaluate(CAPTURE_JS, {
+                    "selector": HERO_READY_SELECTOR,
+                    "positions": [(i + 0.5) / count for i in range(count)],
+                    "grid": list(GRID),
+                    "supersample": SUPERSAMPLE,
+                    "timeoutMs": timeout_ms,
+                })
+            finally:
+                await context.close()
+        finally:
+            await lease.release(1)
+
+
+def _viewport(value: str) -> dict[str, int]:
+    width, _, height = value.partition("x")
+    return {"width": int(width), "height": int(height)}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.frame_order", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--viewport", type=_viewport, default=_viewport("1280x1200"), metavar="WxH")
+    parser.add_argument("--frames-dir", type=Path, default=FRAMES_DIR)
+    parser.add_argument("--slack", type=float, default=0.1,
+                        help="accept the expected frame within this fraction of the best match's distance")
+    parser.add_argument("--settle-ms", type=int, default=2000, help="longest wait per stop")
+    parser.add_argument("--json", metavar="PATH")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    captured = asyncio.run(capture(
+        args.url, args.viewport, args.settle_ms, None if args.no_daemon else DEFAULT_URL
+    ))
+    captured_s = time.monotonic() - started
+    paths = frame_paths(args.frames_dir)
+    if len(paths) != captured["frameCount"]:
+        print(f"page reports {captured['frameCount']} frames, {args.frames_dir} has {len(paths)}",
+              file=sys.stderr)
+        return 2
+    references = reference_fingerprints(paths, tuple(captured["canvas"]))
+    grids = np.array([s["grid"] for s in captured["samples"]], dtype=np.float64)
+    result = analyze(captured["samples"], match(grids, references), args.slack)
+    result.update(url=args.url, viewport=args.viewport, canvas=captured["canvas"],
+                  capture_s=captured_s, total_s=time.monotonic() - started)
+
+    print(format_table(
+        ("metric", "value"),
+        [
+            ("stops", result["stops"]),
+            ("distinct frames shown", result["distinct_frames"]),
+            ("mismatches", result["mismatches"]),
+            ("unsettled stops", result["unsettled"]),
+            ("backwards steps", len(result["backwards_steps"])),
+            ("largest step back", result["max_backwards"]),
+            ("spearman(progress, frame)", result["spearman"]),
+            ("capture s", result["capture_s"]),
+            ("total s", result["total_s"]),
+        ],
+    ))
+    for row in result["stops_detail"]:
+        if not row["ok"]:
+            print(f"stop {row['stop']} (progress {row['progress']:.3f}): expected frame "
+                  f"{row['expected']}, canvas matches {row['matched']}")
+    if args.json:
+        write_json(args.json, result)
+    return 0 if result["monotonic"] and not result["mismatches"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
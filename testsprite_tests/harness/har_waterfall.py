@@ -0,0 +1,368 @@
+"""Record a HAR of the page load and check how the preloader schedules frames.
+
+``runWithConcurrency`` in ``useImagePreloader.ts`` should keep
+``CONCURRENCY`` (6) frame requests in flight, and it should fetch the
+``MIN_FRAMES_TO_START`` (15) priority frames before the rest. This tool loads
+the page in a fresh context with ``record_har_path``, optionally under one of
+``harness.network_bench``'s network profiles, then analyses the frame
+requests in the HAR:
+
+- concurrency: peak and time-weighted mean requests in flight, and the share
+  of the loading window spent with fewer than 6 in flight;
+- idle gaps: the time between each completion and the start of the request
+  that took over its slot (pool hand-off, FIFO), including the barrier
+  between the priority batch and the rest;
+- priority: whether frames 0–14 all started before any later frame, and
+  inversions (a later frame finishing before an earlier one);
+- bandwidth: bytes over the loading window against the profile's downlink,
+  or against the busiest second of the load itself when unthrottled.
+
+Frames are numbered by sorting the numbers in their file names, so renditions
+and atlas sheets work alike (for atlas sheets the priority batch is sheet 0).
+An ASCII waterfall is printed, and ``--html`` writes one as an HTML page. The
+priority order and the peak concurrency are checked; a failed check makes the
+exit status 1::
+
+    python -m harness.har_waterfall --network 4g --har tmp/load.har --html tmp/waterfall.html
+    python -m harness.har_waterfall --analyze tmp/load.har
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import html
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .frame_cache import FRAME_URL
+from .network_bench import PROFILES, throttle
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+from .stats import distribution
+
+# Mirror useImagePreloader.ts.
+CONCURRENCY = 6
+MIN_FRAMES_TO_START = 15
+DEFAULT_HAR = Path("tmp/preloader.har")
+BANDWIDTH_WINDOW_MS = 1000
+BIN_MS = 50
+_NUMBER = re.compile(r"(\d+)\.\w+$")
+
+
+@dataclass
+class FrameRequest:
+    index: int
+    url: str
+    start_ms: float
+    end_ms: float
+    blocked_ms: float
+    receive_ms: float
+    bytes: int
+    status: int
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+def _timing(timings: dict[str, Any], name: str) -> float:
+    value = timings.get(name, -1)
+    return value if value and value > 0 else 0.0
+
+
+def load_frames(har_path: str | Path) -> list[FrameRequest]:
+    """Frame requests in the HAR, first request per URL, times relative to the first."""
+    entries = json.loads(Path(har_path).read_text(encoding="utf-8"))["log"]["entries"]
+    seen: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        url = entry["request"]["url"]
+        if FRAME_URL.search(url) and _NUMBER.search(url.split("?")[0]) and url not in seen:
+            seen[url] = entry
+    if not seen:
+        return []
+    numbers = sorted({int(_NUMBER.search(u.split("?")[0]).group(1)) for u in seen})
+    rank = {n: i for i, n in enumerate(numbers)}
+    starts = {u: datetime.fromisoformat(e["startedDateTime"]).timestamp() * 1000 for u, e in seen.items()}
+    origin = min(starts.values())
+    frames = []
+    for url, entry in seen.items():
+        response, timings = entry["response"], entry.get("timings", {})
+        start = starts[url] - origin
+        frames.append(FrameRequest(
+            index=rank[int(_NUMBER.search(url.split("?")[0]).group(1))],
+            url=url,
+            start_ms=start,
+            end_ms=start + max(entry.get("time", 0), 0),
+            blocked_ms=_timing(timings, "blocked"),
+            receive_ms=_timing(timings, "receive"),
+            bytes=max(response.get("_transferSize", -1), response.get("bodySize", -1), 0),
+            status=response.get("status", 0),
+        ))
+    frames.sort(key=lambda f: (f.start_ms, f.index))
+    return frames
+
+
+def in_flight(frames: Sequence[FrameRequest]) -> list[tuple[float, int]]:
+    """Step function of requests in flight: ``(time, count from then on)``."""
+    events = sorted([(f.start_ms, 1) for f in frames] + [(f.end_ms, -1) for f in frames],
+                    key=lambda e: (e[0], e[1]))  # ends first when a slot is handed over
+    steps, count = [], 0
+    for t, delta in events:
+        count += delta
+        if steps and steps[-1][0] == t:
+            steps[-1] = (t, count)
+        else:
+            steps.append((t, count))
+    return steps
+
+
+def concurrency(frames: Sequence[FrameRequest], target: int = CONCURRENCY) -> dict[str, Any]:
+    steps = in_flight(frames)
+    if len(steps) < 2:
+        return {"peak": len(frames), "mean": None, "time_at_level_ms": {}, "below_target_pct": None}
+    levels: dict[int, float] = {}
+    weighted = 0.0
+    for (t, count), (t_next, _) in zip(steps, steps[1:]):
+        levels[count] = levels.get(count, 0.0) + t_next - t
+        weighted += count * (t_next - t)
+    window = steps[-1][0] - steps[0][0]
+    # Only while requests were still waiting to start can the pool be under-filled.
+    last_start = max(f.start_ms for f in frames)
+    below = sum(
+        min(t_next, last_start) - t
+        for (t, count), (t_next, _) in zip(steps, steps[1:])
+        if count < target and t < last_start
+    )
+    return {
+        "peak": max(count for _, count in steps),
+        "mean": weighted / window if window else None,
+        "time_at_level_ms": dict(sorted(levels.items())),
+        "below_target_pct": 100 * below / last_start if last_start else 0.0,
+    }
+
+
+def idle_gaps(frames: Sequence[FrameRequest], target: int = CONCURRENCY) -> list[dict[str, Any]]:
+    """Each queued start paired with the completion whose slot it took (FIFO pool)."""
+    ends = sorted(frames, key=lambda f: f.end_ms)
+    queued = sorted(frames, key=lambda f: f.start_ms)[target:]
+    return [
+        {"after": done.index, "next": nxt.index, "at_ms": done.end_ms, "gap_ms": max(0.0, nxt.start_ms - done.end_ms)}
+        for done, nxt in zip(ends, queued)
+    ]
+
+
+def priority(frames: Sequence[FrameRequest], count: int = MIN_FRAMES_TO_START) -> dict[str, Any]:
+    early = [f for f in frames if f.index < count]
+    late = [f for f in frames if f.index >= count]
+    by_index = sorted(frames, key=lambda f: f.index)
+    inversions, worst = 0, None
+    for i, a in enumerate(by_index):
+        for b in by_index[i + 1:]:
+            if b.end_ms < a.end_ms:
+                inversions += 1
+                if worst is None or b.index - a.index > worst[1] - worst[0]:
+                    worst = (a.index, b.index)
+    late_before_early = sum(1 for b in late for a in early if b.end_ms < a.end_ms)
+    pairs = len(frames) * (len(frames) - 1) // 2
+    return {
+        "priority_first": bool(early) and (not late or max(f.start_ms for f in early) <= min(f.start_ms for f in late)),
+        "priority_done_ms": max((f.end_ms for f in early), default=None),
+        "inversions": inversions,
+        "inversion_pct": 100 * inversions / pairs if pairs else 0.0,
+        "worst_inversion": worst,
+        "late_before_priority": late_before_early,
+    }
+
+
+def bandwidth(frames: Sequence[FrameRequest], available_mbps: float | None = None) -> dict[str, Any]:
+    """Achieved frame throughput; bytes are spread over each response's receive phase."""
+    if not frames:
+        return {"bytes": 0, "mean_mbps": None, "peak_mbps": None, "available_mbps": available_mbps, "utilization_pct": None}
+    origin = min(f.start_ms for f in frames)
+    window_ms = max(f.end_ms for f in frames) - origin
+    bins = [0.0] * (int(window_ms // BIN_MS) + 1)
+    for f in frames:
+        first = f.end_ms - max(f.receive_ms, BIN_MS)
+        lo, hi = int((first - origin) // BIN_MS), int((f.end_ms - origin) // BIN_MS)
+        lo = max(0, min(lo, hi))
+        for b in range(lo, hi + 1):
+            bins[b] += f.bytes / (hi - lo + 1)
+    per_window = BANDWIDTH_WINDOW_MS // BIN_MS
+    peak_bytes = max(sum(bins[i:i + per_window]) for i in range(max(1, len(bins) - per_window + 1)))
+    total = sum(f.bytes for f in frames)
+    mean_mbps = total * 8 / (window_ms / 1000) / 1e6 if window_ms else None
+    peak_mbps = peak_bytes * 8 / (min(window_ms, BANDWIDTH_WINDOW_MS) / 1000) / 1e6 if window_ms else None
+    ceiling = available_mbps or peak_mbps
+    return {
+        "bytes": total,
+        "window_ms": window_ms,
+        "mean_mbps": mean_mbps,
+        "peak_mbps": peak_mbps,
+        "available_mbps": ceiling,
+        "available_from": "profile" if available_mbps else "peak",
+        "utilization_pct": 100 * mean_mbps / ceiling if mean_mbps and ceiling else None,
+    }
+
+
+def analyze(frames: Sequence[FrameRequest], available_mbps: float | None = None,
+            target: int = CONCURRENCY, priority_count: int = MIN_FRAMES_TO_START) -> dict[str, Any]:
+    gaps = idle_gaps(frames, target)
+    result = {
+        "frames": len(frames),
+        "failed": sum(1 for f in frames if not 200 <= f.status < 400),
+        "concurrency": concurrency(frames, target),
+        "gaps_ms": distribution(g["gap_ms"] for g in gaps),
+        "largest_gaps": sorted(gaps, key=lambda g: -g["gap_ms"])[:5],
+        "blocked_ms": distribution(f.blocked_ms for f in frames),
+        "priority": priority(frames, priority_count),
+        "bandwidth": bandwidth(frames, available_mbps),
+    }
+    result["checks"] = {
+        f"peak in flight == {target}": result["concurrency"]["peak"] == target,
+        f"frames 0-{priority_count - 1} first": result["priority"]["priority_first"],
+    }
+    return result
+
+
+def ascii_waterfall(frames: Sequence[FrameRequest], width: int = 72) -> str:
+    """One row per request: ``.`` waiting, ``=`` receiving, ``!`` for an error status."""
+    if not frames:
+        return "(no frame requests)"
+    end = max(f.end_ms for f in frames) or 1.0
+    scale = width / end
+    lines = [f"{'frame':>5} {'ms':>7} |{'0 ms':<{width // 2}}{f'{end:.0f} ms':>{width - width // 2}}|"]
+    for f in frames:
+        a, b = int(f.start_ms * scale), max(int(f.start_ms * scale) + 1, int(f.end_ms * scale))
+        r = max(a, b - max(1, round(f.receive_ms * scale)))
+        bar = " " * a + "." * (r - a) + ("!" if f.status >= 400 else "=") * (b - r)
+        lines.append(f"{f.index:>5} {f.duration_ms:>7.0f} |{bar:<{width}}|")
+    return "\n".join(lines)
+
+
+def html_waterfall(frames: Sequence[FrameRequest], result: dict[str, Any]) -> str:
+    end = max((f.end_ms for f in frames), default=1.0) or 1.0
+    rows = []
+    for f in frames:
+        left, span = 100 * f.start_ms / end, max(0.1, 100 * f.duration_ms / end)
+        receive = 100 * min(f.receive_ms, f.duration_ms) / max(f.duration_ms, 1e-9)
+        color = "#c0392b" if f.status >= 400 else ("#2e86de" if f.index < MIN_FRAMES_TO_START else "#10ac84")
+        rows.append(
+            f'<tr><td>{f.index}</td><td>{f.duration_ms:.0f}</td><td class="lane">'
+            f'<div class="bar" style="left:{left:.3f}%;width:{span:.3f}%;'
+            f'background:linear-gradient(90deg,#dfe6e9 {100 - receive:.1f}%,{color} {100 - receive:.1f}%)" '
+            f'title="{html.escape(f.url)} ({f.bytes} B)"></div></td></tr>'
+        )
+    checks = "".join(f"<li>{html.escape(name)}: {'ok' if ok else 'FAILED'}</li>" for name, ok in result["checks"].items())
+    return f"""<!doctype html>
+<meta charset="utf-8">
+<title>Preloader waterfall</title>
+<style>
+body {{ font: 13px system-ui, sans-serif; margin: 1.5em; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td {{ padding: 1px 6px; white-space: nowrap; }}
+td.lane {{ position: relative; width: 100%; }}
+.bar {{ position: absolute; top: 2px; bottom: 2px; border-radius: 2px; }}
+pre {{ background: #f5f6fa; padding: 1em; }}
+</style>
+<h1>Preloader waterfall</h1>
+<ul>{checks}</ul>
+<p>Blue: priority frames. Green: the rest. The lighter part of each bar is the wait before the response body.</p>
+<table><tr><th>frame</th><th>ms</th><th>0 &ndash; {end:.0f} ms</th></tr>
+{''.join(rows)}
+</table>
+<pre>{html.escape(json.dumps({k: v for k, v in result.items() if k != "largest_gaps"}, indent=2))}</pre>
+"""
+
+
+async def record(url: str, har_path: Path, network: str | None, timeout_s: float, daemon_url: str | None) -> None:
+    har_path.parent.mkdir(parents=True, exist_ok=True)
+    async with async_api.async_playwright() as pw:
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        try:
+            context = await lease.browser.new_context(record_har_path=str(har_path), record_har_content="omit")
+            try:
+                page = await context.new_page()
+                if network:
+                    await throttle(context, page, PROFILES[network])
+                await page.goto(url, wait_until="commit")
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=timeout_s * 1000)
+                except async_api.Error:
+                    print(f"network still busy after {timeout_s:g}s; analysing what loaded", file=sys.stderr)
+            finally:
+                await context.close()  # writes the HAR
+        finally:
+            await lease.release(1)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.har_waterfall", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--har", type=Path, default=DEFAULT_HAR, help="where to record the HAR")
+    parser.add_argument("--analyze", type=Path, metavar="HAR", help="analyse an existing HAR instead of recording")
+    parser.add_argument("--network", choices=sorted(PROFILES), help="network_bench profile to load under")
+    parser.add_argument("--bandwidth-mbps", type=float, help="available downlink (default: the profile's, else the peak)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for the load to finish")
+    parser.add_argument("--width", type=int, default=72, help="ASCII waterfall width")
+    parser.add_argument("--html", type=Path, metavar="PATH", help="write an HTML waterfall")
+    parser.add_argument("--json", metavar="PATH")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+
+    har_path = args.analyze or args.har
+    if args.analyze is None:
+        asyncio.run(record(args.url, har_path, args.network, args.timeout, None if args.no_daemon else DEFAULT_URL))
+    frames = load_frames(har_path)
+    if not frames:
+        print(f"No hero frame requests in {har_path}.", file=sys.stderr)
+        return 2
+    available = args.bandwidth_mbps
+    if available is None and args.network and PROFILES[args.network].download_kbps:
+        available = PROFILES[args.network].download_kbps / 1000
+    # In atlas mode the first sheet is the priority batch.
+    priority_count = 1 if any("/atlas-" in f.url for f in frames) else MIN_FRAMES_TO_START
+    result = analyze(frames, available, priority_count=priority_count)
+
+    print(ascii_waterfall(frames, args.width))
+    print()
+    conc, prio, bw, gaps = result["concurrency"], result["priority"], result["bandwidth"], result["gaps_ms"]
+    print(format_table(("metric", "value"), [
+        ("frames (failed)", f"{result['frames']} ({result['failed']})"),
+        ("peak in flight", conc["peak"]),
+        ("mean in flight", conc["mean"]),
+        (f"time < {CONCURRENCY} in flight %", conc["below_target_pct"]),
+        ("hand-off gap p50 / p95 / max ms", f"{gaps['p50'] or 0:.1f} / {gaps['p95'] or 0:.1f} / {gaps['max'] or 0:.1f}"),
+        ("blocked in browser p95 ms", result["blocked_ms"]["p95"]),
+        ("priority frames done ms", prio["priority_done_ms"]),
+        ("inversions (% of pairs)", f"{prio['inversions']} ({prio['inversion_pct']:.1f}%)"),
+        ("late frames before a priority frame", prio["late_before_priority"]),
+        ("throughput mean / peak Mbps", f"{bw['mean_mbps'] or 0:.1f} / {bw['peak_mbps'] or 0:.1f}"),
+        (f"utilization of {bw['available_mbps'] or 0:.1f} Mbps ({bw['available_from']}) %", bw["utilization_pct"]),
+    ]))
+    for gap in result["largest_gaps"][:3]:
+        print(f"gap {gap['gap_ms']:.0f} ms at {gap['at_ms']:.0f} ms: frame {gap['after']} done, frame {gap['next']} next")
+    for name, ok in result["checks"].items():
+        print(f"{name}: {'ok' if ok else 'FAILED'}")
+
+    if args.html:
+        args.html.parent.mkdir(parents=True, exist_ok=True)
+        args.html.write_text(html_waterfall(frames, result), encoding="utf-8")
+        print(f"waterfall: {args.html}")
+    if args.json:
+        write_json(args.json, {"har": str(har_path), **result, "requests": [asdict(f) for f in frames]})
+    return 0 if all(result["checks"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
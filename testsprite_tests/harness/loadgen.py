@@ -0,0 +1,245 @@
+"""A small asyncio HTTP/1.1 load generator for the app's API routes.
+
+Each worker keeps one keep-alive connection open. With ``rate`` set, requests
+are scheduled open-loop at fixed intervals. Latency is measured from the
+scheduled start, so a slow server shows up as latency rather than as a lower
+offered load. ``check`` sees every response and returns an error label (or
+``None``); labels are counted next to transport errors and non-2xx statuses.
+Server CPU comes from ``/proc``, so it is Linux-only and needs the server's pid.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from .stats import distribution
+
+
+@dataclass
+class Request:
+    method: str = "GET"
+    path: str = "/"
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    latency_ms: float
+    request: Request
+
+
+Check = Callable[[Response], "str | None"]
+
+
+@dataclass
+class LoadResult:
+    latencies_ms: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    wall_s: float = 0.0
+    server_cpu: dict[str, float] | None = None
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values()) + self.errors["transport"]
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "rps": self.requests / self.wall_s if self.wall_s else None,
+            "latency_ms": distribution(self.latencies_ms),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "wall_s": self.wall_s,
+            "server_cpu": self.server_cpu,
+        }
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection; reconnects after any failure."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host, self.port = host, port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(self, req: Request) -> tuple[int, dict[str, str], bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        headers = {"Host": f"{self.host}:{self.port}", "Connection": "keep-alive", **req.headers}
+        if req.body or req.method not in ("GET", "HEAD"):
+            headers["Content-Length"] = str(len(req.body))
+        head = f"{req.method} {req.path} HTTP/1.1\r\n" + "".join(
+            f"{k}: {v}\r\n" for k, v in headers.items()
+        )
+        self._writer.write(head.encode("latin-1") + b"\r\n" + req.body)
+        await self._writer.drain()
+        try:
+            return await self._read_response(req.method)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _read_response(self, method: str) -> tuple[int, dict[str, str], bytes]:
+        assert self._reader is not None
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split(b" ", 2)[1])
+        headers: dict[str, str] = {}
+        while (line := await self._reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if method == "HEAD" or status in (204, 304):
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked()
+        elif "content-length" in headers:
+            body = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self._reader.read()
+            await self.close()
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, headers, body
+
+    async def _read_chunked(self) -> bytes:
+        assert self._reader is not None
+        chunks = []
+        while True:
+            size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                while await self._reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readexactly(2)
+
+    async def close(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class CpuSampler:
+    """CPU time used by a process (and its children) between start and stop."""
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._start: tuple[float, float] | None = None
+
+    def _cpu_s(self) -> float:
+        fields = Path(f"/proc/{self.pid}/stat").read_text().rsplit(")", 1)[1].split()
+        # utime, stime, cutime, cstime are fields 14-17; fields[0] is field 3.
+        return sum(int(v) for v in fields[11:15]) / self._ticks
+
+    def start(self) -> None:
+        self._start = (time.monotonic(), self._cpu_s())
+
+    def stop(self) -> dict[str, float]:
+        assert self._start is not None
+        wall, cpu = time.monotonic() - self._start[0], self._cpu_s() - self._start[1]
+        return {"pid": self.pid, "cpu_s": cpu, "cpu_pct": 100 * cpu / wall if wall else 0.0}
+
+
+def listener_pid(port: int) -> int | None:
+    """Find the pid listening on ``port`` by matching socket inodes in ``/proc``."""
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            lines = Path(table).read_text().splitlines()[1:]
+        except OSError:
+            continue
+        for line in lines:
+            parts = line.split()
+            if parts[3] == "0A" and int(parts[1].rsplit(":", 1)[1], 16) == port:  # LISTEN
+                inodes.add(parts[9])
+    if not inodes:
+        return None
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    for proc in Path("/proc").iterdir():
+        if not proc.name.isdigit():
+            continue
+        try:
+            for fd in (proc / "fd").iterdir():
+                if os.readlink(fd) in targets:
+                    return int(proc.name)
+        except OSError:
+            continue
+    return None
+
+
+async def run_load(
+    base_url: str,
+    make_request: Callable[[int], Request],
+    *,
+    concurrency: int = 16,
+    rate: float | None = None,
+    duration_s: float | None = 10.0,
+    total: int | None = None,
+    timeout_s: float = 10.0,
+    check: Check | None = None,
+    server_pid: int | None = None,
+) -> LoadResult:
+    """Send requests until ``duration_s`` elapses or ``total`` have been sent."""
+    url = urlsplit(base_url)
+    host, port = url.hostname or "localhost", url.port or 80
+    result = LoadResult()
+    sampler = CpuSampler(server_pid) if server_pid else None
+    counter = 0
+    start = time.monotonic()
+    deadline = start + duration_s if duration_s else None
+
+    def next_slot() -> tuple[int, float] | None:
+        nonlocal counter
+        index = counter
+        if (total is not None and index >= total) or (deadline and time.monotonic() >= deadline):
+            return None
+        counter += 1
+        return index, start + index / rate if rate else time.monotonic()
+
+    async def worker() -> None:
+        conn = Connection(host, port)
+        try:
+            while (slot := next_slot()) is not None:
+                index, scheduled = slot
+                delay = scheduled - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                req = make_request(index)
+                try:
+                    status, headers, body = await asyncio.wait_for(conn.request(req), timeout_s)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+                    result.errors["transport"] += 1
+                    await conn.close()
+                    continue
+                latency = (time.monotonic() - scheduled) * 1000
+                result.latencies_ms.append(latency)
+                result.statuses[status] += 1
+                label = check(Response(status, headers, body, latency, req)) if check else None
+                if label:
+                    result.errors[label] += 1
+        finally:
+            await conn.close()
+
+    if sampler:
+        sampler.start()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_s = time.monotonic() - start
+    if sampler:
+        result.server_cpu = sampler.stop()
+    return result
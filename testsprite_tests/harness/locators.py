@@ -0,0 +1,193 @@
+"""Resolve the scripts' absolute XPaths through a registry of logical targets.
+
+The generated steps address elements with absolute paths such as
+``xpath=html/body/dialog/form/div[2]/input``. Every call evaluates them again
+from the document root, and any reshuffle makes them stale: the dialog
+mounting, or the error banner pushing the hero's content down a slot.
+:data:`TARGETS` maps each known path to a logical name ("header CTA",
+"dialog phone input", "footer link") and a role or label locator.
+
+:class:`SelectorCache` is a middleware. It resolves a target to an element
+handle the first time a page state uses it, and later actions on that target
+reuse the handle. The cache is cleared when the page navigates. A handle
+whose element was detached (the dialog closed and reopened, say) is resolved
+again. If a target cannot be resolved, the original XPath runs unchanged.
+Paths outside the registry, such as the Razorpay checkout, always pass
+through. Hits, misses, stale handles and the estimated resolution time saved
+are reported per test; a resolution is timed once its element is attached, so
+the estimate leaves out waiting for the page::
+
+    python -m harness.runner --selector-cache TC006 TC009
+    python -m harness.locators            # registry coverage of the scripts' selectors
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Sequence
+
+from playwright import async_api
+
+from .proxies import Action, Next, remaining_timeout
+from .report import format_table
+from .scenarios import SCENARIO_GLOB, TESTS_DIR
+
+_FIRST = " >> nth=0"
+_LOCATOR_RE = re.compile(r"""\.locator\((['"])(xpath=[^'"]+)\1\)""")
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    resolve: Callable[[async_api.Page], async_api.Locator]
+
+
+def _hero(page: async_api.Page) -> async_api.Locator:
+    return page.locator("[data-hero-section]")
+
+
+def _dialog(page: async_api.Page) -> async_api.Locator:
+    return page.locator("dialog[open]")
+
+
+HEADER_CTA = Target("header CTA", lambda p: p.locator("header").get_by_role("button", name="Reserve my seat"))
+HEADER_LOGO = Target("header logo", lambda p: p.locator("header").get_by_role("link", name="Nirvana by Savart"))
+FOOTER_LINK = Target("footer link", lambda p: p.locator("footer").get_by_role("link", name="Nirvana by Savart – Home"))
+HERO_SCROLL_LINK = Target("hero scroll link", lambda p: _hero(p).get_by_role("link", name="Scroll to know more"))
+HERO_CTA = Target("hero CTA", lambda p: _hero(p).get_by_role("button", name="Reserve my seat"))
+DIALOG_CLOSE = Target("dialog close", lambda p: _dialog(p).get_by_role("button", name="Close"))
+DIALOG_NAME = Target("dialog name input", lambda p: _dialog(p).get_by_label("Name"))
+DIALOG_PHONE = Target("dialog phone input", lambda p: _dialog(p).get_by_label("Phone number"))
+DIALOG_EMAIL = Target("dialog email input", lambda p: _dialog(p).get_by_label("Email"))
+DIALOG_SUBMIT = Target("dialog submit", lambda p: _dialog(p).locator("form [type=submit]"))
+
+# The hero's content block is div[2], or div[3] while the error banner is shown.
+TARGETS: dict[str, Target] = {
+    "xpath=html/body/header/div/button": HEADER_CTA,
+    "xpath=html/body/header/div/div/a": HEADER_LOGO,
+    "xpath=html/body/footer/div/a": FOOTER_LINK,
+    "xpath=html/body/main/div/div/div[2]/div/div[1]/a": HERO_SCROLL_LINK,
+    "xpath=html/body/main/div/div/div[3]/div/div[1]/a": HERO_SCROLL_LINK,
+    "xpath=html/body/main/div/div/div[2]/div/div[2]/button": HERO_CTA,
+    "xpath=html/body/main/div/div/div[3]/div/div[2]/button": HERO_CTA,
+    "xpath=html/body/dialog/div/button": DIALOG_CLOSE,
+    "xpath=html/body/dialog/form/div[1]/input": DIALOG_NAME,
+    "xpath=html/body/dialog/form/div[2]/input": DIALOG_PHONE,
+    "xpath=html/body/dialog/form/div[3]/input": DIALOG_EMAIL,
+    "xpath=html/body/dialog/form/button": DIALOG_SUBMIT,
+}
+
+
+def lookup(selector: str | None, targets: dict[str, Target] = TARGETS) -> Target | None:
+    """The registered target for ``selector`` (first-match form only), if any."""
+    if not selector:
+        return None
+    if selector.endswith(_FIRST):
+        selector = selector[: -len(_FIRST)]
+    return targets.get(selector)
+
+
+class SelectorCache:
+    def __init__(self, targets: dict[str, Target] | None = None) -> None:
+        self.targets = TARGETS if targets is None else targets
+        self.hits = self.misses = self.stale = self.fallbacks = self.unmapped = 0
+        self.invalidations = 0
+        self.resolve_ms: list[float] = []
+        self._handles: dict[async_api.Page, dict[str, async_api.ElementHandle]] = {}
+
+    def _page_cache(self, page: async_api.Page) -> dict[str, async_api.ElementHandle]:
+        cache = self._handles.get(page)
+        if cache is None:
+            cache = self._handles[page] = {}
+
+            def on_navigated(frame: async_api.Frame) -> None:
+                if frame == page.main_frame and cache:
+                    cache.clear()
+                    self.invalidations += 1
+
+            page.on("framenavigated", on_navigated)
+        return cache
+
+    async def __call__(self, action: Action, call_next: Next) -> Any:
+        page = action.page
+        target = lookup(action.selector, self.targets) if page is not None else None
+        if target is None:
+            if action.selector is not None:
+                self.unmapped += 1
+            return await call_next(action)
+
+        cache = self._page_cache(page)
+        handle = cache.get(target.name)
+        if handle is not None:
+            try:
+                result = await call_next(replace(action, target=handle))
+                self.hits += 1
+                return result
+            except async_api.Error as exc:
+                if "not attached" not in str(exc):
+                    raise
+                self.stale += 1
+                cache.pop(target.name, None)
+
+        locator = target.resolve(page)
+        try:
+            await locator.wait_for(state="attached", timeout=action.kwargs.get("timeout"))
+            start = time.perf_counter()
+            handle = await locator.element_handle()
+        except async_api.Error:
+            self.fallbacks += 1
+            return await call_next(remaining_timeout(action))
+        self.resolve_ms.append((time.perf_counter() - start) * 1000)
+        self.misses += 1
+        cache[target.name] = handle
+        return await call_next(remaining_timeout(replace(action, target=handle)))
+
+    def summary(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        mean_resolve = sum(self.resolve_ms) / len(self.resolve_ms) if self.resolve_ms else 0.0
+        return {
+            "selector_hits": self.hits,
+            "selector_misses": self.misses,
+            "selector_stale": self.stale,
+            "selector_invalidations": self.invalidations,
+            "selector_fallbacks": self.fallbacks,
+            "selector_unmapped": self.unmapped,
+            "selector_hit_rate": self.hits / lookups if lookups else 0.0,
+            # Each hit skips one resolution of an attached element, priced at
+            # this test's mean.
+            "selector_saved_s": self.hits * mean_resolve / 1000,
+        }
+
+
+def coverage(tests_dir=TESTS_DIR) -> list[tuple[str, int, int, int]]:
+    """Per script: XPath locator calls, how many the registry covers, distinct targets."""
+    rows = []
+    for path in sorted(tests_dir.glob(SCENARIO_GLOB)):
+        selectors = [m.group(2) for m in _LOCATOR_RE.finditer(path.read_text(encoding="utf-8"))]
+        mapped = [TARGETS[s] for s in selectors if s in TARGETS]
+        rows.append((path.stem[:5], len(selectors), len(mapped), len({t.name for t in mapped})))
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.locators", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--targets", action="store_true", help="list the registry instead")
+    args = parser.parse_args(argv)
+    if args.targets:
+        print(format_table(("xpath", "target"), [(x, t.name) for x, t in TARGETS.items()]))
+        return 0
+    rows = coverage()
+    print(format_table(("test", "xpath calls", "registered", "targets"), rows))
+    total, mapped = sum(r[1] for r in rows), sum(r[2] for r in rows)
+    print(f"\n{mapped}/{total} XPath locator calls resolve through the registry")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""Memory growth of the landing page while the hero frames load and play.
+
+``useImagePreloader`` keeps every decoded hero frame in ``imagesRef`` for the
+life of the page, so memory grows with the rendition the route picks for the
+viewport and DPR. For each ``--viewport`` this profiler loads the page in a
+fresh context and samples memory every ``--interval`` ms through three phases:
+
+- ``preload``: from navigation until the network goes idle, which is when
+  the preloader has fetched every frame.
+- ``scroll``: a wheel sweep down through the hero and back to the top.
+- ``steady``: after a forced GC, the page sits idle for ``--steady`` seconds.
+
+Each sample records ``Performance.getMetrics`` (JS heap used and total, DOM
+nodes, event listeners), ``Memory.getDOMCounters``, the frames loaded so far
+and, if the browser runs on this machine, the resident memory of its renderer
+and GPU processes. The JS heap does not hold the decoded bitmaps. So the report
+also estimates their size as loaded frames × width × height × 4 bytes, from
+the first frame's natural size.
+
+The table shows peak and steady-state (median of the steady samples) values
+per viewport. Each ``--budget`` is checked against every viewport, and any
+value over budget makes the exit status 1::
+
+    python -m harness.memory_profile --viewport 390x844@3 --viewport 1920x1080@2
+    python -m harness.memory_profile --budget steady_heap_mb=40 --budget decoded_mb=600 --json tmp/memory.json
+
+Viewports narrower than 768 px are emulated as mobile, with touch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .probes import HERO_READY_SELECTOR, install_timeline, read_timeline
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+from .scroll_bench import hero_scroll_end, wheel_until
+
+MB = 1024 * 1024
+MOBILE_MAX_WIDTH = 768
+DEFAULT_VIEWPORTS = ("1280x800@1", "1920x1080@2", "390x844@3", "412x915@2.625")
+BUDGET_METRICS = (
+    "peak_heap_mb", "steady_heap_mb", "peak_rss_mb", "steady_rss_mb", "decoded_mb", "peak_nodes", "peak_listeners",
+)
+SWEEP_STEP_PX = 120
+SWEEP_INTERVAL_MS = 16
+
+# Natural size of the first hero frame (or atlas sheet) the page loaded.
+FRAME_SIZE_JS = """
+async () => {
+  const url = performance.getEntriesByType("resource")
+    .map((e) => e.name).find((name) => name.includes("/video-sequence-1/"));
+  if (!url) return null;
+  const img = new Image();
+  await new Promise((resolve) => { img.onload = img.onerror = resolve; img.src = url; });
+  return { width: img.naturalWidth, height: img.naturalHeight };
+}
+"""
+
+
+def parse_viewport(value: str) -> dict[str, Any]:
+    """``WxH@DPR`` (DPR defaults to 1) as context options."""
+    size, _, dpr = value.partition("@")
+    width, _, height = size.partition("x")
+    options: dict[str, Any] = {
+        "viewport": {"width": int(width), "height": int(height)},
+        "device_scale_factor": float(dpr or 1),
+    }
+    if options["viewport"]["width"] < MOBILE_MAX_WIDTH:
+        options.update(is_mobile=True, has_touch=True)
+    return options
+
+
+def _rss_mb(pids: Sequence[int]) -> float | None:
+    """Summed VmRSS of ``pids`` from /proc, or None when none is readable here."""
+    total, found = 0, False
+    for pid in pids:
+        try:
+            status = Path(f"/proc/{pid}/status").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                total += int(line.split()[1]) * 1024
+                found = True
+    return total / MB if found else None
+
+
+class Sampler:
+    """Polls one page's memory counters until stopped, labelling samples by phase."""
+
+    def __init__(self, page: async_api.Page, cdp: async_api.CDPSession,
+                 browser_cdp: async_api.CDPSession | None, interval_ms: float) -> None:
+        self.page, self.cdp, self.browser_cdp = page, cdp, browser_cdp
+        self.interval_s = interval_ms / 1000
+        self.phase = "preload"
+        self.samples: list[dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    async def _process_pids(self) -> list[int]:
+        if self.browser_cdp is None:
+            return []
+        try:
+            info = await self.browser_cdp.send("SystemInfo.getProcessInfo")
+        except async_api.Error:
+            self.browser_cdp = None
+            return []
+        return [p["id"] for p in info["processInfo"] if p["type"] in ("renderer", "GPU")]
+
+    async def sample(self) -> dict[str, Any]:
+        metrics = {m["name"]: m["value"] for m in (await self.cdp.send("Performance.getMetrics"))["metrics"]}
+        counters = await self.cdp.send("Memory.getDOMCounters")
+        frames = await self.page.evaluate("() => window.__harnessTimeline?.frames ?? 0")
+        record = {
+            "t_ms": (time.perf_counter() - self._started) * 1000,
+            "phase": self.phase,
+            "heap_mb": metrics.get("JSHeapUsedSize", 0) / MB,
+            "heap_total_mb": metrics.get("JSHeapTotalSize", 0) / MB,
+            "nodes": counters["nodes"],
+            "listeners": counters["jsEventListeners"],
+            "documents": counters["documents"],
+            "frames": frames,
+            "rss_mb": _rss_mb(await self._process_pids()),
+        }
+        self.samples.append(record)
+        return record
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except async_api.Error:
+                return  # page or session closed
+            await asyncio.sleep(self.interval_s)
+
+
+async def profile_viewport(
+    browser: async_api.Browser, url: str, options: dict[str, Any], *,
+    interval_ms: float = 250, steady_s: float = 5.0, timeout_s: float = 60.0,
+) -> dict[str, Any]:
+    context = await browser.new_context(**options)
+    task = None
+    try:
+        await install_timeline(context)
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        try:
+            browser_cdp = await browser.new_browser_cdp_session()
+        except async_api.Error:
+            browser_cdp = None
+        sampler = Sampler(page, cdp, browser_cdp, interval_ms)
+
+        await page.goto(url, wait_until="commit")
+        task = asyncio.create_task(sampler.run())
+        await page.wait_for_selector(HERO_READY_SELECTOR, state="attached", timeout=timeout_s * 1000)
+        try:
+            await page.wait_for_load_state("networkidle", timeout=timeout_s * 1000)
+        except async_api.Error:
+            pass  # still loading frames: sweep anyway
+        frame_size = await page.evaluate(FRAME_SIZE_JS)
+
+        sampler.phase = "scroll"
+        viewport = options["viewport"]
+        await page.mouse.move(viewport["width"] / 2, viewport["height"] / 2)
+        await wheel_until(page, await hero_scroll_end(page), SWEEP_STEP_PX, SWEEP_INTERVAL_MS)
+        await wheel_until(page, 0, -SWEEP_STEP_PX, SWEEP_INTERVAL_MS)
+
+        await cdp.send("HeapProfiler.collectGarbage")
+        sampler.phase = "steady"
+        await page.wait_for_timeout(steady_s * 1000)
+        timeline = await read_timeline(page)
+    finally:
+        if task is not None:
+            task.cancel()
+        await context.close()
+    return {
+        "samples": sampler.samples,
+        "frame_size": frame_size,
+        "frames": timeline["frames"],
+        "frame_count": timeline["frameCount"],
+    }
+
+
+def summarize(result: dict[str, Any]) -> dict[str, Any]:
+    samples = result["samples"]
+    steady = [s for s in samples if s["phase"] == "steady"] or samples[-1:]
+
+    def peak(key: str) -> float | None:
+        values = [s[key] for s in samples if s[key] is not None]
+        return max(values) if values else None
+
+    def settled(key: str) -> float | None:
+        values = [s[key] for s in steady if s[key] is not None]
+        return statistics.median(values) if values else None
+
+    size = result["frame_size"]
+    decoded = result["frames"] * size["width"] * size["height"] * 4 / MB if size else None
+    return {
+        "samples": len(samples),
+        "frames": result["frames"],
+        "frame_size": f"{size['width']}x{size['height']}" if size else None,
+        "decoded_mb": decoded,
+        "peak_heap_mb": peak("heap_mb"),
+        "steady_heap_mb": settled("heap_mb"),
+        "peak_nodes": peak("nodes"),
+        "steady_nodes": settled("nodes"),
+        "peak_listeners": peak("listeners"),
+        "peak_rss_mb": peak("rss_mb"),
+        "steady_rss_mb": settled("rss_mb"),
+        "peak_phase": {
+            key: max(samples, key=lambda s: s[key])["phase"] if samples else None
+            for key in ("heap_mb", "nodes")
+        },
+    }
+
+
+def parse_budgets(values: Sequence[str]) -> dict[str, float]:
+    budgets = {}
+    for value in values:
+        metric, _, limit = value.partition("=")
+        if metric not in BUDGET_METRICS or not limit:
+            raise ValueError(f"expected one of {', '.join(BUDGET_METRICS)} as METRIC=VALUE, got {value!r}")
+        budgets[metric] = float(limit)
+    return budgets
+
+
+def over_budget(summary: dict[str, Any], budgets: dict[str, float]) -> list[str]:
+    return [m for m, limit in budgets.items() if summary[m] is not None and summary[m] > limit]
+
+
+async def run(
+    url: str, viewports: Sequence[str], interval_ms: float, steady_s: float, daemon_url: str | None,
+) -> dict[str, dict[str, Any]]:
+    results = {}
+    async with async_api.async_playwright() as pw:
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        try:
+            for name in viewports:  # one at a time, so the process RSS belongs to this page
+                results[name] = await profile_viewport(
+                    lease.browser, url, parse_viewport(name), interval_ms=interval_ms, steady_s=steady_s
+                )
+                print(f"{name}: {len(results[name]['samples'])} samples, "
+                      f"{results[name]['frames']}/{results[name]['frame_count']} frames", flush=True)
+        finally:
+            await lease.release(len(viewports))
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.memory_profile", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--viewport", action="append", dest="viewports", metavar="WxH@DPR",
+                        help=f"repeatable (default: {' '.join(DEFAULT_VIEWPORTS)})")
+    parser.add_argument("--interval", type=float, default=250, help="sampling interval (ms)")
+    parser.add_argument("--steady", type=float, default=5.0, help="idle seconds sampled after the sweep")
+    parser.add_argument("--budget", action="append", default=[], metavar="METRIC=VALUE",
+                        help=", ".join(BUDGET_METRICS))
+    parser.add_argument("--json", metavar="PATH", help="write summaries and samples as JSON")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+    try:
+        budgets = parse_budgets(args.budget)
+        viewports = args.viewports or list(DEFAULT_VIEWPORTS)
+        for name in viewports:
+            parse_viewport(name)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    results = asyncio.run(run(
+        args.url, viewports, args.interval, args.steady, None if args.no_daemon else DEFAULT_URL
+    ))
+    summaries = {name: summarize(result) for name, result in results.items()}
+    violations = {name: over_budget(s, budgets) for name, s in summaries.items()}
+    print()
+    print(format_table(
+        ("viewport", "frames", "frame px", "decoded MB", "heap peak", "heap steady",
+         "nodes peak", "listeners", "RSS peak", "RSS steady", "over budget"),
+        [
+            (name, s["frames"], s["frame_size"], s["decoded_mb"], s["peak_heap_mb"], s["steady_heap_mb"],
+             s["peak_nodes"], s["peak_listeners"], s["peak_rss_mb"], s["steady_rss_mb"],
+             ", ".join(violations[name]) or "-")
+            for name, s in summaries.items()
+        ],
+    ))
+    if budgets:
+        print("budgets: " + ", ".join(f"{m} {v:g}" for m, v in budgets.items()))
+    if all(s["peak_rss_mb"] is None for s in summaries.values()):
+        print("RSS unavailable: the browser is not running on this machine")
+    if args.json:
+        write_json(args.json, {
+            "url": args.url,
+            "budgets": budgets,
+            "viewports": {
+                name: {"summary": summaries[name], "over_budget": violations[name], **results[name]}
+                for name in results
+            },
+        })
+    return 1 if any(violations.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Image-preloader throughput under emulated network conditions.
+
+Each run opens a cold context (HTTP cache disabled), applies a profile with
+CDP ``Network.emulateNetworkConditions`` and loads the landing page with the
+timeline probe installed. It records time to the first frame, to ``isReady``
+(set once frame 0 has loaded) and to the last of the sequence's files, plus
+the effective frame bandwidth. The files are whatever ``/api/sequence`` gave
+the page: one image per frame, or the atlas sheets when the hero uses the
+atlas layout. Slow profiles can run into ``--timeout``. When that happens,
+"all frames" is left blank and the number of files loaded is reported
+instead::
+
+    python -m harness.network_bench --profiles 3g,4g,cable,localhost --runs 3 --json tmp/network_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .probes import install_timeline, read_timeline
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+from .stats import distribution
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    name: str
+    latency_ms: float
+    download_kbps: float  # 0 = unthrottled
+    upload_kbps: float
+
+    def conditions(self) -> dict[str, Any]:
+        return {
+            "offline": False,
+            "latency": self.latency_ms,
+            "downloadThroughput": _bytes_per_s(self.download_kbps),
+            "uploadThroughput": _bytes_per_s(self.upload_kbps),
+        }
+
+
+def _bytes_per_s(kbps: float) -> float:
+    return kbps * 1000 / 8 if kbps else -1  # -1 disables throttling
+
+
+# DevTools "Fast 3G"/"Fast 4G" presets and WebPageTest's "Cable".
+PROFILES = {
+    p.name: p
+    for p in (
+        NetworkProfile("3g", 562.5, 1475, 675),
+        NetworkProfile("4g", 165, 8294, 1382),
+        NetworkProfile("cable", 28, 5000, 1000),
+        NetworkProfile("localhost", 0, 0, 0),
+    )
+}
+
+# How many of the given sequence URLs the page has finished loading.
+FILES_LOADED_JS = """(urls) => {
+  const seen = window.__harnessTimeline?.frameUrls;
+  return seen ? urls.filter((u) => seen.has(new URL(u, location.href).href)).length : 0;
+}"""
+ALL_FILES_JS = """(urls) => (%s)(urls) === urls.length""" % FILES_LOADED_JS
+
+
+def sequence_files(body: dict[str, Any]) -> list[str]:
+    """The image URLs ``useImagePreloader`` fetches for this ``/api/sequence`` response."""
+    urls = body.get("urls") or []
+    atlas = body.get("atlas")
+    if atlas and len(atlas["tiles"]) == len(urls):
+        return [sheet["url"] for sheet in atlas["sheets"]]
+    return urls
+
+
+async def throttle(context: async_api.BrowserContext, page: async_api.Page, profile: NetworkProfile) -> None:
+    """Disable the HTTP cache and apply ``profile`` to ``page``."""
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+    await cdp.send("Network.emulateNetworkConditions", profile.conditions())
+
+
+async def measure_once(
+    browser: async_api.Browser, url: str, profile: NetworkProfile, timeout_s: float
+) -> dict[str, Any]:
+    context = await browser.new_context()
+    try:
+        await install_timeline(context)
+        page = await context.new_page()
+        await throttle(context, page, profile)
+        deadline = time.monotonic() + timeout_s
+        files: list[str] = []
+        try:
+            async with page.expect_response(
+                lambda r: "/api/sequence" in r.url, timeout=timeout_s * 1000
+            ) as sequence:
+                await page.goto(url, wait_until="commit")
+            files = sequence_files(await (await sequence.value).json())
+            await page.wait_for_function(
+                ALL_FILES_JS, arg=files, timeout=max(1.0, (deadline - time.monotonic()) * 1000)
+            )
+            complete = bool(files)
+        except async_api.Error:
+            complete = False
+        snapshot = await read_timeline(page)
+        files_loaded = await page.evaluate(FILES_LOADED_JS, files)
+    finally:
+        await context.close()
+
+    marks = snapshot["marks"]
+    start, end = marks.get("first_frame_request"), marks.get("last_frame")
+    elapsed_s = (end - start) / 1000 if start is not None and end and end > start else None
+    return {
+        "profile": profile.name,
+        "ttff_ms": marks.get("first_frame"),
+        "ready_ms": marks.get("is_ready"),
+        "all_frames_ms": end if complete else None,
+        "files_loaded": files_loaded,
+        "files": len(files),
+        "frame_bytes": snapshot["frameBytes"],
+        "bandwidth_mbps": snapshot["frameBytes"] * 8 / elapsed_s / 1e6 if elapsed_s else None,
+    }
+
+
+async def run(
+    url: str, profiles: Sequence[NetworkProfile], runs: int, timeout_s: float, daemon_url: str | None
+) -> list[dict[str, Any]]:
+    records = []
+    async with async_api.async_playwright() as pw:
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        try:
+            for profile in profiles:
+                for index in range(runs):
+                    record = await measure_once(lease.browser, url, profile, timeout_s)
+                    record["run"] = index
+                    records.append(record)
+                    print(
+                        f"{profile.name} run {index}: ready {record['ready_ms']}, "
+                        f"{record['files_loaded']}/{record['files']} files",
+                        flush=True,
+                    )
+        finally:
+            await lease.release(len(profiles) * runs)
+    return records
+
+
+def compare(records: Sequence[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    by_profile: dict[str, list[dict[str, Any]]] = {}
+    for record in records:
+        by_profile.setdefault(record["profile"], []).append(record)
+    return {
+        name: {
+            "runs": len(rows),
+            "complete_runs": sum(r["all_frames_ms"] is not None for r in rows),
+            "files_loaded": min(r["files_loaded"] for r in rows),
+            **{
+                key: distribution(r[key] for r in rows)
+                for key in ("ttff_ms", "ready_ms", "all_frames_ms", "bandwidth_mbps")
+            },
+        }
+        for name, rows in by_profile.items()
+    }
+
+
+def parse_profiles(value: str) -> list[NetworkProfile]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown profile(s) {unknown}; choose from {list(PROFILES)}")
+    return [PROFILES[name] for name in names]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.network_bench", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--profiles", type=parse_profiles, default=list(PROFILES.values()),
+                        help=f"comma-separated, from {', '.join(PROFILES)}")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=180.0, help="seconds per run")
+    parser.add_argument("--json", metavar="PATH", help="write runs and comparison as JSON")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+
+    records = asyncio.run(run(
+        args.url, args.profiles, args.runs, args.timeout, None if args.no_daemon else DEFAULT_URL
+    ))
+    summary = compare(records)
+    rows = [
+        (
+            name,
+            f"{s['complete_runs']}/{s['runs']}",
+            s["ttff_ms"]["p50"],
+            s["ready_ms"]["p50"],
+            s["all_frames_ms"]["p50"],
+            s["files_loaded"],
+            s["bandwidth_mbps"]["p50"],
+        )
+        for name, s in summary.items()
+    ]
+    print(format_table(
+        ("profile", "complete", "ttff ms", "ready ms", "all frames ms", "min files", "Mbit/s"), rows
+    ))
+    if args.json:
+        write_json(args.json, {
+            "url": args.url,
+            "profiles": {p.name: p for p in args.profiles},
+            "runs": records,
+            "comparison": summary,
+        })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""In-page probes injected with ``context.add_init_script``.
+
+Init scripts run in every new document before the app's own scripts, so the
+observers below see the whole page load. Each probe keeps its data on a
+``window.__harness*`` object that the Python side reads back with
+``page.evaluate``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from playwright import async_api
+
+# The preloader overlay the PRD describes, if the app renders one. The current
+# app has none, so the preloader marks stay empty.
+PRELOADER_SELECTOR = "[data-preloader]"
+HERO_READY_SELECTOR = "[data-hero-section][data-frame-count]"
+
+# Timestamps (ms since navigation start) of the landing page's load milestones.
+# ``first`` keeps the earliest value seen for a mark.
+TIMELINE_JS = """
+(() => {
+  if (window.__harnessTimeline) return;
+  const PRELOADER = %(preloader)s;
+  const HERO_READY = %(hero_ready)s;
+  const marks = {};
+  const first = (name, t) => {
+    if (!(name in marks) || t < marks[name]) marks[name] = t;
+  };
+  const state = { marks, frames: 0, frameBytes: 0, frameUrls: new Set(), preloaderSeen: false };
+  window.__harnessTimeline = state;
+
+  try {
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) {
+        if (e.name.includes("/api/sequence")) first("api_sequence", e.responseEnd);
+        else if (e.name.includes("/video-sequence-1/")) {
+          state.frames++;
+          state.frameUrls.add(e.name);
+          state.frameBytes += e.encodedBodySize;
+          first("first_frame_request", e.startTime);
+          first("first_frame", e.responseEnd);
+          marks.last_frame = Math.max(marks.last_frame ?? 0, e.responseEnd);
+        }
+      }
+    }).observe({ type: "resource", buffered: true });
+  } catch {}
+
+  let polling = false;
+  const check = () => {
+    const now = performance.now();
+    if (!("is_ready" in marks) && document.querySelector(HERO_READY)) first("is_ready", now);
+    const pre = document.querySelector(PRELOADER);
+    if (pre) {
+      state.preloaderSeen = true;
+      first("preloader_shown", now);
+      const style = getComputedStyle(pre);
+      const opacity = parseFloat(style.opacity);
+      if (opacity < 1) first("fade_start", now);
+      if (opacity === 0 || style.visibility === "hidden" || style.display === "none") {
+        first("fade_start", now);
+        first("fade_end", now);
+      } else if (!polling) {
+        polling = true;
+        requestAnimationFrame(() => { polling = false; check(); });
+      }
+    } else if (state.preloaderSeen) {
+      first("fade_start", now);
+      first("fade_end", now);
+    }
+  };
+  new MutationObserver(check).observe(document, {
+    subtree: true, childList: true, attributes: true,
+  });
+  const onPreloader = (name) => (e) => {
+    if (e.target instanceof Element && e.target.matches(PRELOADER)) first(name, e.timeStamp);
+  };
+  document.addEventListener("transitionstart", onPreloader("fade_start"), true);
+  document.addEventListener("animationstart", onPreloader("fade_start"), true);
+  document.addEventListener("transitionend", onPreloader("fade_end"), true);
+  document.addEventListener("animationend", onPreloader("fade_end"), true);
+  document.addEventListener("click", (e) => {
+    if (!e.isTrusted) return;
+    if (e.target instanceof Element && e.target.closest(PRELOADER)) return;
+    first("first_interaction", e.timeStamp);
+  }, true);
+
+  state.snapshot = () => {
+    check();
+    const nav = performance.getEntriesByType("navigation")[0];
+    return {
+      marks: { ...marks },
+      frames: state.frames,
+      frameBytes: state.frameBytes,
+      frameCount: Number(document.querySelector(HERO_READY)?.dataset.frameCount ?? 0),
+      preloaderSeen: state.preloaderSeen,
+      navigation: nav ? {
+        response_start: nav.responseStart,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+      } : null,
+    };
+  };
+})();
+""" % {"preloader": json.dumps(PRELOADER_SELECTOR), "hero_ready": json.dumps(HERO_READY_SELECTOR)}
+
+TIMELINE_MARKS = (
+    "api_sequence",
+    "first_frame",
+    "is_ready",
+    "preloader_shown",
+    "fade_start",
+    "fade_end",
+    "first_interaction",
+    "last_frame",
+)
+
+
+async def install_timeline(context: async_api.BrowserContext, _scenario: Any = None) -> None:
+    """Context hook: record load milestones in every page of ``context``."""
+    await context.add_init_script(script=TIMELINE_JS)
+
+
+async def read_timeline(page: async_api.Page) -> dict[str, Any]:
+    return await page.evaluate("() => window.__harnessTimeline.snapshot()")
+
+
+async def wait_for_mark(page: async_api.Page, name: str, timeout_ms: float) -> bool:
+    try:
+        await page.wait_for_function(
+            "(name) => name in (window.__harnessTimeline?.marks ?? {})",
+            arg=name,
+            timeout=timeout_ms,
+        )
+    except async_api.Error:
+        return False
+    return True
+
+
+# Opts the page into ``recordHeroFrame`` (lib/perfProbe.ts) and records every
+# rAF callback time, so frame intervals are measured even when the hero is idle.
+SCROLL_PROBE_JS = """
+(() => {
+  if (window.__harnessRaf) return;
+  window.__heroProbe = [];
+  window.__harnessRaf = [];
+  const tick = (t) => {
+    window.__harnessRaf.push(t);
+    requestAnimationFrame(tick);
+  };
+  requestAnimationFrame(tick);
+})();
+"""
+
+
+async def install_scroll_probe(context: async_api.BrowserContext, _scenario: Any = None) -> None:
+    """Context hook: record hero frame samples and rAF timestamps."""
+    await context.add_init_script(script=SCROLL_PROBE_JS)
+
+
+async def reset_scroll_probe(page: async_api.Page) -> None:
+    await page.evaluate("() => { window.__heroProbe.length = 0; window.__harnessRaf.length = 0; }")
+
+
+async def read_scroll_probe(page: async_api.Page) -> dict[str, list]:
+    return await page.evaluate("() => ({ hero: window.__heroProbe, raf: window.__harnessRaf })")
+
+
+# Opts the page into ``probeRaf`` (lib/perfProbe.ts): the duration of every
+# HeroScroll and Lenis rAF callback.
+RAF_COST_PROBE_JS = """
+(() => {
+  if (!window.__rafProbe) window.__rafProbe = [];
+})();
+"""
+
+
+async def install_raf_cost_probe(context: async_api.BrowserContext, _scenario: Any = None) -> None:
+    """Context hook: time the app's render-loop callbacks."""
+    await context.add_init_script(script=RAF_COST_PROBE_JS)
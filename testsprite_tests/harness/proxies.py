@@ -0,0 +1,186 @@
+"""Thin proxies that route the scenarios' page actions through middlewares.
+
+The TC scripts only touch a small slice of Playwright: ``context.new_page()``,
+``context.pages``, ``page.goto``, ``page.wait_for_timeout``,
+``frame.locator(...).nth(0)``, ``click``/``fill`` and ``asyncio.sleep``. When
+the harness is given middlewares, those calls become :class:`Action` objects
+passed down an :class:`ActionPipeline`; each middleware may observe, rewrite
+or replace the action before the real Playwright call runs. Everything else
+is forwarded to the wrapped object untouched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Sequence
+
+from playwright import async_api
+
+PAGE_ACTIONS = frozenset({"goto", "reload", "go_back", "go_forward", "wait_for_timeout"})
+LOCATOR_ACTIONS = frozenset(
+    {"click", "dblclick", "fill", "type", "press", "check", "uncheck", "hover",
+     "select_option", "set_input_files", "scroll_into_view_if_needed"}
+)
+
+
+@dataclass
+class Action:
+    """One intercepted call: ``await getattr(target, kind)(*args, **kwargs)``."""
+
+    kind: str
+    target: Any
+    page: async_api.Page | None
+    selector: str | None = None
+    args: tuple = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    # When the script made the call, before any middleware ran.
+    issued: float = field(default_factory=time.perf_counter)
+
+
+Next = Callable[[Action], Awaitable[Any]]
+Middleware = Callable[[Action, Next], Awaitable[Any]]
+
+
+class ActionPipeline:
+    def __init__(self, middlewares: Sequence[Middleware]) -> None:
+        self.middlewares = list(middlewares)
+        self.last_page: async_api.Page | None = None
+
+    async def perform(self, action: Action) -> Any:
+        if action.page is not None:
+            self.last_page = action.page
+        return await self._call(0, action)
+
+    async def _call(self, index: int, action: Action) -> Any:
+        if index == len(self.middlewares):
+            method = getattr(action.target, action.kind)
+            return await method(*action.args, **action.kwargs)
+        return await self.middlewares[index](
+            action, lambda a: self._call(index + 1, a)
+        )
+
+
+def remaining_timeout(action: Action) -> Action:
+    """``action`` with its ``timeout`` cut to what is left since the script issued it."""
+    timeout = action.kwargs.get("timeout")
+    if not timeout:  # None is Playwright's default, 0 no limit
+        return action
+    left = timeout - (time.perf_counter() - action.issued) * 1000
+    return replace(action, kwargs={**action.kwargs, "timeout": max(left, 1.0)})
+
+
+def unwrap(obj: Any) -> Any:
+    """Return the real Playwright object behind a proxy (or ``obj`` itself)."""
+    return getattr(obj, "_wrapped", obj)
+
+
+class ContextProxy:
+    def __init__(self, context: async_api.BrowserContext, pipeline: ActionPipeline) -> None:
+        self._wrapped = context
+        self._pipeline = pipeline
+        self._pages: dict[async_api.Page, PageProxy] = {}
+
+    def _proxy(self, page: async_api.Page) -> "PageProxy":
+        proxy = self._pages.get(page)
+        if proxy is None:
+            proxy = self._pages[page] = PageProxy(page, self._pipeline)
+        return proxy
+
+    async def new_page(self) -> "PageProxy":
+        return self._proxy(await self._wrapped.new_page())
+
+    @property
+    def pages(self) -> list["PageProxy"]:
+        return [self._proxy(page) for page in self._wrapped.pages]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+
+
+class PageProxy:
+    def __init__(self, page: async_api.Page, pipeline: ActionPipeline) -> None:
+        self._wrapped = page
+        self._pipeline = pipeline
+
+    def locator(self, selector: str, **options: Any) -> "LocatorProxy":
+        return LocatorProxy(
+            self._wrapped.locator(selector, **options), self._wrapped, selector, self._pipeline
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._wrapped, name)
+        if name not in PAGE_ACTIONS:
+            return attr
+
+        async def perform(*args: Any, **kwargs: Any) -> Any:
+            return await self._pipeline.perform(
+                Action(name, self._wrapped, self._wrapped, None, args, kwargs)
+            )
+
+        return perform
+
+
+class LocatorProxy:
+    def __init__(
+        self,
+        locator: async_api.Locator,
+        page: async_api.Page,
+        selector: str,
+        pipeline: ActionPipeline,
+    ) -> None:
+        self._wrapped = locator
+        self._page = page
+        self.selector = selector
+        self._pipeline = pipeline
+
+    def _derive(self, locator: async_api.Locator, suffix: str) -> "LocatorProxy":
+        return LocatorProxy(locator, self._page, self.selector + suffix, self._pipeline)
+
+    def nth(self, index: int) -> "LocatorProxy":
+        return self._derive(self._wrapped.nth(index), f" >> nth={index}")
+
+    @property
+    def first(self) -> "LocatorProxy":
+        return self._derive(self._wrapped.first, " >> nth=0")
+
+    @property
+    def last(self) -> "LocatorProxy":
+        return self._derive(self._wrapped.last, " >> nth=-1")
+
+    def locator(self, selector: str, **options: Any) -> "LocatorProxy":
+        return self._derive(self._wrapped.locator(selector, **options), f" >> {selector}")
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._wrapped, name)
+        if name not in LOCATOR_ACTIONS:
+            return attr
+
+        async def perform(*args: Any, **kwargs: Any) -> Any:
+            return await self._pipeline.perform(
+                Action(name, self._wrapped, self._page, self.selector, args, kwargs)
+            )
+
+        return perform
+
+
+class AsyncioProxy:
+    """``asyncio`` for the scenario namespace, with ``sleep`` routed as an action."""
+
+    def __init__(self, pipeline: ActionPipeline) -> None:
+        self._pipeline = pipeline
+
+    async def sleep(self, delay: float, result: Any = None) -> Any:
+        await self._pipeline.perform(
+            Action("sleep", asyncio, self._pipeline.last_page, None, (delay,))
+        )
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(asyncio, name)
+
+
+def expect(actual: Any, *args: Any, **kwargs: Any) -> Any:
+    """``async_api.expect`` that accepts proxies."""
+    return async_api.expect(unwrap(actual), *args, **kwargs)
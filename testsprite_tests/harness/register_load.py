@@ -0,0 +1,235 @@
+"""Load test for ``POST /api/register`` against the Sheets emulator.
+
+Posts a mix of valid and invalid ``{name, phone, email}`` payloads at a fixed
+concurrency (or rate). It reports throughput, latency percentiles and error
+rates per payload kind. It also uses the route's ``Server-Timing`` header to
+split the time into ``validation``, ``auth`` and ``append``. The route runs
+the same GoogleAuth and Sheets client code either way; only the token and API
+URLs point at the emulator. So ``auth`` is building the client, and the token
+fetch happens lazily inside ``append``, as it does against real Google.
+
+Start the dev server with ``GOOGLE_SHEETS_EMULATOR_URL`` set (see
+``harness.sheets_emulator``), then::
+
+    python -m harness.register_load -c 16 --duration 20 --invalid-ratio 0.2
+    python -m harness.register_load --start-emulator --latency-ms 120 -c 64 --rate 50
+
+The emulator is reset before the run, and its row count is compared with the
+number of successful responses afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import urllib.request
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Any, Sequence
+from urllib.parse import urlsplit
+
+from .loadgen import Request, Response, listener_pid, run_load
+from .report import format_cell, format_table, write_json
+from .scenarios import BASE_URL
+from .sheets_emulator import FaultConfig, SheetsEmulator
+from .stats import distribution
+
+REGISTER_PATH = "/api/register"
+EMULATOR_URL = "http://127.0.0.1:8787"
+PHASES = ("validation", "auth", "append")
+_TIMING_RE = re.compile(r"([\w-]+)(?:;[^,]*?dur=([\d.]+))?")
+
+# Payloads the route must reject with 400, cycled through in order.
+INVALID_PAYLOADS = {
+    "missing_name": lambda i: {"name": "", "phone": _phone(i), "email": _email(i)},
+    "missing_email": lambda i: {"name": _name(i), "phone": _phone(i)},
+    "short_phone": lambda i: {"name": _name(i), "phone": "98765", "email": _email(i)},
+    "bad_prefix": lambda i: {"name": _name(i), "phone": "5123456789", "email": _email(i)},
+}
+
+
+def _name(i: int) -> str:
+    return f"Load Test {i}"
+
+
+def _phone(i: int) -> str:
+    return f"9{i % 10**9:09d}"
+
+
+def _email(i: int) -> str:
+    return f"load{i}@example.com"
+
+
+def payload_for(index: int, invalid_ratio: float) -> tuple[str, dict[str, Any]]:
+    """Deterministic mix: every ``1/invalid_ratio``-th request is invalid."""
+    step = round(1 / invalid_ratio) if invalid_ratio > 0 else 0
+    if step and index % step == step - 1:
+        kinds = list(INVALID_PAYLOADS)
+        kind = kinds[(index // step) % len(kinds)]
+        return kind, INVALID_PAYLOADS[kind](index)
+    return "valid", {"name": _name(index), "phone": _phone(index), "email": _email(index)}
+
+
+def parse_server_timing(value: str) -> dict[str, float]:
+    return {
+        name: float(dur)
+        for name, dur in _TIMING_RE.findall(value)
+        if dur
+    }
+
+
+class RegisterCheck:
+    """Classifies responses and collects latency and phase timings per kind."""
+
+    def __init__(self) -> None:
+        self.latency_ms: dict[str, list[float]] = defaultdict(list)
+        self.phases_ms: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+        self.outcomes: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def __call__(self, response: Response) -> str | None:
+        kind = response.request.headers["X-Harness-Kind"]
+        self.latency_ms[kind].append(response.latency_ms)
+        self.outcomes[kind][str(response.status)] += 1
+        for phase, ms in parse_server_timing(response.headers.get("server-timing", "")).items():
+            self.phases_ms[kind][phase].append(ms)
+        expected = 200 if kind == "valid" else 400
+        if response.status == expected:
+            return None
+        if kind == "valid" and response.status == 500:
+            return "save_failed"
+        return f"{kind}_http_{response.status}"
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            kind: {
+                "requests": len(latencies),
+                "statuses": dict(self.outcomes[kind]),
+                "latency_ms": distribution(latencies),
+                "phases_ms": {
+                    phase: distribution(self.phases_ms[kind].get(phase, []))
+                    for phase in PHASES
+                },
+            }
+            for kind, latencies in sorted(self.latency_ms.items())
+        }
+
+
+def _emulator(url: str, path: str, payload: dict | None = None) -> Any:
+    req = urllib.request.Request(
+        url.rstrip("/") + path,
+        data=json.dumps(payload).encode() if payload is not None else None,
+        method="POST" if payload is not None else "GET",
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=2) as response:
+        return json.loads(response.read())
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.register_load", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, help="requests/s, open loop (default: closed loop)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("-n", "--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request seconds")
+    parser.add_argument("--invalid-ratio", type=float, default=0.2)
+    parser.add_argument("--emulator", default=EMULATOR_URL, help="Sheets emulator to reset and check")
+    parser.add_argument("--start-emulator", action="store_true", help="run the emulator in-process")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="with --start-emulator")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="with --start-emulator")
+    parser.add_argument("--quota", type=int, default=0, help="with --start-emulator")
+    parser.add_argument("--server-pid", type=int, help="pid to sample CPU from (default: port owner)")
+    parser.add_argument("--json", metavar="PATH")
+    args = parser.parse_args(argv)
+
+    check = RegisterCheck()
+
+    def make_request(index: int) -> Request:
+        kind, payload = payload_for(index, args.invalid_ratio)
+        return Request(
+            "POST",
+            REGISTER_PATH,
+            {"Content-Type": "application/json", "X-Harness-Kind": kind},
+            json.dumps(payload).encode(),
+        )
+
+    emulator_port = urlsplit(args.emulator).port or 80
+    server = (
+        SheetsEmulator(
+            emulator_port,
+            FaultConfig(latency_ms=args.latency_ms, error_rate=args.error_rate, quota_per_minute=args.quota),
+        )
+        if args.start_emulator
+        else nullcontext()
+    )
+    with server:
+        try:
+            _emulator(args.emulator, "/_emulator/reset", {})
+        except OSError:
+            print(f"no Sheets emulator at {args.emulator}; skipping row checks", file=sys.stderr)
+            args.emulator = None
+        result = asyncio.run(run_load(
+            args.url,
+            make_request,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration_s=None if args.requests else args.duration,
+            total=args.requests,
+            timeout_s=args.timeout,
+            check=check,
+            server_pid=args.server_pid or listener_pid(urlsplit(args.url).port or 80),
+        ))
+        emulator_stats = _emulator(args.emulator, "/_emulator/stats") if args.emulator else None
+
+    summary = result.summary()
+    by_kind = check.summary()
+    rows = [
+        (
+            kind,
+            s["requests"],
+            s["latency_ms"]["p50"],
+            s["latency_ms"]["p95"],
+            s["latency_ms"]["p99"],
+            *(s["phases_ms"][phase]["p50"] for phase in PHASES),
+            ", ".join(f"{k}:{v}" for k, v in sorted(s["statuses"].items())),
+        )
+        for kind, s in by_kind.items()
+    ]
+    print(format_table(
+        ("kind", "n", "p50 ms", "p95 ms", "p99 ms", "validation", "auth", "append", "statuses"),
+        rows,
+    ))
+    total_errors = sum(summary["errors"].values())
+    cpu = summary["server_cpu"]
+    print(f"throughput {format_cell(summary['rps'])} req/s, errors {total_errors}/{summary['requests']}"
+          + (f", server cpu {cpu['cpu_pct']:.0f}%" if cpu else ""))
+    for label, count in sorted(summary["errors"].items()):
+        print(f"  {label}: {count}")
+
+    mismatch = False
+    if emulator_stats is not None:
+        saved = by_kind.get("valid", {}).get("statuses", {}).get("200", 0)
+        mismatch = emulator_stats["ok"] != saved
+        print(f"emulator: {emulator_stats['ok']} rows appended for {saved} successful responses, "
+              f"{emulator_stats['token']} token exchanges, {emulator_stats['quota']} quota rejections")
+    if args.json:
+        write_json(args.json, {
+            "url": args.url + REGISTER_PATH,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "invalid_ratio": args.invalid_ratio,
+            **summary,
+            "by_kind": by_kind,
+            "emulator": emulator_stats,
+        })
+    return 1 if total_errors or mismatch else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Per-test resource profiles: skip the hero frames a scenario never looks at.
+
+``useImagePreloader`` starts fetching every ``/video-sequence-1/`` frame on
+mount, so the tests that only use the registration dialog still download and
+decode the whole sequence. A :class:`ResourceProfile` says how many leading
+frames a test needs. The rest are answered from ``context.route`` with a
+1×1 GIF, so they finish at once and need no decoding. Frame 0 is always
+served for real, which is what flips ``isReady``. Frames that are kept
+fall through to any other route, such as the frame cache.
+
+- ``full`` serves everything. This is the default.
+- ``hero`` serves the ``MIN_FRAMES_TO_START`` priority frames, or the first
+  atlas sheet: enough for the hero to appear and react.
+- ``forms-only`` serves frame 0 only.
+
+:data:`TEST_PROFILES` assigns the profiles; ``--resource-profile`` forces one
+profile for every test. For each test the run reports the stubbed requests,
+the bytes avoided (the sizes of the files in ``public/``) and an estimate of
+the time saved: the stubbed requests, spread over the preloader's 6 parallel
+slots, at the mean latency of the frames that were served::
+
+    python -m harness.runner --resource-profiles TC006 TC007 TC009 TC014
+    python -m harness.runner --resource-profile forms-only TC003
+"""
+
+from __future__ import annotations
+
+import base64
+import re
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from playwright import async_api
+
+from .frame_cache import FRAME_URL
+from .scenarios import TESTS_DIR, Scenario
+
+PUBLIC_DIR = TESTS_DIR.parent / "public"
+# Mirrors useImagePreloader.ts.
+MIN_FRAMES_TO_START = 15
+CONCURRENCY = 6
+STUB_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///ywAAAAAAQABAAACAUwAOw==")
+_INDEX = re.compile(r"(\d+)\.\w+$")
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    name: str
+    keep_frames: int | None  # None keeps every frame
+
+    def keeps(self, url: str) -> bool:
+        if self.keep_frames is None:
+            return True
+        path = urlsplit(url).path
+        match = _INDEX.search(path)
+        if match is None:
+            return True
+        index = int(match.group(1))
+        if "/atlas-" in path:  # sheet-000 holds the first frames
+            return index == 0 and self.keep_frames > 0
+        return index < self.keep_frames
+
+
+PROFILES = {
+    "full": ResourceProfile("full", None),
+    "hero": ResourceProfile("hero", MIN_FRAMES_TO_START),
+    "forms-only": ResourceProfile("forms-only", 1),
+}
+
+# These four only drive the registration dialog.
+TEST_PROFILES = {
+    "TC006": "forms-only",
+    "TC007": "forms-only",
+    "TC009": "forms-only",
+    "TC014": "forms-only",
+}
+
+
+@dataclass
+class ProfileStats:
+    profile: str
+    stubbed: int = 0
+    bytes_avoided: int = 0
+    served: int = 0
+    served_ms: list[float] = field(default_factory=list)
+
+    def saved_s(self) -> float:
+        if not self.stubbed or not self.served_ms:
+            return 0.0
+        mean_ms = sum(self.served_ms) / len(self.served_ms)
+        return self.stubbed / CONCURRENCY * mean_ms / 1000
+
+
+def _file_size(url: str) -> int:
+    path = PUBLIC_DIR / unquote(urlsplit(url).path).lstrip("/")
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class ResourceProfiles:
+    def __init__(self, test_profiles: dict[str, str] | None = None, default: str = "full") -> None:
+        self.test_profiles = TEST_PROFILES if test_profiles is None else test_profiles
+        self.default = default
+        self.stats: dict[str, ProfileStats] = {}
+
+    def profile_for(self, scenario: Scenario) -> ResourceProfile:
+        return PROFILES[self.test_profiles.get(scenario.test_id, self.default)]
+
+    async def install(self, context: async_api.BrowserContext, scenario: Scenario) -> None:
+        """Context hook; register it after the frame cache so it sees requests first."""
+        profile = self.profile_for(scenario)
+        stats = self.stats[scenario.test_id] = ProfileStats(profile.name)
+        if profile.keep_frames is None:
+            return
+
+        async def handle(route: async_api.Route) -> None:
+            url = route.request.url
+            if profile.keeps(url):
+                await route.fallback()
+                return
+            stats.stubbed += 1
+            stats.bytes_avoided += _file_size(url)
+            await route.fulfill(status=200, content_type="image/gif", body=STUB_GIF)
+
+        def finished(request: async_api.Request) -> None:
+            if FRAME_URL.search(request.url) and profile.keeps(request.url):
+                end = request.timing.get("responseEnd", -1)
+                if end > 0:
+                    stats.served += 1
+                    stats.served_ms.append(end)
+
+        context.on("requestfinished", finished)
+        await context.route(FRAME_URL, handle)
+
+    def metrics(self, scenario: Scenario) -> dict[str, Any]:
+        stats = self.stats.get(scenario.test_id)
+        if stats is None or stats.profile == "full":
+            return {}
+        return {
+            "frames_stubbed": stats.stubbed,
+            "mb_avoided": stats.bytes_avoided / 1e6,
+            "saved_s_est": stats.saved_s(),
+        }
+
+    def summary(self) -> dict[str, Any]:
+        profiled = [s for s in self.stats.values() if s.profile != "full"]
+        return {
+            "tests": len(profiled),
+            "frames_stubbed": sum(s.stubbed for s in profiled),
+            "mb_avoided": sum(s.bytes_avoided for s in profiled) / 1e6,
+            "saved_s_est": sum(s.saved_s() for s in profiled),
+        }
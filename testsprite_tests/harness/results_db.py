@@ -0,0 +1,306 @@
+"""Append-only SQLite store for test results, with timing history.
+
+``tmp/test_results.json`` holds one run as a single array. Every entry
+carries the script's full source and a long error report, and the file is
+rewritten whole each time. This store keeps every run instead:
+
+- ``runs``: one row per run id.
+- ``results``: one row per test per run. Each row has the status, the
+  duration, the error class with the first line of the message, and the
+  script's code hash.
+- ``steps``: the wait and total time of each intercepted action (``harness.spans``).
+- ``code``: each distinct script source, stored once by SHA-256 and
+  zlib-compressed.
+
+The runner writes each result as soon as its test finishes
+(``--results-db``), so an interrupted run keeps what it already finished::
+
+    python -m harness.runner --results-db tmp/results.sqlite
+    python -m harness.results_db import tmp/test_results.json     # TestSprite runs
+    python -m harness.results_db p95 TC011 --last 50
+    python -m harness.results_db history TC011
+    python -m harness.results_db runs
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+from .report import format_table
+from .stats import distribution
+
+DEFAULT_DB = Path("tmp/results.sqlite")
+ERROR_CHARS = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    source      TEXT NOT NULL,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    host        TEXT,
+    config      TEXT
+);
+CREATE TABLE IF NOT EXISTS code (
+    hash   TEXT PRIMARY KEY,
+    source BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    test_id     TEXT NOT NULL,
+    title       TEXT,
+    status      TEXT NOT NULL,
+    duration_s  REAL,
+    error_class TEXT,
+    error       TEXT,
+    code_hash   TEXT REFERENCES code(hash),
+    worker      INTEGER,
+    metrics     TEXT,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (run_id, test_id)
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test_id, finished_at);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id      TEXT NOT NULL,
+    test_id     TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    kind        TEXT NOT NULL,
+    selector    TEXT,
+    start_ms    REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    wait_ms     REAL,
+    outcome     TEXT NOT NULL,
+    PRIMARY KEY (run_id, test_id, seq)
+);
+"""
+
+_TEST_ID = re.compile(r"^(TC\d{3})")
+_ERROR_CLASS = re.compile(r"^([A-Za-z_][\w.]*(?:Error|Exception|Timeout))\b")
+
+
+def code_hash(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def error_class(error: str | None) -> str | None:
+    """``AssertionError`` from ``"AssertionError: ..."``; free-form reports are ``"report"``."""
+    if not error:
+        return None
+    match = _ERROR_CLASS.match(error.strip())
+    return match.group(1) if match else "report"
+
+
+def _first_line(error: str | None) -> str | None:
+    if not error:
+        return None
+    line = next((l.strip() for l in error.splitlines() if l.strip()), "")
+    return line[:ERROR_CHARS]
+
+
+class ResultsStore:
+    def __init__(self, path: str | Path = DEFAULT_DB) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def start_run(
+        self, source: str = "harness", config: dict[str, Any] | None = None,
+        run_id: str | None = None, started_at: float | None = None,
+    ) -> str:
+        run_id = run_id or f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self.db:
+            self.db.execute(
+                "INSERT OR IGNORE INTO runs (run_id, source, started_at, host, config) VALUES (?, ?, ?, ?, ?)",
+                (run_id, source, started_at or time.time(), socket.gethostname(),
+                 json.dumps(config, default=str) if config else None),
+            )
+        return run_id
+
+    def finish_run(self, run_id: str, finished_at: float | None = None) -> None:
+        with self.db:
+            self.db.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                            (finished_at or time.time(), run_id))
+
+    def _store_code(self, source: str | None) -> str | None:
+        if source is None:
+            return None
+        digest = code_hash(source)
+        self.db.execute("INSERT OR IGNORE INTO code (hash, source) VALUES (?, ?)",
+                        (digest, zlib.compress(source.encode("utf-8"), 9)))
+        return digest
+
+    def record(
+        self, run_id: str, test_id: str, *, status: str, duration_s: float | None,
+        title: str | None = None, error: str | None = None, error_type: str | None = None,
+        source: str | None = None, worker: int | None = None, metrics: dict[str, Any] | None = None,
+        steps: Iterable[dict[str, Any]] = (), finished_at: float | None = None,
+    ) -> None:
+        """Write one test result (and its steps) in its own transaction."""
+        with self.db:
+            digest = self._store_code(source)
+            self.db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, test_id, title, status, duration_s, error_type or error_class(error),
+                 _first_line(error), digest, worker, json.dumps(metrics) if metrics else None,
+                 finished_at or time.time()),
+            )
+            self.db.execute("DELETE FROM steps WHERE run_id = ? AND test_id = ?", (run_id, test_id))
+            self.db.executemany(
+                "INSERT INTO steps (run_id, test_id, seq, kind, selector, start_ms, duration_ms, wait_ms, outcome)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, test_id, seq, s["kind"], s.get("selector"), s["start_ms"], s["duration_ms"],
+                  s.get("wait_ms"), s.get("outcome", "ok")) for seq, s in enumerate(steps)],
+            )
+
+    def listener(self, run_id: str) -> Callable[[Any, Any], None]:
+        """Runner listener: store each ``(scenario, outcome)`` as it finishes."""
+
+        def on_outcome(scenario: Any, outcome: Any) -> None:
+            self.record(
+                run_id, outcome.test_id, title=outcome.title, status=outcome.status,
+                duration_s=outcome.duration_s, error=outcome.error, error_type=outcome.error_class,
+                source=scenario.path.read_text(encoding="utf-8"), worker=outcome.worker,
+                metrics=outcome.metrics, steps=outcome.steps,
+            )
+
+        return on_outcome
+
+    def code(self, digest: str) -> str | None:
+        row = self.db.execute("SELECT source FROM code WHERE hash = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def durations(self, test_id: str, last: int = 50, status: str | None = None) -> list[float]:
+        query = "SELECT duration_s FROM results WHERE test_id = ? AND duration_s IS NOT NULL"
+        params: list[Any] = [test_id]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY finished_at DESC LIMIT ?"
+        return [row[0] for row in self.db.execute(query, (*params, last))]
+
+    def history(self, test_id: str, last: int = 20) -> list[tuple]:
+        return self.db.execute(
+            "SELECT run_id, status, duration_s, error_class, error, substr(code_hash, 1, 12) "
+            "FROM results WHERE test_id = ? ORDER BY finished_at DESC LIMIT ?",
+            (test_id, last),
+        ).fetchall()
+
+    def slowest_steps(self, test_id: str, last: int = 50, limit: int = 10) -> list[tuple]:
+        """Mean wait, mean and max duration per (kind, selector) over the test's recent runs."""
+        return self.db.execute(
+            "SELECT kind, selector, COUNT(*), AVG(wait_ms), AVG(duration_ms), MAX(duration_ms) FROM steps "
+            "WHERE test_id = ? AND run_id IN (SELECT run_id FROM results WHERE test_id = ? "
+            "ORDER BY finished_at DESC LIMIT ?) GROUP BY kind, selector ORDER BY AVG(duration_ms) DESC LIMIT ?",
+            (test_id, test_id, last, limit),
+        ).fetchall()
+
+    def runs(self, last: int = 20) -> list[tuple]:
+        return self.db.execute(
+            "SELECT r.run_id, r.source, COUNT(t.test_id), SUM(t.status = 'passed'), "
+            "r.finished_at - r.started_at FROM runs r LEFT JOIN results t USING (run_id) "
+            "GROUP BY r.run_id ORDER BY r.started_at DESC LIMIT ?",
+            (last,),
+        ).fetchall()
+
+
+def _timestamp(value: str | None) -> float | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def import_testsprite(store: ResultsStore, path: str | Path) -> tuple[str, int]:
+    """Load a TestSprite ``test_results.json`` as one run; re-importing is a no-op."""
+    raw = Path(path).read_bytes()
+    entries = json.loads(raw)
+    run_id = f"testsprite-{hashlib.sha256(raw).hexdigest()[:12]}"
+    created = [t for e in entries if (t := _timestamp(e.get("created"))) is not None]
+    modified = [t for e in entries if (t := _timestamp(e.get("modified"))) is not None]
+    store.start_run("testsprite", {"file": str(path)}, run_id=run_id,
+                    started_at=min(created) if created else None)
+    for entry in entries:
+        title = entry.get("title", "")
+        match = _TEST_ID.match(title)
+        start, end = _timestamp(entry.get("created")), _timestamp(entry.get("modified"))
+        store.record(
+            run_id,
+            match.group(1) if match else title,
+            title=title,
+            status=str(entry.get("testStatus", "unknown")).lower(),
+            duration_s=end - start if start is not None and end is not None else None,
+            error=entry.get("testError"),
+            source=entry.get("code"),
+            finished_at=end,
+        )
+    store.finish_run(run_id, max(modified) if modified else None)
+    return run_id, len(entries)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.results_db", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import a TestSprite test_results.json")
+    imp.add_argument("paths", nargs="+", type=Path)
+    p95 = sub.add_parser("p95", help="duration percentiles over the last N runs")
+    p95.add_argument("tests", nargs="+")
+    p95.add_argument("--last", type=int, default=50)
+    p95.add_argument("--status", help="only runs with this status, e.g. passed")
+    hist = sub.add_parser("history", help="recent results and slowest steps of one test")
+    hist.add_argument("test")
+    hist.add_argument("--last", type=int, default=20)
+    runs = sub.add_parser("runs", help="recent runs")
+    runs.add_argument("--last", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with ResultsStore(args.db) as store:
+        if args.command == "import":
+            for path in args.paths:
+                run_id, count = import_testsprite(store, path)
+                print(f"{path}: {count} results as run {run_id}")
+        elif args.command == "p95":
+            rows = []
+            for test_id in args.tests:
+                dist = distribution(store.durations(test_id, args.last, args.status))
+                rows.append((test_id, dist["n"], dist["p50"], dist["p95"], dist["max"]))
+            print(format_table(("test", "runs", "p50 s", "p95 s", "max s"), rows))
+        elif args.command == "history":
+            print(format_table(("run", "status", "seconds", "error class", "error", "code"),
+                               store.history(args.test, args.last)))
+            steps = store.slowest_steps(args.test, args.last)
+            if steps:
+                print()
+                print(format_table(("action", "selector", "count", "wait ms", "mean ms", "max ms"), steps))
+        else:
+            print(format_table(("run", "source", "tests", "passed", "seconds"), store.runs(args.last)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+"""Run the TC scenarios across a pool of shared browsers.
+
+Each worker launches one Chromium and runs up to ``--per-worker`` scenarios at
+once, every one in its own ``browser.new_context()``. The report compares the
+pool's wall-clock time with the serial baseline of one cold launch per script.
+If a browser daemon (``python -m harness.daemon start``) is running, workers
+attach to its warm browser instead of launching their own::
+
+    python -m harness.runner                          # all scenarios, 2 workers
+    python -m harness.runner -w 4 -p 2 TC003 TC006
+    python -m harness.runner --baseline measure --json tmp/harness_run.json
+    python -m harness.runner --smart-waits            # readiness waits, not sleeps
+    python -m harness.runner --frame-cache 512        # hero frames fetched once per run
+    python -m harness.runner --results-db tmp/results.sqlite
+    python -m harness.runner --spans tmp/spans.trace.json     # open in chrome://tracing
+    python -m harness.runner --selector-cache                 # registry locators, cached per page
+    python -m harness.runner --resource-profiles              # form-only tests skip hero frames
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .frame_cache import DEFAULT_MAX_MB, shared_cache
+from .locators import SelectorCache
+from .resources import PROFILES, ResourceProfiles
+from .proxies import Middleware
+from .report import format_cell, format_table, write_json
+from .results_db import ResultsStore
+from .scenarios import ContextHook, HarnessApi, Scenario, discover
+from .spans import SpanRecorder, write_spans
+from .waits import ReadinessWaits
+
+
+@dataclass
+class RunConfig:
+    workers: int = 2
+    per_worker: int = 1
+    timeout_s: float = 300.0
+    headless: bool = True
+    daemon_url: str | None = DEFAULT_URL
+    context_options: dict[str, Any] = field(default_factory=dict)
+    hooks: list[ContextHook] = field(default_factory=list)
+    # Called once per scenario run; a middleware with ``summary()`` adds to
+    # the outcome's metrics.
+    middleware_factories: list[Callable[[], Middleware]] = field(default_factory=list)
+    # Run-wide stats (e.g. the frame cache), collected once the pool is done.
+    summaries: dict[str, Callable[[], dict[str, Any]]] = field(default_factory=dict)
+    # Called with ``(scenario, outcome)`` as soon as each scenario finishes.
+    listeners: list[Callable[[Scenario, "TestOutcome"], None]] = field(default_factory=list)
+    # Per-scenario metrics kept by context hooks, added to the outcome.
+    scenario_metrics: list[Callable[[Scenario], dict[str, Any]]] = field(default_factory=list)
+
+
+@dataclass
+class TestOutcome:
+    test_id: str
+    title: str
+    status: str
+    duration_s: float
+    worker: int
+    error: str | None = None
+    error_class: str | None = None
+    metrics: dict[str, float] = field(default_factory=dict)
+    steps: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class RunReport:
+    outcomes: list[TestOutcome]
+    wall_s: float
+    launch_s: list[float]
+    sources: list[str] = field(default_factory=list)
+    summaries: dict[str, dict[str, Any]] = field(default_factory=dict)
+    baseline_s: float | None = None
+    baseline_measured: bool = False
+
+    @property
+    def serial_estimate_s(self) -> float:
+        """Serial cost: every test duration plus one cold launch per test."""
+        cold = [t for t, src in zip(self.launch_s, self.sources) if src == "launch"]
+        cold = cold or self.launch_s
+        launch = sum(cold) / len(cold) if cold else 0.0
+        return sum(o.duration_s for o in self.outcomes) + launch * len(self.outcomes)
+
+    @property
+    def speedup(self) -> float:
+        baseline = self.baseline_s if self.baseline_s else self.serial_estimate_s
+        return baseline / self.wall_s if self.wall_s > 0 else 0.0
+
+
+def _describe(exc: BaseException) -> str:
+    message = str(exc).strip().splitlines()
+    return f"{type(exc).__name__}: {message[0]}" if message else type(exc).__name__
+
+
+async def run_scenario(
+    browser: async_api.Browser, scenario: Scenario, config: RunConfig, worker: int
+) -> TestOutcome:
+    middlewares = [factory() for factory in config.middleware_factories]
+    api = HarnessApi(
+        browser,
+        scenario,
+        context_options=config.context_options,
+        hooks=config.hooks,
+        middlewares=middlewares,
+    )
+    status, error, error_class = "passed", None, None
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(scenario.bind(api)(), timeout=config.timeout_s)
+    except asyncio.TimeoutError:
+        status, error = "timeout", f"exceeded {config.timeout_s:.0f}s"
+        error_class = "TimeoutError"
+    except Exception as exc:  # noqa: BLE001 - scenario failures are data here
+        status, error, error_class = "failed", _describe(exc), type(exc).__name__
+    finally:
+        await api.close()
+    metrics: dict[str, float] = {}
+    steps: list[dict[str, Any]] = []
+    for middleware in middlewares:
+        summary = getattr(middleware, "summary", None)
+        if summary is not None:
+            metrics.update(summary())
+        recorded = getattr(middleware, "steps", None)
+        if recorded is not None:
+            steps.extend(recorded())
+    for collect in config.scenario_metrics:
+        metrics.update(collect(scenario))
+    return TestOutcome(
+        test_id=scenario.test_id,
+        title=scenario.title,
+        status=status,
+        duration_s=time.perf_counter() - start,
+        worker=worker,
+        error=error,
+        error_class=error_class,
+        metrics=metrics,
+        steps=steps,
+    )
+
+
+async def _worker(
+    index: int,
+    pw: async_api.Playwright,
+    queue: "asyncio.Queue[Scenario]",
+    config: RunConfig,
+    outcomes: list[TestOutcome],
+    launch_s: list[float],
+    sources: list[str],
+) -> None:
+    if queue.empty():
+        return
+    start = time.perf_counter()
+    lease = await acquire_browser(
+        pw, headless=config.headless, daemon_url=config.daemon_url
+    )
+    launch_s.append(time.perf_counter() - start)
+    sources.append(lease.source)
+    browser = lease.browser
+    contexts = 0
+
+    async def slot() -> None:
+        nonlocal contexts
+        while True:
+            try:
+                scenario = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            outcome = await run_scenario(browser, scenario, config, index)
+            outcomes.append(outcome)
+            contexts += 1
+            for listener in config.listeners:
+                listener(scenario, outcome)
+            print(
+                f"[w{index}] {outcome.test_id} {outcome.status} "
+                f"{outcome.duration_s:.1f}s",
+                flush=True,
+            )
+
+    try:
+        await asyncio.gather(*(slot() for _ in range(max(1, config.per_worker))))
+    finally:
+        await lease.release(contexts)
+
+
+async def run_pool(scenarios: Sequence[Scenario], config: RunConfig) -> RunReport:
+    queue: asyncio.Queue[Scenario] = asyncio.Queue()
+    for scenario in scenarios:
+        queue.put_nowait(scenario)
+    outcomes: list[TestOutcome] = []
+    launch_s: list[float] = []
+    sources: list[str] = []
+    start = time.perf_counter()
+    async with async_api.async_playwright() as pw:
+        await asyncio.gather(
+            *(
+                _worker(i, pw, queue, config, outcomes, launch_s, sources)
+                for i in range(max(1, config.workers))
+            )
+        )
+    wall_s = time.perf_counter() - start
+    outcomes.sort(key=lambda o: o.test_id)
+    return RunReport(
+        outcomes=outcomes,
+        wall_s=wall_s,
+        launch_s=launch_s,
+        sources=sources,
+        summaries={name: summary() for name, summary in config.summaries.items()},
+    )
+
+
+def measure_serial_baseline(scenarios: Sequence[Scenario], timeout_s: float) -> float:
+    """Run each script as-is, one after another, and return the total seconds."""
+    start = time.perf_counter()
+    for scenario in scenarios:
+        try:
+            subprocess.run(
+                [sys.executable, str(scenario.path)],
+                cwd=scenario.path.parent,
+                timeout=timeout_s,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            pass
+    return time.perf_counter() - start
+
+
+def print_report(report: RunReport) -> None:
+    rows = [
+        (o.test_id, o.status, o.duration_s, o.worker, o.error)
+        for o in report.outcomes
+    ]
+    print(format_table(("test", "status", "seconds", "worker", "error"), rows))
+    print()
+    keys = sorted({key for o in report.outcomes for key in o.metrics})
+    if keys:
+        rows = [
+            (o.test_id, *(o.metrics.get(key) for key in keys)) for o in report.outcomes
+        ]
+        print(format_table(("test", *keys), rows))
+        print()
+    if report.baseline_s is not None:
+        kind = "measured" if report.baseline_measured else "estimated"
+        baseline = report.baseline_s
+    else:
+        kind, baseline = "estimated", report.serial_estimate_s
+    attached = ", ".join(
+        f"{src} {t:.2f}s" for src, t in zip(report.sources, report.launch_s)
+    )
+    print(f"browsers:         {attached}")
+    print(f"pool wall clock:  {report.wall_s:.1f}s")
+    print(f"serial baseline:  {baseline:.1f}s ({kind})")
+    print(f"speedup:          {report.speedup:.2f}x")
+    for name, summary in report.summaries.items():
+        values = ", ".join(f"{k}={format_cell(v)}" for k, v in summary.items())
+        print(f"{name + ':':<18}{values}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.runner", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("tests", nargs="*", help="TC ids or name fragments")
+    parser.add_argument("-w", "--workers", type=int, default=2)
+    parser.add_argument(
+        "-p", "--per-worker", type=int, default=1, help="scenarios at once per browser"
+    )
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds per test")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument(
+        "--no-daemon", action="store_true", help="always launch, even if a daemon is up"
+    )
+    parser.add_argument(
+        "--smart-waits",
+        action="store_true",
+        help="replace fixed sleeps with readiness waits and report the time saved",
+    )
+    parser.add_argument(
+        "--resource-profiles",
+        action="store_true",
+        help="stub the hero frames each test does not need (harness.resources.TEST_PROFILES)",
+    )
+    parser.add_argument(
+        "--resource-profile",
+        choices=sorted(PROFILES),
+        help="use this resource profile for every test",
+    )
+    parser.add_argument(
+        "--selector-cache",
+        action="store_true",
+        help="resolve known XPaths through role/label locators, cached per page state",
+    )
+    parser.add_argument(
+        "--baseline",
+        choices=("estimate", "measure"),
+        default="estimate",
+        help="'measure' re-runs every script serially as a subprocess",
+    )
+    parser.add_argument(
+        "--frame-cache",
+        type=float,
+        nargs="?",
+        const=DEFAULT_MAX_MB,
+        metavar="MB",
+        help="serve /video-sequence-1/* from a shared LRU cache of this size",
+    )
+    parser.add_argument(
+        "--frame-cache-dir", metavar="DIR", help="also keep cached frames on disk"
+    )
+    parser.add_argument(
+        "--results-db", metavar="PATH", help="append results and step timings to this SQLite store"
+    )
+    parser.add_argument(
+        "--spans", metavar="PATH", help="record a timing span for every action and write them here"
+    )
+    parser.add_argument("--spans-format", choices=("chrome", "json"), default="chrome")
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> RunConfig:
+    config = RunConfig(
+        workers=args.workers,
+        per_worker=args.per_worker,
+        timeout_s=args.timeout,
+        headless=not args.headed,
+        daemon_url=None if args.no_daemon else DEFAULT_URL,
+    )
+    # The selector cache resolves first, so spans wait on the element it found;
+    # spans start when the script issued the call, so that resolution still
+    # counts as wait. Spans wrap the readiness waits, which replace the sleeps.
+    if args.selector_cache:
+        config.middleware_factories.append(SelectorCache)
+    if args.spans or args.results_db:
+        config.middleware_factories.append(SpanRecorder)
+    if args.smart_waits:
+        config.middleware_factories.append(ReadinessWaits)
+    if args.frame_cache is not None or args.frame_cache_dir:
+        # --frame-cache 0 keeps nothing in memory; with a directory, frames come from disk.
+        cache = shared_cache(
+            max_bytes=int((DEFAULT_MAX_MB if args.frame_cache is None else args.frame_cache) * 1024 * 1024),
+            disk_dir=args.frame_cache_dir,
+        )
+        config.hooks.append(cache.install)
+        config.summaries["frame cache"] = cache.summary
+    if args.resource_profiles or args.resource_profile:
+        profiles = (
+            ResourceProfiles({}, default=args.resource_profile)
+            if args.resource_profile
+            else ResourceProfiles()
+        )
+        # After the frame cache: the last route registered sees requests first.
+        config.hooks.append(profiles.install)
+        config.scenario_metrics.append(profiles.metrics)
+        config.summaries["resource profiles"] = profiles.summary
+    return config
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    scenarios = discover(args.tests)
+    if not scenarios:
+        print("No scenarios matched.", file=sys.stderr)
+        return 2
+    config = config_from_args(args)
+    store = run_id = None
+    if args.results_db:
+        store = ResultsStore(args.results_db)
+        run_id = store.start_run("harness", {k: v for k, v in vars(args).items() if k != "tests"})
+        config.listeners.append(store.listener(run_id))
+    try:
+        report = asyncio.run(run_pool(scenarios, config))
+    finally:
+        if store is not None:
+            store.finish_run(run_id)
+            store.close()
+    if args.baseline == "measure":
+        report.baseline_s = measure_serial_baseline(scenarios, config.timeout_s)
+        report.baseline_measured = True
+    print_report(report)
+    if args.spans:
+        print(f"spans:            {write_spans(args.spans, report.outcomes, args.spans_format)}")
+    if args.json:
+        write_json(
+            args.json,
+            {
+                "outcomes": report.outcomes,
+                "wall_s": report.wall_s,
+                "launch_s": report.launch_s,
+                "sources": report.sources,
+                "baseline_s": report.baseline_s or report.serial_estimate_s,
+                "baseline_measured": report.baseline_measured,
+                "speedup": report.speedup,
+                "workers": config.workers,
+                "per_worker": config.per_worker,
+                "cpus": os.cpu_count(),
+                "summaries": report.summaries,
+            },
+        )
+    return 0 if all(o.status == "passed" for o in report.outcomes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Load the generated TC*.py scripts as reusable ``run_test`` coroutines.
+
+Every TestSprite script starts its own Playwright driver, launches Chromium and
+ends with a module-level ``asyncio.run(run_test())``. The loader drops that
+trailing call and executes the script in a fresh namespace whose ``async_api``
+is a :class:`HarnessApi`: ``pw.chromium.launch()`` hands back a browser owned
+by the harness and ``browser.new_context()`` opens a fresh context on it. The
+scripts themselves stay untouched, so they can still be run one by one.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+from typing import Any, Awaitable, Callable, Iterable, Sequence
+
+from playwright import async_api
+
+from .proxies import ActionPipeline, AsyncioProxy, ContextProxy, Middleware, expect
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+SCENARIO_GLOB = "TC[0-9][0-9][0-9]_*.py"
+BASE_URL = "http://localhost:3000"
+
+ContextHook = Callable[[async_api.BrowserContext, "Scenario"], Awaitable[None]]
+
+_NAME_RE = re.compile(r"^(TC\d{3})_(.+)$")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One TC script, compiled without its ``asyncio.run(...)`` entry point."""
+
+    test_id: str
+    title: str
+    path: Path
+    code: CodeType
+
+    def bind(self, api: "HarnessApi") -> Callable[[], Awaitable[None]]:
+        """Execute the script in a fresh namespace and return its ``run_test``."""
+        namespace: dict[str, Any] = {
+            "__name__": f"testsprite_{self.test_id}",
+            "__file__": str(self.path),
+        }
+        exec(self.code, namespace)
+        namespace["async_api"] = api
+        # TC002 and TC009 call ``expect`` without importing it.
+        namespace.setdefault("expect", expect)
+        if api.pipeline is not None:
+            namespace["asyncio"] = AsyncioProxy(api.pipeline)
+        return namespace["run_test"]
+
+
+def _is_entry_point(node: ast.stmt) -> bool:
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_scenario(path: Path) -> Scenario:
+    path = Path(path)
+    match = _NAME_RE.match(path.stem)
+    if not match:
+        raise ValueError(f"Not a TC scenario file: {path.name}")
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entry_point(node)]
+    return Scenario(
+        test_id=match.group(1),
+        title=match.group(2).replace("_", " "),
+        path=path,
+        code=compile(tree, str(path), "exec"),
+    )
+
+
+def discover(
+    selectors: Sequence[str] = (), tests_dir: Path = TESTS_DIR
+) -> list[Scenario]:
+    """Load scenarios whose file name contains any of ``selectors`` (all if empty)."""
+    paths = sorted(Path(tests_dir).glob(SCENARIO_GLOB))
+    if selectors:
+        wanted = [s.lower() for s in selectors]
+        paths = [p for p in paths if any(s in p.stem.lower() for s in wanted)]
+    return [load_scenario(p) for p in paths]
+
+
+class HarnessApi:
+    """Stand-in for ``playwright.async_api`` inside one scenario run.
+
+    Anything the harness does not override is looked up on the real module,
+    so ``async_api.Error`` and friends keep working. With ``middlewares``, the
+    scenario's contexts, pages and ``asyncio.sleep`` are wrapped so its
+    actions run through an :class:`~harness.proxies.ActionPipeline`.
+    """
+
+    def __init__(
+        self,
+        browser: async_api.Browser,
+        scenario: Scenario,
+        *,
+        context_options: dict[str, Any] | None = None,
+        hooks: Iterable[ContextHook] = (),
+        middlewares: Sequence[Middleware] = (),
+    ) -> None:
+        self.pipeline = ActionPipeline(middlewares) if middlewares else None
+        self.browser = _HarnessBrowser(
+            browser, scenario, dict(context_options or {}), list(hooks), self.pipeline
+        )
+
+    def async_playwright(self) -> "_PlaywrightStarter":
+        return _PlaywrightStarter(self.browser)
+
+    @property
+    def contexts(self) -> list[async_api.BrowserContext]:
+        return self.browser.contexts
+
+    async def close(self) -> None:
+        """Close any context the scenario left open."""
+        for context in self.browser.contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
+
+
+class _PlaywrightStarter:
+    def __init__(self, browser: "_HarnessBrowser") -> None:
+        self._playwright = _HarnessPlaywright(browser)
+
+    async def start(self) -> "_HarnessPlaywright":
+        return self._playwright
+
+    async def __aenter__(self) -> "_HarnessPlaywright":
+        return self._playwright
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+
+class _HarnessPlaywright:
+    def __init__(self, browser: "_HarnessBrowser") -> None:
+        self.chromium = _HarnessBrowserType(browser)
+
+    async def stop(self) -> None:
+        """The driver belongs to the harness; scenarios must not stop it."""
+
+
+class _HarnessBrowserType:
+    def __init__(self, browser: "_HarnessBrowser") -> None:
+        self._browser = browser
+
+    async def launch(self, **_options: Any) -> "_HarnessBrowser":
+        return self._browser
+
+
+class _HarnessBrowser:
+    def __init__(
+        self,
+        browser: async_api.Browser,
+        scenario: Scenario,
+        context_options: dict[str, Any],
+        hooks: list[ContextHook],
+        pipeline: ActionPipeline | None,
+    ) -> None:
+        self._browser = browser
+        self._scenario = scenario
+        self._context_options = context_options
+        self._hooks = hooks
+        self._pipeline = pipeline
+        self.contexts: list[async_api.BrowserContext] = []
+
+    async def new_context(self, **options: Any) -> Any:
+        context = await self._browser.new_context(
+            **{**self._context_options, **options}
+        )
+        self.contexts.append(context)
+        for hook in self._hooks:
+            await hook(context, self._scenario)
+        if self._pipeline is not None:
+            return ContextProxy(context, self._pipeline)
+        return context
+
+    async def new_page(self, **options: Any) -> async_api.Page:
+        context = await self.new_context(**options)
+        return await context.new_page()
+
+    async def close(self, **_options: Any) -> None:
+        """Shared browser: closing is the worker's job, not the scenario's."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
@@ -0,0 +1,221 @@
+"""Scroll smoothness benchmark for the hero canvas sequence.
+
+Loads the landing page with the scroll probe installed (``lib/perfProbe.ts``
+records target/current frame on every HeroScroll tick, and an extra rAF
+callback records frame times), waits for every frame to load, then wheels
+through the ``HERO_HEIGHT_VH`` container at a fixed step and cadence. The
+result is a JSON report with a frame-time histogram, missed vsyncs, and how
+often the drawn sequence trailed the scroll target by more than one frame::
+
+    python -m harness.scroll_bench --runs 3 --json tmp/scroll_bench.json --max-p95-ms 20
+
+Any threshold that is exceeded is listed under ``violations`` and makes the
+command exit 1, so the numbers can be tracked release to release.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .probes import HERO_READY_SELECTOR, install_scroll_probe, read_scroll_probe, reset_scroll_probe
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+from .stats import distribution
+
+FRAME_TIME_EDGES_MS = (8.4, 16.7, 20.0, 25.0, 33.4, 50.0, 100.0)
+LAG_EDGES_FRAMES = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+MAX_WHEEL_STEPS = 400
+
+
+@dataclass
+class Thresholds:
+    p95_frame_ms: float | None = 25.0
+    dropped_pct: float | None = 10.0
+    lagged_pct: float | None = None
+    max_lag_frames: float | None = None
+
+
+@dataclass
+class Sweep:
+    step_px: int = 120
+    interval_ms: int = 16
+    round_trip: bool = False
+    settle_ms: int = 2500
+
+
+def histogram(values: Sequence[float], edges: Sequence[float]) -> dict[str, list]:
+    """Counts per ``(edges[i-1], edges[i]]`` bucket; the last count is the overflow."""
+    counts = [0] * (len(edges) + 1)
+    for value in values:
+        index = next((i for i, edge in enumerate(edges) if value <= edge), len(edges))
+        counts[index] += 1
+    return {"edges": list(edges), "counts": counts}
+
+
+def analyze(runs: Sequence[dict[str, list]], refresh_hz: float = 60.0) -> dict[str, Any]:
+    """Pool the probe samples of several sweeps into one smoothness report."""
+    budget_ms = 1000 / refresh_hz
+    intervals: list[float] = []
+    lags: list[float] = []
+    for samples in runs:
+        raf = samples["raf"]
+        intervals.extend(b - a for a, b in zip(raf, raf[1:]))
+        lags.extend(abs(s["target"] - s["current"]) for s in samples["hero"])
+    dropped = sum(max(0, round(i / budget_ms) - 1) for i in intervals)
+    expected = len(intervals) + dropped
+    lagged = sum(1 for lag in lags if lag > 1)
+    return {
+        "runs": len(runs),
+        "refresh_hz": refresh_hz,
+        "frames": len(intervals),
+        "frame_time_ms": distribution(intervals),
+        "frame_time_histogram": histogram(intervals, FRAME_TIME_EDGES_MS),
+        "dropped_frames": dropped,
+        "dropped_pct": 100 * dropped / expected if expected else None,
+        "hero_ticks": len(lags),
+        "lagged_frames": lagged,
+        "lagged_pct": 100 * lagged / len(lags) if lags else None,
+        "lag_frames": distribution(lags),
+        "lag_histogram": histogram(lags, LAG_EDGES_FRAMES),
+    }
+
+
+def check(result: dict[str, Any], thresholds: Thresholds) -> list[str]:
+    measured = {
+        "p95_frame_ms": result["frame_time_ms"]["p95"],
+        "dropped_pct": result["dropped_pct"],
+        "lagged_pct": result["lagged_pct"],
+        "max_lag_frames": result["lag_frames"]["max"],
+    }
+    return [
+        f"{name} {measured[name]:.2f} > {limit}"
+        for name, limit in asdict(thresholds).items()
+        if limit is not None and measured[name] is not None and measured[name] > limit
+    ]
+
+
+async def wheel_until(page: async_api.Page, target_y: float, delta: int, interval_ms: int) -> None:
+    for _ in range(MAX_WHEEL_STEPS):
+        y = await page.evaluate("() => window.scrollY")
+        if (delta > 0 and y >= target_y) or (delta < 0 and y <= target_y):
+            return
+        await page.mouse.wheel(0, delta)
+        await page.wait_for_timeout(interval_ms)
+
+
+async def hero_scroll_end(page: async_api.Page) -> float:
+    """Scroll offset at which the hero container has been scrolled through."""
+    return await page.evaluate(
+        """(selector) => {
+          const hero = document.querySelector(selector);
+          return hero.offsetTop + hero.offsetHeight - window.innerHeight;
+        }""",
+        HERO_READY_SELECTOR,
+    )
+
+
+async def sweep_once(
+    browser: async_api.Browser, url: str, sweep: Sweep, context_options: dict[str, Any]
+) -> dict[str, list]:
+    context = await browser.new_context(**context_options)
+    try:
+        await install_scroll_probe(context)
+        page = await context.new_page()
+        await page.goto(url)
+        await page.wait_for_selector(HERO_READY_SELECTOR, state="attached", timeout=60_000)
+        await page.wait_for_load_state("networkidle")
+        viewport = page.viewport_size or {"width": 1280, "height": 720}
+        await page.mouse.move(viewport["width"] / 2, viewport["height"] / 2)
+        end = await hero_scroll_end(page)
+        await reset_scroll_probe(page)
+        await wheel_until(page, end, sweep.step_px, sweep.interval_ms)
+        if sweep.round_trip:
+            await wheel_until(page, 0, -sweep.step_px, sweep.interval_ms)
+        await page.wait_for_timeout(sweep.settle_ms)
+        return await read_scroll_probe(page)
+    finally:
+        await context.close()
+
+
+async def run(
+    url: str, runs: int, sweep: Sweep, context_options: dict[str, Any], daemon_url: str | None
+) -> list[dict[str, list]]:
+    samples = []
+    async with async_api.async_playwright() as pw:
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        try:
+            for index in range(runs):
+                samples.append(await sweep_once(lease.browser, url, sweep, context_options))
+                print(f"run {index}: {len(samples[-1]['raf'])} frames, "
+                      f"{len(samples[-1]['hero'])} hero ticks", flush=True)
+        finally:
+            await lease.release(runs)
+    return samples
+
+
+def _viewport(value: str) -> dict[str, int]:
+    width, _, height = value.partition("x")
+    return {"width": int(width), "height": int(height)}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.scroll_bench", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--viewport", type=_viewport, default=_viewport("1280x800"), metavar="WxH")
+    parser.add_argument("--step", type=int, default=Sweep.step_px, help="wheel delta per step (px)")
+    parser.add_argument("--interval-ms", type=int, default=Sweep.interval_ms)
+    parser.add_argument("--round-trip", action="store_true", help="scroll back to the top as well")
+    parser.add_argument("--refresh-hz", type=float, default=60.0)
+    parser.add_argument("--max-p95-ms", type=float, default=Thresholds.p95_frame_ms)
+    parser.add_argument("--max-dropped-pct", type=float, default=Thresholds.dropped_pct)
+    parser.add_argument("--max-lagged-pct", type=float, default=Thresholds.lagged_pct)
+    parser.add_argument("--max-lag-frames", type=float, default=Thresholds.max_lag_frames)
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+
+    sweep = Sweep(args.step, args.interval_ms, args.round_trip)
+    thresholds = Thresholds(
+        args.max_p95_ms, args.max_dropped_pct, args.max_lagged_pct, args.max_lag_frames
+    )
+    samples = asyncio.run(run(
+        args.url, args.runs, sweep, {"viewport": args.viewport},
+        None if args.no_daemon else DEFAULT_URL,
+    ))
+    result = analyze(samples, args.refresh_hz)
+    result["violations"] = check(result, thresholds)
+    result.update(url=args.url, viewport=args.viewport, sweep=sweep, thresholds=thresholds)
+
+    frame_time, lag = result["frame_time_ms"], result["lag_frames"]
+    print(format_table(
+        ("metric", "value"),
+        [
+            ("frames", result["frames"]),
+            ("frame time p50 (ms)", frame_time["p50"]),
+            ("frame time p95 (ms)", frame_time["p95"]),
+            ("dropped frames", result["dropped_frames"]),
+            ("dropped %", result["dropped_pct"]),
+            ("lagged > 1 frame", result["lagged_frames"]),
+            ("lagged %", result["lagged_pct"]),
+            ("max lag (frames)", lag["max"]),
+        ],
+    ))
+    for violation in result["violations"]:
+        print(f"threshold exceeded: {violation}")
+    if args.json:
+        write_json(args.json, result)
+    return 1 if result["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
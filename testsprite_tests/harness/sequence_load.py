@@ -0,0 +1,121 @@
+"""Load test for ``GET /api/sequence``.
+
+Every landing-page visit makes exactly one sequence request, so the sustained
+RPS here is the number of visits per second one instance can start. Each
+response is checked for a non-empty ``urls`` list in the manifest's natural
+order, and compared with the first response so reordering under load shows
+up as ``unordered`` / ``changed`` errors::
+
+    python -m harness.sequence_load -c 32 --duration 20
+    python -m harness.sequence_load -c 64 --rate 400 --server-pid $(pgrep -f next-server)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from typing import Any, Sequence
+from urllib.parse import urlsplit
+
+from .loadgen import LoadResult, Request, Response, listener_pid, run_load
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+
+SEQUENCE_PATH = "/api/sequence"
+
+
+def natural_key(url: str) -> tuple[int, str]:
+    """Same ordering as ``scripts/build_sequence_manifest.py``; ignores ``?v=``."""
+    name = url.split("?", 1)[0].rsplit("/", 1)[-1]
+    digits = re.sub(r"\D", "", name)
+    return int(digits) if digits else 0, name
+
+
+class SequenceCheck:
+    def __init__(self) -> None:
+        self.reference: list[str] | None = None
+
+    def __call__(self, response: Response) -> str | None:
+        if response.status != 200:
+            return f"http_{response.status}"
+        try:
+            urls = json.loads(response.body)["urls"]
+        except (ValueError, KeyError, TypeError):
+            return "malformed"
+        if not urls:
+            return "empty"
+        if urls != sorted(urls, key=natural_key):
+            return "unordered"
+        if self.reference is None:
+            self.reference = urls
+        elif urls != self.reference:
+            return "changed"
+        return None
+
+
+def print_result(result: LoadResult, check: SequenceCheck) -> dict[str, Any]:
+    summary = result.summary()
+    latency = summary["latency_ms"]
+    cpu = summary["server_cpu"]
+    rows = [
+        ("requests", summary["requests"]),
+        ("rps (visits/s)", summary["rps"]),
+        ("latency p50 (ms)", latency["p50"]),
+        ("latency p95 (ms)", latency["p95"]),
+        ("latency p99 (ms)", latency["p99"]),
+        ("latency max (ms)", latency["max"]),
+        ("errors", sum(summary["errors"].values())),
+        ("frames per response", len(check.reference) if check.reference else None),
+        ("server cpu %", cpu["cpu_pct"] if cpu else None),
+    ]
+    print(format_table(("metric", "value"), rows))
+    for label, count in sorted(summary["errors"].items()):
+        print(f"  {label}: {count}")
+    return summary
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.sequence_load", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, help="requests/s, open loop (default: closed loop)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("-n", "--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request seconds")
+    parser.add_argument("--server-pid", type=int, help="pid to sample CPU from (default: port owner)")
+    parser.add_argument("--json", metavar="PATH")
+    args = parser.parse_args(argv)
+
+    port = urlsplit(args.url).port or 80
+    pid = args.server_pid or listener_pid(port)
+    check = SequenceCheck()
+    request = Request("GET", SEQUENCE_PATH, {"Accept": "application/json"})
+    result = asyncio.run(run_load(
+        args.url,
+        lambda _index: request,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration_s=None if args.requests else args.duration,
+        total=args.requests,
+        timeout_s=args.timeout,
+        check=check,
+        server_pid=pid,
+    ))
+    summary = print_result(result, check)
+    if args.json:
+        write_json(args.json, {
+            "url": args.url + SEQUENCE_PATH,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            **summary,
+        })
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
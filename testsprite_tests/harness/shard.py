@@ -0,0 +1,269 @@
+"""Duration-aware sharding of the TC scenarios across worker processes.
+
+Per-test durations vary a lot: TC010 is over in seconds, while TC001 and
+TC011 loop for minutes. An even split by count leaves most workers idle
+behind the slowest one. This scheduler predicts each test's duration from
+history. It uses the median of recent results in the store
+(``--history``, see ``harness.results_db``), or else TestSprite's
+``tmp/test_results.json``. Tests it has never seen get the median of the
+known ones.
+
+The predicted tests are packed onto ``-w`` processes, longest first (LPT),
+and each process runs one test at a time in its own browser. A process that
+drains its own queue steals the last (shortest) queued test from the process
+with the most predicted work left, so a bad prediction does not strand work.
+The report compares predicted and actual busy time per shard and the
+makespan, and also shows what a plain round-robin split would have
+predicted::
+
+    python -m harness.shard -w 4 --history tmp/results.sqlite
+    python -m harness.shard -w 3 --results tmp/test_results.json --json tmp/shard.json
+
+It takes the runner's options (``--smart-waits``, ``--frame-cache``,
+``--results-db``, ...). ``-p`` is ignored.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import queue
+import statistics
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+from playwright import async_api
+
+from .daemon import acquire_browser
+from .report import format_table, write_json
+from .results_db import ResultsStore, import_testsprite
+from .runner import TestOutcome, build_parser, config_from_args, run_scenario
+from .scenarios import discover
+from .spans import write_spans
+from .stats import percentile
+
+DEFAULT_RESULTS = Path("tmp/test_results.json")
+HISTORY_RUNS = 20
+POLL_S = 0.5
+
+
+@dataclass
+class Shard:
+    index: int
+    queue: deque[str] = field(default_factory=deque)
+    predicted_s: float = 0.0
+    actual_s: float = 0.0
+    ran: list[str] = field(default_factory=list)
+    stolen: int = 0
+
+    def remaining_s(self, predictions: dict[str, float]) -> float:
+        return sum(predictions[t] for t in self.queue)
+
+
+def predict(
+    test_ids: Sequence[str], history: str | Path | None = None, results: str | Path | None = None
+) -> tuple[dict[str, float], dict[str, str]]:
+    """Predicted seconds per test, plus where each prediction came from."""
+    known: dict[str, float] = {}
+    sources: dict[str, str] = {}
+    if history and Path(history).exists():
+        with ResultsStore(history) as store:
+            for test_id in test_ids:
+                durations = store.durations(test_id, HISTORY_RUNS)
+                if durations:
+                    known[test_id], sources[test_id] = percentile(durations, 50), "history"
+    if results and Path(results).exists():
+        with ResultsStore(":memory:") as store:
+            import_testsprite(store, results)
+            for test_id in test_ids:
+                durations = store.durations(test_id, 1)
+                if test_id not in known and durations:
+                    known[test_id], sources[test_id] = durations[0], "testsprite"
+    fallback = statistics.median(known.values()) if known else 60.0
+    return (
+        {t: known.get(t, fallback) for t in test_ids},
+        {t: sources.get(t, "default") for t in test_ids},
+    )
+
+
+def lpt(predictions: dict[str, float], shards: int) -> list[Shard]:
+    """Longest-processing-time-first: each test goes to the least-loaded shard."""
+    bins = [Shard(i) for i in range(max(1, shards))]
+    for test_id in sorted(predictions, key=lambda t: (-predictions[t], t)):
+        target = min(bins, key=lambda s: (s.predicted_s, s.index))
+        target.queue.append(test_id)
+        target.predicted_s += predictions[test_id]
+    return bins
+
+
+def round_robin_makespan(predictions: dict[str, float], shards: int) -> float:
+    loads = [0.0] * max(1, shards)
+    for i, test_id in enumerate(sorted(predictions)):
+        loads[i % len(loads)] += predictions[test_id]
+    return max(loads)
+
+
+def next_test(shard: Shard, shards: Sequence[Shard], predictions: dict[str, float], steal: bool) -> str | None:
+    if shard.queue:
+        return shard.queue.popleft()
+    if not steal:
+        return None
+    donors = [s for s in shards if s.queue]
+    if not donors:
+        return None
+    donor = max(donors, key=lambda s: s.remaining_s(predictions))
+    shard.stolen += 1
+    return donor.queue.pop()
+
+
+def _worker(index: int, args: argparse.Namespace, tasks: mp.Queue, events: mp.Queue) -> None:
+    asyncio.run(_work(index, args, tasks, events))
+
+
+async def _work(index: int, args: argparse.Namespace, tasks: mp.Queue, events: mp.Queue) -> None:
+    config = config_from_args(args)
+    async with async_api.async_playwright() as pw:
+        lease = await acquire_browser(pw, headless=config.headless, daemon_url=config.daemon_url)
+        contexts = 0
+        try:
+            while True:
+                events.put(("ready", index, None))
+                test_id = await asyncio.to_thread(tasks.get)
+                if test_id is None:
+                    return
+                outcome = await run_scenario(lease.browser, discover([test_id])[0], config, index)
+                contexts += 1
+                events.put(("done", index, outcome))
+        finally:
+            await lease.release(contexts)
+
+
+def run_shards(
+    args: argparse.Namespace, shards: list[Shard], predictions: dict[str, float], steal: bool,
+    store: ResultsStore | None = None, run_id: str | None = None,
+) -> tuple[list[TestOutcome], float]:
+    ctx = mp.get_context("spawn")
+    events: mp.Queue = ctx.Queue()
+    tasks = [ctx.Queue() for _ in shards]
+    procs = [ctx.Process(target=_worker, args=(s.index, args, tasks[s.index], events)) for s in shards]
+    scenarios = {s.test_id: s for s in discover([t for s in shards for t in s.queue])}
+    listener = store.listener(run_id) if store is not None else None
+    outcomes: list[TestOutcome] = []
+    running: dict[int, str | None] = {}
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    live = set(range(len(procs)))
+    while live:
+        try:
+            kind, index, outcome = events.get(timeout=POLL_S)
+        except queue.Empty:
+            for index in [i for i in live if not procs[i].is_alive()]:
+                live.discard(index)
+                if running.get(index):
+                    outcomes.append(TestOutcome(running[index], scenarios[running[index]].title,
+                                                "crashed", 0.0, index, "worker process exited"))
+            continue
+        shard = shards[index]
+        if kind == "done":
+            outcomes.append(outcome)
+            shard.actual_s += outcome.duration_s
+            shard.ran.append(outcome.test_id)
+            running[index] = None
+            print(f"[s{index}] {outcome.test_id} {outcome.status} {outcome.duration_s:.1f}s "
+                  f"(predicted {predictions[outcome.test_id]:.1f}s)", flush=True)
+            if listener is not None:
+                listener(scenarios[outcome.test_id], outcome)
+            continue
+        test_id = next_test(shard, shards, predictions, steal)
+        running[index] = test_id
+        tasks[index].put(test_id)
+        if test_id is None:
+            live.discard(index)
+    for proc in procs:
+        proc.join()
+    for shard in shards:  # only left over when every worker that could steal has died
+        outcomes.extend(TestOutcome(t, scenarios[t].title, "skipped", 0.0, shard.index, "no live worker")
+                        for t in shard.queue)
+        shard.queue.clear()
+    outcomes.sort(key=lambda o: o.test_id)
+    return outcomes, time.perf_counter() - start
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = build_parser()
+    parser.prog = "python -m harness.shard"
+    parser.description = __doc__.splitlines()[0]
+    parser.add_argument("--history", metavar="DB", help="results store to predict durations from")
+    parser.add_argument("--results", metavar="JSON", default=str(DEFAULT_RESULTS),
+                        help="TestSprite results used for tests without history")
+    parser.add_argument("--no-steal", action="store_true", help="keep the static LPT assignment")
+    parser.add_argument("--plan", action="store_true", help="print the assignment and exit")
+    args = parser.parse_args(argv)
+
+    test_ids = [s.test_id for s in discover(args.tests)]
+    if not test_ids:
+        print("No scenarios matched.", file=sys.stderr)
+        return 2
+    predictions, sources = predict(test_ids, args.history, args.results)
+    shards = lpt(predictions, min(args.workers, len(test_ids)))
+    predicted = max(s.predicted_s for s in shards)
+    print(format_table(
+        ("shard", "tests", "predicted s"),
+        [(s.index, " ".join(s.queue), s.predicted_s) for s in shards],
+    ))
+    print(f"predicted makespan: {predicted:.1f}s (round-robin {round_robin_makespan(predictions, len(shards)):.1f}s)")
+    if args.plan:
+        return 0
+
+    store = run_id = None
+    if args.results_db:
+        store = ResultsStore(args.results_db)
+        run_id = store.start_run("shard", {k: v for k, v in vars(args).items() if k != "tests"})
+    try:
+        outcomes, wall_s = run_shards(args, shards, predictions, not args.no_steal, store, run_id)
+    finally:
+        if store is not None:
+            store.finish_run(run_id)
+            store.close()
+
+    print()
+    print(format_table(
+        ("test", "status", "seconds", "predicted", "source", "shard"),
+        [(o.test_id, o.status, o.duration_s, predictions[o.test_id], sources[o.test_id], o.worker)
+         for o in outcomes],
+    ))
+    print()
+    print(format_table(
+        ("shard", "ran", "stolen", "predicted s", "actual s"),
+        [(s.index, " ".join(s.ran), s.stolen, s.predicted_s, s.actual_s) for s in shards],
+    ))
+    actual = max(s.actual_s for s in shards)
+    print(f"makespan:         predicted {predicted:.1f}s, actual busy {actual:.1f}s, wall {wall_s:.1f}s")
+    if args.spans:
+        print(f"spans:            {write_spans(args.spans, outcomes, args.spans_format)}")
+    if args.json:
+        write_json(args.json, {
+            "predictions": predictions,
+            "sources": sources,
+            "shards": [
+                {"index": s.index, "ran": s.ran, "stolen": s.stolen,
+                 "predicted_s": s.predicted_s, "actual_s": s.actual_s}
+                for s in shards
+            ],
+            "outcomes": outcomes,
+            "predicted_makespan_s": predicted,
+            "round_robin_makespan_s": round_robin_makespan(predictions, len(shards)),
+            "actual_makespan_s": actual,
+            "wall_s": wall_s,
+        })
+    return 0 if all(o.status == "passed" for o in outcomes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
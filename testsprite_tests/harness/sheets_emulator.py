@@ -0,0 +1,368 @@
+"""Local stand-in for the parts of Google Sheets that ``/api/register`` uses.
+
+Implements the service-account token exchange (``POST /token`` with a
+JWT-bearer grant) and ``POST /v4/spreadsheets/{id}/values/{range}:append``.
+Latency, error rate and a per-minute quota (answered with 429
+``RESOURCE_EXHAUSTED``, like the real API) are configurable, and every
+appended row is recorded so TC007-TC009 can assert on what was saved.
+
+Start it, then point the dev server at it::
+
+    openssl genpkey -algorithm RSA -out /tmp/sheets-emulator.pem   # any RSA key will do
+    python -m harness.sheets_emulator --print-env /tmp/sheets-emulator.pem >> ../.env.local
+    python -m harness.sheets_emulator --latency-ms 80 --error-rate 0.02 --quota 300
+    npm run dev
+
+The emulator does not verify signatures. Control endpoints:
+``GET /_emulator/rows``, ``GET /_emulator/stats``, ``POST /_emulator/config``
+(same keys as :class:`FaultConfig`; an unknown key or bad value is a 400 and
+changes nothing) and ``POST /_emulator/reset``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Sequence
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DEFAULT_PORT = 8787
+JWT_BEARER = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+SHEETS_SCOPE = "https://www.googleapis.com/auth/spreadsheets"
+_APPEND_RE = re.compile(r"^/v4/spreadsheets/([^/]+)/values/(.+):append$")
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    quota_per_minute: int = 0  # 0 = unlimited
+    token_latency_ms: float = 0.0
+
+
+@dataclass
+class AppendedRow:
+    spreadsheet_id: str
+    range: str
+    values: list[Any]
+    value_input_option: str | None
+    at: float
+
+
+class EmulatorState:
+    def __init__(self, faults: FaultConfig, seed: int | None = None) -> None:
+        self.faults = faults
+        self.rows: list[AppendedRow] = []
+        self.tokens: set[str] = set()
+        self.counts = {"token": 0, "append": 0, "ok": 0, "error": 0, "quota": 0, "unauthorized": 0}
+        self._window: deque[float] = deque()
+        self._random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def delay(self, base_ms: float) -> None:
+        with self.lock:
+            jitter = self._random.uniform(0, self.faults.jitter_ms)
+        if base_ms + jitter > 0:
+            time.sleep((base_ms + jitter) / 1000)
+
+    def admit(self) -> str | None:
+        """Return the fault to inject for this append, if any."""
+        now = time.monotonic()
+        with self.lock:
+            limit = self.faults.quota_per_minute
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if limit and len(self._window) >= limit:
+                return "quota"
+            self._window.append(now)
+            if self._random.random() < self.faults.error_rate:
+                return "error"
+        return None
+
+    def reset(self) -> None:
+        with self.lock:
+            self.rows.clear()
+            self.tokens.clear()
+            self._window.clear()
+            for key in self.counts:
+                self.counts[key] = 0
+
+
+def _google_error(code: int, status: str, message: str) -> dict[str, Any]:
+    return {"error": {"code": code, "message": message, "status": status}}
+
+
+def _json_object(body: bytes, what: str) -> dict[str, Any]:
+    """Parse a request body that must be a JSON object; ``ValueError`` otherwise."""
+    parsed = json.loads(body or b"{}")
+    if not isinstance(parsed, dict):
+        raise ValueError(f"expected a JSON object of {what}")
+    return parsed
+
+
+def _append_values(body: bytes) -> list[list[Any]]:
+    values = _json_object(body, "append parameters").get("values", [])
+    if not isinstance(values, list) or not all(isinstance(row, list) for row in values):
+        raise ValueError("values must be a list of rows")
+    return values
+
+
+def _jwt_claims(assertion: str) -> dict[str, Any]:
+    payload = assertion.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "SheetsEmulator"
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle and delayed ACK on a
+    # keep-alive connection that adds ~40 ms to every response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        state = self.server.state
+        path = urlsplit(self.path).path
+        if path == "/_emulator/rows":
+            with state.lock:
+                self._send(200, [asdict(row) for row in state.rows])
+        elif path == "/_emulator/stats":
+            with state.lock:
+                self._send(200, {**state.counts, "faults": asdict(state.faults)})
+        else:
+            self._send(404, _google_error(404, "NOT_FOUND", f"no route {path}"))
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        state = self.server.state
+        url = urlsplit(self.path)
+        body = self._body()
+        if url.path == "/token":
+            self._token(body)
+        elif url.path == "/_emulator/reset":
+            state.reset()
+            self._send(200, {"ok": True})
+        elif url.path == "/_emulator/config":
+            try:
+                self.server.configure(**_json_object(body, "fault settings"))
+            except ValueError as exc:
+                self._send(400, _google_error(400, "INVALID_ARGUMENT", str(exc)))
+            else:
+                self._send(200, asdict(state.faults))
+        elif match := _APPEND_RE.match(url.path):
+            self._append(match, parse_qs(url.query), body)
+        else:
+            self._send(404, _google_error(404, "NOT_FOUND", f"no route {url.path}"))
+
+    def _token(self, body: bytes) -> None:
+        state = self.server.state
+        form = parse_qs(body.decode("utf-8", "replace"))
+        state.delay(state.faults.token_latency_ms)
+        if form.get("grant_type", [""])[0] != JWT_BEARER or "assertion" not in form:
+            self._send(400, {"error": "unsupported_grant_type"})
+            return
+        try:
+            claims = _jwt_claims(form["assertion"][0])
+        except (IndexError, ValueError):
+            self._send(400, {"error": "invalid_grant", "error_description": "malformed JWT"})
+            return
+        if not claims.get("iss") or SHEETS_SCOPE not in str(claims.get("scope", "")):
+            self._send(400, {"error": "invalid_scope"})
+            return
+        with state.lock:
+            state.counts["token"] += 1
+            token = f"emu-{state.counts['token']}-{int(time.time())}"
+            state.tokens.add(token)
+        self._send(200, {"access_token": token, "expires_in": 3599, "token_type": "Bearer"})
+
+    def _append(self, match: re.Match, query: dict[str, list[str]], body: bytes) -> None:
+        state = self.server.state
+        with state.lock:
+            state.counts["append"] += 1
+        state.delay(state.faults.latency_ms)
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        with state.lock:
+            authorized = token in state.tokens
+        if not authorized:
+            with state.lock:
+                state.counts["unauthorized"] += 1
+            self._send(401, _google_error(401, "UNAUTHENTICATED", "Request had invalid authentication credentials."))
+            return
+        try:
+            values = _append_values(body)
+        except ValueError as exc:
+            self._send(400, _google_error(400, "INVALID_ARGUMENT", str(exc)))
+            return
+        # Only well-formed requests count against the quota.
+        fault = state.admit()
+        if fault == "quota":
+            with state.lock:
+                state.counts["quota"] += 1
+            self._send(429, _google_error(
+                429, "RESOURCE_EXHAUSTED",
+                "Quota exceeded for quota metric 'Write requests' and limit 'Write requests per minute per user'.",
+            ))
+            return
+        if fault == "error":
+            with state.lock:
+                state.counts["error"] += 1
+            self._send(500, _google_error(500, "INTERNAL", "Internal error encountered."))
+            return
+
+        spreadsheet_id, cell_range = unquote(match.group(1)), unquote(match.group(2))
+        option = query.get("valueInputOption", [None])[0]
+        with state.lock:
+            start = len(state.rows) + 1
+            for row in values:
+                state.rows.append(AppendedRow(spreadsheet_id, cell_range, row, option, time.time()))
+            state.counts["ok"] += 1
+        sheet = cell_range.split("!")[0]
+        columns = max((len(row) for row in values), default=0)
+        updated = f"{sheet}!A{start}:{chr(ord('A') + max(columns, 1) - 1)}{start + len(values) - 1}"
+        self._send(200, {
+            "spreadsheetId": spreadsheet_id,
+            "tableRange": cell_range,
+            "updates": {
+                "spreadsheetId": spreadsheet_id,
+                "updatedRange": updated,
+                "updatedRows": len(values),
+                "updatedColumns": columns,
+                "updatedCells": sum(len(row) for row in values),
+            },
+        })
+
+
+class SheetsEmulator(ThreadingHTTPServer):
+    """The emulator server; use as a context manager to run it on a thread."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = DEFAULT_PORT,
+        faults: FaultConfig | None = None,
+        *,
+        host: str = "127.0.0.1",
+        seed: int | None = None,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.state = EmulatorState(faults or FaultConfig(), seed)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def rows(self) -> list[AppendedRow]:
+        with self.state.lock:
+            return list(self.state.rows)
+
+    def configure(self, **changes: Any) -> None:
+        """Update fault settings; raises ``ValueError`` and changes nothing if any is invalid."""
+        known = {f.name for f in fields(FaultConfig)}
+        unknown = set(changes) - known
+        if unknown:
+            raise ValueError(f"unknown fault settings: {sorted(unknown)}")
+        parsed = {}
+        for key, value in changes.items():
+            kind = type(getattr(self.state.faults, key))
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"{key} must be a number, got {value!r}")
+            if value < 0 or (key == "error_rate" and value > 1):
+                raise ValueError(f"{key} out of range: {value!r}")
+            if kind is int and value != int(value):
+                raise ValueError(f"{key} must be a whole number, got {value!r}")
+            parsed[key] = kind(value)
+        with self.state.lock:
+            for key, value in parsed.items():
+                setattr(self.state.faults, key, value)
+
+    def __enter__(self) -> "SheetsEmulator":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def env_lines(url: str, key_path: str | Path, sheet_id: str = "emulator-sheet") -> list[str]:
+    """``.env.local`` lines that send ``/api/register`` to the emulator."""
+    credentials = {
+        "type": "service_account",
+        "client_email": "harness@emulator.local",
+        "private_key": Path(key_path).read_text(encoding="utf-8"),
+    }
+    return [
+        f"GOOGLE_SHEETS_EMULATOR_URL={url}",
+        f"GOOGLE_SHEET_ID={sheet_id}",
+        f"GOOGLE_SERVICE_ACCOUNT_JSON='{json.dumps(credentials)}'",
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.sheets_emulator", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--token-latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0..1, answered with 500")
+    parser.add_argument("--quota", type=int, default=0, help="appends per minute before 429s")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--print-env", metavar="PEM", help="print .env.local lines and exit")
+    args = parser.parse_args(argv)
+
+    url = f"http://127.0.0.1:{args.port}"
+    if args.print_env:
+        print("\n".join(env_lines(url, args.print_env)))
+        return 0
+    faults = FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        quota_per_minute=args.quota,
+        token_latency_ms=args.token_latency_ms,
+    )
+    server = SheetsEmulator(args.port, faults, seed=args.seed)
+    print(f"sheets emulator on {url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Per-action timing spans for the scenarios' Playwright calls.
+
+:class:`SpanRecorder` is a middleware. For every intercepted ``goto``,
+``click``, ``fill``, sleep and so on, it records the selector, the kind of
+action, the wait time, the action time and the outcome. For locator actions,
+the wait is timed separately, within the action's own timeout: first the
+wait until the target is attached (and visible, except for
+``set_input_files``), then the action itself with whatever time is left. Behind ``--selector-cache`` the target is the element
+handle the cache resolved, and the resolution counts as wait, since a span
+starts when the script made the call. Sleeps count entirely as waiting.
+
+Spans are only recorded when the runner is given ``--spans``. Without any
+middleware the scenarios get the real Playwright objects, so a run that does
+not ask for spans pays nothing. The output is plain JSON, or the Chrome
+trace-event format, which ``chrome://tracing`` and https://ui.perfetto.dev open
+directly::
+
+    python -m harness.runner --spans tmp/spans.trace.json
+    python -m harness.runner --spans tmp/spans.json --spans-format json TC007
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .proxies import LOCATOR_ACTIONS, Action, Next, remaining_timeout
+from .report import write_json
+
+SLEEP_KINDS = frozenset({"sleep", "wait_for_timeout"})
+ATTACHED_ONLY = frozenset({"set_input_files"})
+# One clock for every recorder in the process, so spans from parallel tests line up.
+ORIGIN = time.perf_counter()
+
+
+async def _wait_for_target(action: Action) -> None:
+    timeout = action.kwargs.get("timeout")
+    if isinstance(action.target, async_api.ElementHandle):
+        # Already attached; a detached handle fails here as stale for the cache.
+        if action.kind not in ATTACHED_ONLY:
+            await action.target.wait_for_element_state("visible", timeout=timeout)
+        return
+    state = "attached" if action.kind in ATTACHED_ONLY else "visible"
+    await action.target.wait_for(state=state, timeout=timeout)
+
+
+@dataclass
+class Span:
+    kind: str
+    selector: str | None
+    start_ms: float
+    wait_ms: float
+    action_ms: float
+    outcome: str
+    ts_ms: float
+
+    @property
+    def duration_ms(self) -> float:
+        return self.wait_ms + self.action_ms
+
+
+class SpanRecorder:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._started = time.perf_counter()
+
+    async def __call__(self, action: Action, call_next: Next) -> Any:
+        start = action.issued
+        waited = start
+        outcome: str | None = "ok"
+        try:
+            if action.kind in SLEEP_KINDS:
+                result = await call_next(action)
+                waited = time.perf_counter()
+                return result
+            if action.kind in LOCATOR_ACTIONS:
+                await _wait_for_target(remaining_timeout(action))
+                waited = time.perf_counter()
+                action = remaining_timeout(action)
+            return await call_next(action)
+        except BaseException as exc:
+            outcome = type(exc).__name__
+            if isinstance(action.target, async_api.ElementHandle) and "not attached" in str(exc):
+                outcome = None  # a stale cached handle; the cache retries under the same span
+            raise
+        finally:
+            end = time.perf_counter()
+            if outcome != "ok" and waited == start and action.kind in LOCATOR_ACTIONS:
+                waited = end  # failed while waiting for the target
+            if outcome is not None:
+                self.spans.append(Span(
+                    kind=action.kind,
+                    selector=action.selector,
+                    start_ms=(start - self._started) * 1000,
+                    wait_ms=(waited - start) * 1000,
+                    action_ms=(end - waited) * 1000,
+                    outcome=outcome,
+                    ts_ms=(start - ORIGIN) * 1000,
+                ))
+
+    def steps(self) -> list[dict[str, Any]]:
+        return [asdict(span) | {"duration_ms": span.duration_ms} for span in self.spans]
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "spans": len(self.spans),
+            "span_wait_s": sum(s.wait_ms for s in self.spans) / 1000,
+            "span_action_s": sum(s.action_ms for s in self.spans) / 1000,
+        }
+
+
+def chrome_trace(outcomes: Sequence[Any]) -> dict[str, Any]:
+    """Trace-event JSON: one process per worker, one thread per test, wait/action nested."""
+    events: list[dict[str, Any]] = []
+    for tid, outcome in enumerate(outcomes, start=1):
+        pid = outcome.worker
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                       "args": {"name": f"{outcome.test_id} {outcome.status}"}})
+        for step in outcome.steps:
+            ts = step["ts_ms"] * 1000
+            name = f"{step['kind']} {step['selector']}" if step.get("selector") else step["kind"]
+            events.append({
+                "name": name, "cat": step["kind"], "ph": "X", "pid": pid, "tid": tid,
+                "ts": ts, "dur": step["duration_ms"] * 1000,
+                "args": {"selector": step.get("selector"), "outcome": step["outcome"],
+                         "wait_ms": round(step["wait_ms"], 3), "action_ms": round(step["action_ms"], 3)},
+            })
+            if step["wait_ms"] and step["action_ms"]:
+                events.append({"name": "wait", "cat": "wait", "ph": "X", "pid": pid, "tid": tid,
+                               "ts": ts, "dur": step["wait_ms"] * 1000})
+                events.append({"name": "action", "cat": "action", "ph": "X", "pid": pid, "tid": tid,
+                               "ts": ts + step["wait_ms"] * 1000, "dur": step["action_ms"] * 1000})
+    for pid in sorted({o.worker for o in outcomes}):
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                       "args": {"name": f"worker {pid}"}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_spans(path: str | Path, outcomes: Sequence[Any], fmt: str = "chrome") -> Path:
+    if fmt == "chrome":
+        return write_json(path, chrome_trace(outcomes))
+    return write_json(path, {
+        "tests": [
+            {"test_id": o.test_id, "status": o.status, "worker": o.worker, "spans": o.steps}
+            for o in outcomes
+        ]
+    })
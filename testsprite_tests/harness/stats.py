@@ -0,0 +1,31 @@
+"""Small descriptive-statistics helpers for the benchmarks."""
+
+from __future__ import annotations
+
+import math
+from typing import Iterable, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float | None:
+    """Linear-interpolated percentile, ``q`` in 0..100; ``None`` if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def distribution(values: Iterable[float | None]) -> dict[str, float | None]:
+    present = [float(v) for v in values if v is not None]
+    return {
+        "n": len(present),
+        "min": min(present) if present else None,
+        "p50": percentile(present, 50),
+        "p95": percentile(present, 95),
+        "p99": percentile(present, 99),
+        "max": max(present) if present else None,
+        "mean": sum(present) / len(present) if present else None,
+    }
@@ -0,0 +1,396 @@
+"""Offline optimizer for the generated scenarios' step sequences.
+
+The TC scripts repeat a lot of work: every one navigates to the root twice
+before its first real step, TC001 reloads the root about a dozen times and
+TC011 clicks the header logo link eighteen times in a row. This module parses
+a script's ``run_test`` body into steps, removes the ones whose effect is
+provably overwritten or repeated, and re-emits the script with only those
+statements dropped. The rules are deliberately conservative:
+
+* ``collapse-navigation``: two navigations with only waits between them. The
+  first page is never observed, so only one of them matters.
+* ``repeat-segment``: a fresh navigation followed by exactly the same clicks
+  as the segment before it. Both start from a freshly loaded page, so the
+  second replays the first. Segments with fills or assertions are kept.
+* ``repeat-link-click``: the same site link clicked again with nothing in
+  between. Only the links in :data:`FIXED_LINKS` count: their ``href`` is a
+  fragment of the landing page, so the second click lands where the first
+  did. Other anchors, such as Razorpay's back link, may go somewhere else
+  each time.
+* ``dead-fill``: a field filled again before anything reads or submits it.
+
+Nothing needs Playwright, so this runs anywhere::
+
+    python -m harness.trace                        # report for every TC*.py
+    python -m harness.trace TC001 TC011 --write tmp/minimized
+    python -m harness.trace --results tmp/test_results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from .report import format_table, write_json
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+SCENARIO_GLOB = "TC[0-9][0-9][0-9]_*.py"
+
+# Rough per-step costs used for the savings estimate, in milliseconds.
+STEP_COST_MS = {
+    "goto": 1500.0,
+    "load_state": 200.0,
+    "click": 150.0,
+    "fill": 100.0,
+    "assert": 0.0,
+    "wait": 0.0,
+    "sleep": 0.0,
+    "other": 0.0,
+}
+# The app's anchors and their hrefs (components/Header.tsx, Footer.tsx,
+# HeroScroll.tsx). Following one again from where it led changes nothing.
+FIXED_LINKS = {
+    "xpath=html/body/header/div/div/a": "#",
+    "xpath=html/body/footer/div/a": "#",
+    "xpath=html/body/main/div/div/div[2]/div/div[1]/a": "#details",
+    "xpath=html/body/main/div/div/div[3]/div/div[1]/a": "#details",
+}
+INTERACTIONS = frozenset({"click", "fill", "assert", "other"})
+PASSIVE = frozenset({"wait", "sleep", "load_state"})
+
+
+@dataclass
+class Step:
+    kind: str
+    target: str | None
+    value: Any
+    first_line: int
+    last_line: int
+    wait_ms: float = 0.0
+    removed_by: str | None = None
+
+    @property
+    def cost_ms(self) -> float:
+        return self.wait_ms + STEP_COST_MS.get(self.kind, 0.0)
+
+    def signature(self) -> tuple:
+        return (self.kind, self.target, self.value)
+
+
+@dataclass
+class Trace:
+    name: str
+    source: str
+    steps: list[Step] = field(default_factory=list)
+
+    @property
+    def kept(self) -> list[Step]:
+        return [s for s in self.steps if s.removed_by is None]
+
+    @property
+    def removed(self) -> list[Step]:
+        return [s for s in self.steps if s.removed_by is not None]
+
+    @property
+    def cost_ms(self) -> float:
+        return sum(s.cost_ms for s in self.steps)
+
+    @property
+    def saved_ms(self) -> float:
+        return sum(s.cost_ms for s in self.removed)
+
+    def minimized_source(self) -> str:
+        drop = set()
+        for step in self.removed:
+            drop.update(range(step.first_line, step.last_line + 1))
+        lines = self.source.splitlines(keepends=True)
+        return "".join(line for i, line in enumerate(lines, 1) if i not in drop)
+
+
+def _literal(node: ast.AST | None) -> Any:
+    try:
+        return ast.literal_eval(node) if node is not None else None
+    except ValueError:
+        return ast.unparse(node)
+
+
+def _awaited_call(node: ast.stmt) -> ast.Call | None:
+    if (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Await)
+        and isinstance(node.value.value, ast.Call)
+    ):
+        return node.value.value
+    return None
+
+
+def _method(call: ast.Call) -> tuple[str | None, str | None]:
+    func = call.func
+    if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+        return func.value.id, func.attr
+    return None, None
+
+
+def _locator_selector(node: ast.stmt) -> str | None:
+    """``elem = frame.locator('...').nth(0)`` -> the selector string."""
+    if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)):
+        return None
+    call = node.value
+    while isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute):
+        if call.func.attr == "locator" and call.args:
+            return _literal(call.args[0])
+        call = call.func.value
+    return None
+
+
+def _try_body(tree: ast.Module) -> list[ast.stmt]:
+    for node in tree.body:
+        if isinstance(node, ast.AsyncFunctionDef) and node.name == "run_test":
+            for stmt in node.body:
+                if isinstance(stmt, ast.Try):
+                    return stmt.body
+            return node.body
+    raise ValueError("no run_test coroutine found")
+
+
+def _is_load_wait(node: ast.stmt) -> bool:
+    """The preamble's ``try: await page.wait_for_load_state(...)`` blocks."""
+    if isinstance(node, ast.For):
+        return all(_is_load_wait(stmt) for stmt in node.body)
+    if isinstance(node, ast.Try):
+        return all(_is_load_wait(stmt) for stmt in node.body)
+    call = _awaited_call(node)
+    return call is not None and _method(call)[1] == "wait_for_load_state"
+
+
+def parse(source: str, name: str = "<scenario>") -> Trace:
+    """Split ``run_test`` into steps; each step owns the lines since the last one."""
+    tree = ast.parse(source, filename=name)
+    trace = Trace(name=name, source=source)
+    body = _try_body(tree)
+    start_line = body[0].lineno if body else 0
+    selector: str | None = None
+    pending_wait = 0.0
+
+    for node in body:
+        maybe_selector = _locator_selector(node)
+        if maybe_selector is not None:
+            selector = maybe_selector
+            continue
+        if isinstance(node, ast.Assign):
+            continue  # frame = context.pages[-1]
+
+        call = _awaited_call(node)
+        owner, method = _method(call) if call else (None, None)
+        if method == "wait_for_timeout":
+            # Generated as ``wait_for_timeout(3000); elem.click()`` on one line.
+            pending_wait += float(_literal(call.args[0]) or 0)
+            continue
+
+        if method == "goto":
+            step = Step("goto", _literal(call.args[0]), None, 0, 0)
+        elif owner == "elem" and method in ("click", "fill"):
+            value = _literal(call.args[0]) if method == "fill" and call.args else None
+            step = Step(method, selector, value, 0, 0)
+        elif owner == "asyncio" and method == "sleep":
+            step = Step("sleep", None, None, 0, 0, wait_ms=1000 * float(_literal(call.args[0])))
+        elif _is_load_wait(node):
+            step = Step("load_state", None, None, 0, 0)
+        elif isinstance(node, ast.Try):
+            step = Step("assert", None, ast.unparse(node.body[0]), 0, 0)
+        else:
+            step = Step("other", None, ast.unparse(node), 0, 0)
+
+        step.first_line = start_line
+        step.last_line = node.end_lineno or node.lineno
+        step.wait_ms += pending_wait
+        trace.steps.append(step)
+        start_line, pending_wait = step.last_line + 1, 0.0
+    return trace
+
+
+def _collapse_navigation(steps: list[Step]) -> None:
+    last_goto: Step | None = None
+    for step in steps:
+        if step.removed_by:
+            continue
+        if step.kind == "goto":
+            if last_goto is not None:
+                if last_goto.target == step.target:
+                    step.removed_by = "collapse-navigation"
+                    continue
+                last_goto.removed_by = "collapse-navigation"
+            last_goto = step
+        elif step.kind in INTERACTIONS:
+            last_goto = None
+
+
+def _segments(steps: list[Step]) -> list[list[Step]]:
+    segments: list[list[Step]] = []
+    for step in steps:
+        if step.removed_by:
+            continue
+        if step.kind == "goto" or not segments:
+            segments.append([])
+        segments[-1].append(step)
+    return segments
+
+
+def _repeat_segments(steps: list[Step]) -> None:
+    previous: list[tuple] | None = None
+    for segment in _segments(steps):
+        if segment[0].kind != "goto":
+            previous = None
+            continue
+        actions = [s for s in segment if s.kind not in PASSIVE]
+        signature = [s.signature() for s in actions]
+        replayable = all(s.kind in ("goto", "click") for s in actions)
+        if replayable and signature == previous:
+            for step in actions:
+                step.removed_by = "repeat-segment"
+            continue
+        previous = signature if replayable else None
+
+
+def _repeat_link_clicks(steps: list[Step]) -> None:
+    last: Step | None = None
+    for step in steps:
+        if step.removed_by or step.kind in PASSIVE:
+            continue
+        if (
+            step.kind == "click"
+            and last is not None
+            and last.kind == "click"
+            and last.target == step.target
+            and step.target in FIXED_LINKS
+        ):
+            step.removed_by = "repeat-link-click"
+            continue
+        last = step
+
+
+def _dead_fills(steps: list[Step]) -> None:
+    pending: dict[str, Step] = {}
+    for step in steps:
+        if step.removed_by:
+            continue
+        if step.kind == "fill" and step.target is not None:
+            earlier = pending.get(step.target)
+            if earlier is not None:
+                if earlier.value == step.value:
+                    step.removed_by = "dead-fill"
+                    continue
+                earlier.removed_by = "dead-fill"
+            pending[step.target] = step
+        elif step.kind in INTERACTIONS or step.kind == "goto":
+            pending.clear()
+
+
+RULES = (_collapse_navigation, _repeat_link_clicks, _repeat_segments, _dead_fills)
+
+
+def optimize(trace: Trace) -> Trace:
+    """Mark removable steps in place until no rule fires; returns ``trace``."""
+    while True:
+        before = len(trace.removed)
+        for rule in RULES:
+            rule(trace.steps)
+        if len(trace.removed) == before:
+            return trace
+
+
+def _load_traces(selectors: Sequence[str], results: str | None) -> Iterable[Trace]:
+    wanted = [s.lower() for s in selectors]
+    if results:
+        for entry in json.loads(Path(results).read_text(encoding="utf-8")):
+            name = entry.get("title", "untitled")
+            if not wanted or any(s in name.lower() for s in wanted):
+                yield parse(entry["code"], name)
+        return
+    for path in sorted(TESTS_DIR.glob(SCENARIO_GLOB)):
+        if not wanted or any(s in path.stem.lower() for s in wanted):
+            yield parse(path.read_text(encoding="utf-8"), path.name)
+
+
+def _file_name(name: str) -> str:
+    if name.endswith(".py"):
+        return name
+    return "".join(c if c.isalnum() else "_" for c in name).strip("_") + ".py"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.trace", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("tests", nargs="*", help="TC ids or name fragments")
+    parser.add_argument("--results", metavar="JSON", help="read code from test_results.json")
+    parser.add_argument("--write", metavar="DIR", help="write minimized scripts here")
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list removed steps")
+    args = parser.parse_args(argv)
+
+    rows, records = [], []
+    for trace in _load_traces(args.tests, args.results):
+        optimize(trace)
+        minimized = trace.minimized_source()
+        ast.parse(minimized)  # removal must leave a valid script
+        if args.write:
+            out = Path(args.write) / _file_name(trace.name)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(minimized, encoding="utf-8")
+        rows.append(
+            (
+                trace.name[:48],
+                len(trace.steps),
+                len(trace.kept),
+                trace.cost_ms / 1000,
+                (trace.cost_ms - trace.saved_ms) / 1000,
+                trace.saved_ms / 1000,
+            )
+        )
+        records.append(
+            {
+                "name": trace.name,
+                "steps": len(trace.steps),
+                "kept": len(trace.kept),
+                "estimated_s": trace.cost_ms / 1000,
+                "saved_s": trace.saved_ms / 1000,
+                "removed": [
+                    {
+                        "rule": s.removed_by,
+                        "kind": s.kind,
+                        "target": s.target,
+                        "lines": [s.first_line, s.last_line],
+                    }
+                    for s in trace.removed
+                ],
+            }
+        )
+        if args.verbose:
+            for step in trace.removed:
+                print(
+                    f"{trace.name}:{step.last_line}: {step.removed_by}: "
+                    f"{step.kind} {step.target or ''}".rstrip()
+                )
+
+    if not rows:
+        print("No scenarios matched.", file=sys.stderr)
+        return 2
+    print(
+        format_table(
+            ("scenario", "steps", "kept", "est. s", "min. s", "saved s"), rows
+        )
+    )
+    print(f"\ntotal estimated saving: {sum(r[5] for r in rows):.1f}s")
+    if args.json:
+        write_json(args.json, records)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
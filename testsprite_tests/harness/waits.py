@@ -0,0 +1,145 @@
+"""Readiness waits in place of the scripts' fixed sleeps.
+
+Every generated step reads ``await page.wait_for_timeout(3000); await
+elem.click(timeout=5000)`` and each script ends with ``asyncio.sleep(5)``.
+:class:`ReadinessWaits` intercepts those sleeps and instead waits until the
+page is actually ready: the document has parsed, the hero has its first
+frame (``data-frame-count`` is set once ``isReady``; pages without the hero,
+such as the checkout, skip this), and no ``/api/*`` request has been in flight
+for a short quiet window. The original sleep stays the upper bound, so a step never waits
+longer than it used to. If the page navigates or closes mid-wait, readiness is
+unknown, so the rest of the original sleep runs instead. Element actionability is left to the action itself:
+Playwright's ``click``/``fill`` already wait for the target to be attached,
+visible, stable and enabled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from playwright import async_api
+
+from .probes import HERO_READY_SELECTOR
+from .proxies import Action, Next
+
+HERO_SELECTOR = "[data-hero-section]"
+API_FRAGMENT = "/api/"
+QUIET_MS = 150
+SLEEP_ACTIONS = frozenset({"wait_for_timeout", "sleep"})
+
+
+@dataclass
+class WaitRecord:
+    kind: str
+    requested_ms: float
+    waited_ms: float
+    ready: bool
+
+    @property
+    def saved_ms(self) -> float:
+        return max(0.0, self.requested_ms - self.waited_ms)
+
+
+class _ApiTracker:
+    """Counts in-flight ``/api/*`` requests on one page."""
+
+    def __init__(self, page: async_api.Page, fragment: str) -> None:
+        self._fragment = fragment
+        self._in_flight: set[async_api.Request] = set()
+        self._changed = time.monotonic()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        page.on("request", self._started)
+        page.on("requestfinished", self._ended)
+        page.on("requestfailed", self._ended)
+
+    def _started(self, request: async_api.Request) -> None:
+        if self._fragment in request.url:
+            self._in_flight.add(request)
+            self._changed = time.monotonic()
+            self._idle.clear()
+
+    def _ended(self, request: async_api.Request) -> None:
+        if request in self._in_flight:
+            self._in_flight.discard(request)
+            self._changed = time.monotonic()
+            if not self._in_flight:
+                self._idle.set()
+
+    async def settle(self, quiet_s: float) -> None:
+        while True:
+            await self._idle.wait()
+            remaining = quiet_s - (time.monotonic() - self._changed)
+            if remaining <= 0 and not self._in_flight:
+                return
+            await asyncio.sleep(max(remaining, 0.01))
+
+
+class ReadinessWaits:
+    """Middleware that replaces fixed sleeps with readiness conditions."""
+
+    def __init__(
+        self,
+        *,
+        ready_selector: str = HERO_READY_SELECTOR,
+        api_fragment: str = API_FRAGMENT,
+        quiet_ms: float = QUIET_MS,
+    ) -> None:
+        self.ready_selector = ready_selector
+        self.api_fragment = api_fragment
+        self.quiet_s = quiet_ms / 1000
+        self.records: list[WaitRecord] = []
+        self._trackers: dict[async_api.Page, _ApiTracker] = {}
+
+    def _tracker(self, page: async_api.Page) -> _ApiTracker:
+        tracker = self._trackers.get(page)
+        if tracker is None:
+            tracker = self._trackers[page] = _ApiTracker(page, self.api_fragment)
+        return tracker
+
+    async def __call__(self, action: Action, call_next: Next) -> Any:
+        page = action.page
+        if page is not None:
+            self._tracker(page)
+        if action.kind not in SLEEP_ACTIONS or page is None or page.is_closed():
+            return await call_next(action)
+
+        requested_ms = float(action.args[0] if action.args else 0)
+        if action.kind == "sleep":
+            requested_ms *= 1000
+        start = time.perf_counter()
+        try:
+            ready = await asyncio.wait_for(self.until_ready(page), requested_ms / 1000)
+        except asyncio.TimeoutError:
+            ready = False
+        if not ready:
+            await asyncio.sleep(max(0.0, start + requested_ms / 1000 - time.perf_counter()))
+        self.records.append(
+            WaitRecord(action.kind, requested_ms, (time.perf_counter() - start) * 1000, ready)
+        )
+
+    async def until_ready(self, page: async_api.Page) -> bool:
+        """Wait until ``page`` is ready; ``False`` if it navigated or closed first."""
+        try:
+            await page.wait_for_load_state("domcontentloaded")
+            await page.wait_for_function(
+                "([hero, ready]) => !document.querySelector(hero) || !!document.querySelector(ready)",
+                arg=[HERO_SELECTOR, self.ready_selector],
+                timeout=0,  # the requested sleep bounds the whole wait
+            )
+        except async_api.Error:
+            return False
+        await self._tracker(page).settle(self.quiet_s)
+        return True
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "sleeps": len(self.records),
+            "sleeps_not_ready": sum(not r.ready for r in self.records),
+            "sleep_requested_s": sum(r.requested_ms for r in self.records) / 1000,
+            "sleep_waited_s": sum(r.waited_ms for r in self.records) / 1000,
+            "sleep_saved_s": sum(r.saved_ms for r in self.records) / 1000,
+        }
@@ -0,0 +1,322 @@
+"""Core Web Vitals for the landing page across a matrix of device descriptors.
+
+TC012 only clicks the header CTA at 1280×720. This collector loads the page
+once per device and run, using Playwright's device descriptors, all in one
+browser. The device contexts run concurrently (``--concurrency`` caps how
+many are open at once). An init script buffers ``PerformanceObserver``
+entries from the start of the document:
+
+- LCP: the last ``largest-contentful-paint`` entry before the first input,
+  with a short description of the element (the ``BlurRevealText`` headline,
+  the hero canvas, ...).
+- CLS: the largest session window of ``layout-shift`` entries without recent
+  input.
+- INP: the slowest ``event`` interaction. Each run taps or clicks the header
+  CTA, then closes the dialog with its Close button.
+- TBT: the sum of ``duration - 50`` over the ``longtask`` entries between FCP
+  and the first input. The long-task count and the longest task are reported
+  with it.
+
+The report has one row per device, with the p75 of each metric across runs
+(the percentile Core Web Vitals are judged at), checked against budgets. The
+defaults are the "good" thresholds; ``--budget`` overrides them. Any metric
+over budget makes the exit status 1::
+
+    python -m harness.web_vitals --runs 5
+    python -m harness.web_vitals --device "Pixel 7" --device "Moto G4" --budget lcp=4000 --budget tbt=600
+
+Concurrent contexts share the machine's CPU, so TBT and INP read higher than
+they would for one device on its own. Use ``--concurrency 1`` for isolated numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Sequence
+
+from playwright import async_api
+
+from .daemon import DEFAULT_URL, acquire_browser
+from .probes import HERO_READY_SELECTOR
+from .report import format_table, write_json
+from .scenarios import BASE_URL
+from .stats import percentile
+
+HEADER_CTA = "header button"
+DIALOG = "dialog[open]"
+# The dialog is non-modal (no showModal()), so Escape does not close it.
+DIALOG_CLOSE = 'dialog[open] button[aria-label="Close"]'
+# TC012's window; Playwright's "Desktop Chrome" is the same size.
+DESKTOP = "Desktop 1280x720"
+DEFAULT_DEVICES = (DESKTOP, "iPhone 13", "Pixel 7", "Galaxy S9+", "iPad Mini")
+METRICS = ("lcp", "cls", "inp", "tbt")
+BUDGETS = {"lcp": 2500.0, "cls": 0.1, "inp": 200.0, "tbt": 200.0}
+INTERACTION_SETTLE_MS = 500
+
+VITALS_JS = """
+(() => {
+  if (window.__harnessVitals) return;
+  const state = {
+    fcp: null, lcp: null, lcpElement: null, lcpSize: 0,
+    cls: 0, shifts: 0, longTasks: [], interactions: {}, firstInput: null,
+  };
+  window.__harnessVitals = state;
+
+  const describe = (el) => {
+    if (!el) return null;
+    let name = el.tagName.toLowerCase();
+    if (el.id) name += "#" + el.id;
+    const data = [...el.attributes].map((a) => a.name).filter((n) => n.startsWith("data-"));
+    if (data.length) name += "[" + data.join("][") + "]";
+    const block = el.closest("h1, h2, p, button, a, dialog, section, header, footer, main");
+    if (block && block !== el) name = block.tagName.toLowerCase() + " > " + name;
+    const text = (block ?? el).textContent.replace(/\\s+/g, " ").trim();
+    return text ? `${name} "${text.slice(0, 32)}"` : name;
+  };
+  const observe = (type, callback, options = {}) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(callback))
+        .observe({ type, buffered: true, ...options });
+    } catch {}
+  };
+
+  observe("paint", (e) => {
+    if (e.name === "first-contentful-paint") state.fcp = e.startTime;
+  });
+  // Chrome stops emitting LCP candidates after the first input.
+  observe("largest-contentful-paint", (e) => {
+    state.lcp = e.startTime;
+    state.lcpSize = e.size;
+    state.lcpElement = describe(e.element) ?? e.url ?? null;
+  });
+  let session = 0, sessionStart = 0, sessionEnd = 0;
+  observe("layout-shift", (e) => {
+    if (e.hadRecentInput) return;
+    state.shifts++;
+    if (session && e.startTime - sessionEnd < 1000 && e.startTime - sessionStart < 5000) {
+      session += e.value;
+    } else {
+      session = e.value;
+      sessionStart = e.startTime;
+    }
+    sessionEnd = e.startTime;
+    state.cls = Math.max(state.cls, session);
+  });
+  observe("longtask", (e) => {
+    state.longTasks.push({ start: e.startTime, duration: e.duration });
+  });
+  observe("event", (e) => {
+    if (!e.interactionId) return;
+    const prev = state.interactions[e.interactionId];
+    if (!prev || e.duration > prev.duration) {
+      state.interactions[e.interactionId] = { type: e.name, duration: e.duration };
+    }
+  }, { durationThreshold: 16 });
+  for (const type of ["pointerdown", "keydown"]) {
+    addEventListener(type, (e) => {
+      if (e.isTrusted && state.firstInput === null) state.firstInput = e.timeStamp;
+    }, true);
+  }
+
+  state.snapshot = () => {
+    const until = state.firstInput ?? performance.now();
+    let tbt = 0;
+    for (const t of state.longTasks) {
+      if (state.fcp === null || t.start < state.fcp || t.start >= until) continue;
+      tbt += Math.max(0, t.duration - 50);
+    }
+    const interactions = Object.values(state.interactions);
+    // With fewer than 50 interactions INP is simply the slowest one.
+    const slowest = interactions.reduce((a, b) => (b.duration > (a?.duration ?? -1) ? b : a), null);
+    return {
+      fcp: state.fcp,
+      lcp: state.lcp,
+      lcp_element: state.lcpElement,
+      lcp_size: state.lcpSize,
+      cls: state.cls,
+      layout_shifts: state.shifts,
+      inp: slowest ? slowest.duration : null,
+      inp_event: slowest ? slowest.type : null,
+      interactions: interactions.length,
+      tbt,
+      long_tasks: state.longTasks.length,
+      longest_task: Math.max(0, ...state.longTasks.map((t) => t.duration)),
+    };
+  };
+})();
+"""
+
+
+def device_options(pw: async_api.Playwright, name: str) -> dict[str, Any]:
+    """Context options for a device; unknown names raise ``KeyError``."""
+    if name == DESKTOP:
+        return {"viewport": {"width": 1280, "height": 720}}
+    options = dict(pw.devices[name])
+    options.pop("default_browser_type", None)  # every device runs in the leased Chromium
+    return options
+
+
+def describe_options(options: dict[str, Any]) -> str:
+    viewport = options["viewport"]
+    text = f"{viewport['width']}x{viewport['height']}@{options.get('device_scale_factor', 1):g}"
+    return text + (" touch" if options.get("has_touch") else "")
+
+
+async def _interact(page: async_api.Page, touch: bool, deadline: float) -> bool:
+    """Open the registration dialog from the header CTA, then close it with its Close button."""
+    cta, dialog = page.locator(HEADER_CTA).first, page.locator(DIALOG)
+    while time.monotonic() < deadline and not await dialog.count():
+        try:  # a click before hydration opens nothing, so keep trying
+            await (cta.tap(timeout=250) if touch else cta.click(timeout=250))
+        except async_api.Error:
+            pass
+    if not await dialog.count():
+        return False
+    await page.wait_for_timeout(INTERACTION_SETTLE_MS)
+    close = page.locator(DIALOG_CLOSE)
+    await (close.tap() if touch else close.click())
+    await page.wait_for_timeout(INTERACTION_SETTLE_MS)
+    return True
+
+
+async def measure_device(
+    browser: async_api.Browser, device: str, options: dict[str, Any], url: str, *,
+    settle_s: float = 3.0, timeout_s: float = 30.0,
+) -> dict[str, Any]:
+    context = await browser.new_context(**options)
+    try:
+        await context.add_init_script(script=VITALS_JS)
+        page = await context.new_page()
+        deadline = time.monotonic() + timeout_s
+        await page.goto(url, wait_until="load", timeout=timeout_s * 1000)
+        try:
+            await page.wait_for_selector(
+                HERO_READY_SELECTOR, state="attached",
+                timeout=max(1.0, (deadline - time.monotonic()) * 1000),
+            )
+        except async_api.Error:
+            pass
+        # Lets the headline's per-character reveal finish before the first input.
+        await page.wait_for_timeout(settle_s * 1000)
+        interacted = await _interact(page, bool(options.get("has_touch")), deadline)
+        record = await page.evaluate("() => window.__harnessVitals.snapshot()")
+    finally:
+        await context.close()
+    record.update(device=device, interacted=interacted)
+    return record
+
+
+async def run(
+    devices: Sequence[str], url: str, runs: int, concurrency: int,
+    settle_s: float, timeout_s: float, daemon_url: str | None,
+) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]]]:
+    async with async_api.async_playwright() as pw:
+        options = {name: device_options(pw, name) for name in devices}
+        lease = await acquire_browser(pw, daemon_url=daemon_url)
+        slots = asyncio.Semaphore(concurrency or len(devices))
+
+        async def one(name: str, index: int) -> dict[str, Any]:
+            async with slots:
+                record = await measure_device(
+                    lease.browser, name, options[name], url, settle_s=settle_s, timeout_s=timeout_s
+                )
+            record["run"] = index
+            print(f"run {index} {name}: LCP {record['lcp']}, CLS {record['cls']:.3f}, "
+                  f"INP {record['inp']}, TBT {record['tbt']:.0f}", flush=True)
+            return record
+
+        try:
+            records = []
+            for index in range(runs):
+                records += await asyncio.gather(*(one(name, index) for name in devices))
+        finally:
+            await lease.release(runs * len(devices))
+    return options, records
+
+
+def summarize(records: Sequence[dict[str, Any]], budgets: dict[str, float]) -> dict[str, Any]:
+    """p75 per metric for one device, plus the metrics over budget."""
+    summary: dict[str, Any] = {"runs": len(records)}
+    for metric in METRICS:
+        summary[metric] = percentile([r[metric] for r in records if r[metric] is not None], 75)
+    summary["long_tasks"] = percentile([r["long_tasks"] for r in records], 75)
+    summary["longest_task"] = max((r["longest_task"] for r in records), default=None)
+    elements = [r["lcp_element"] for r in records if r["lcp_element"]]
+    summary["lcp_element"] = max(set(elements), key=elements.count) if elements else None
+    summary["no_interaction"] = sum(not r["interacted"] for r in records)
+    summary["over_budget"] = [
+        m for m in METRICS if summary[m] is not None and m in budgets and summary[m] > budgets[m]
+    ]
+    return summary
+
+
+def parse_budgets(values: Sequence[str]) -> dict[str, float]:
+    budgets = dict(BUDGETS)
+    for value in values:
+        metric, _, limit = value.partition("=")
+        if metric not in METRICS or not limit:
+            raise ValueError(f"expected one of {', '.join(METRICS)} as METRIC=VALUE, got {value!r}")
+        budgets[metric] = float(limit)
+    return budgets
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.web_vitals", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--device", action="append", dest="devices", metavar="NAME",
+                        help=f"Playwright device name or {DESKTOP!r} (repeatable; default: {', '.join(DEFAULT_DEVICES)})")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=0, help="contexts open at once (0 = every device)")
+    parser.add_argument("--budget", action="append", default=[], metavar="METRIC=VALUE",
+                        help="lcp/inp/tbt in ms, cls unitless")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds after the hero is ready before interacting")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per page load")
+    parser.add_argument("--json", metavar="PATH")
+    parser.add_argument("--no-daemon", action="store_true")
+    args = parser.parse_args(argv)
+    try:
+        budgets = parse_budgets(args.budget)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    devices = args.devices or list(DEFAULT_DEVICES)
+    try:
+        options, records = asyncio.run(run(
+            devices, args.url, args.runs, args.concurrency, args.settle, args.timeout,
+            None if args.no_daemon else DEFAULT_URL,
+        ))
+    except KeyError as exc:
+        print(f"Unknown device {exc}; see playwright's devices list.", file=sys.stderr)
+        return 2
+
+    summaries = {d: summarize([r for r in records if r["device"] == d], budgets) for d in devices}
+    print()
+    print(format_table(
+        ("device", "viewport", "LCP ms", "CLS", "INP ms", "TBT ms", "long tasks", "longest ms", "LCP element", "over budget"),
+        [
+            (d, describe_options(options[d]), s["lcp"], s["cls"], s["inp"], s["tbt"], s["long_tasks"],
+             s["longest_task"], s["lcp_element"], ", ".join(s["over_budget"]) or "-")
+            for d, s in summaries.items()
+        ],
+    ))
+    print("budgets (p75): " + ", ".join(f"{m} {budgets[m]:g}" for m in METRICS))
+    missed = sum(s["no_interaction"] for s in summaries.values())
+    if missed:
+        print(f"{missed} run(s) never opened the dialog; their INP is missing or partial")
+    if args.json:
+        write_json(args.json, {
+            "url": args.url,
+            "budgets": budgets,
+            "devices": {d: {"options": options[d], **s} for d, s in summaries.items()},
+            "records": records,
+        })
+    return 1 if any(s["over_budget"] for s in summaries.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())